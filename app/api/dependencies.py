@@ -1,23 +1,74 @@
-from fastapi import Depends
-from app.core.pipeline.factory import PipelineFactory
-from app.core.services.pipeline import PipelineService
-from app.core.services.medication import MedicationService
+import hmac
+from typing import TYPE_CHECKING, Optional
+from fastapi import Depends, Header, HTTPException, Request, status
+from app.config.settings import settings
+from app.core.services.admission import AdmissionController
+from app.core.pipeline.deadline import Deadline
 
+# The services pull in Haystack and the model runtimes, imported on first use so
+# that importing the application stays cheap
+if TYPE_CHECKING:
+    from app.core.pipeline.factory import PipelineFactory
+    from app.core.services.pipeline import PipelineService
+    from app.core.services.medication import MedicationService
 
-def get_pipeline_factory() -> PipelineFactory:
+
+def get_pipeline_factory() -> "PipelineFactory":
     """Get pipeline factory."""
+    from app.core.pipeline.factory import PipelineFactory
+
     return PipelineFactory()
 
 
 async def get_pipeline_service(
-    pipeline_factory: PipelineFactory = Depends(get_pipeline_factory),
-) -> PipelineService:
+    pipeline_factory: "PipelineFactory" = Depends(get_pipeline_factory),
+) -> "PipelineService":
     """Get pipeline service with all required dependencies."""
-    return PipelineService(pipeline_factory=pipeline_factory)
+    from app.core.services.pipeline import PipelineService
+    from app.core.services.retrieval_cache import retrieval_cache
+
+    return PipelineService(
+        pipeline_factory=pipeline_factory, retrieval_cache=retrieval_cache
+    )
 
 
 async def get_medication_service(
-    pipeline_service: PipelineService = Depends(get_pipeline_service),
-) -> MedicationService:
+    pipeline_service: "PipelineService" = Depends(get_pipeline_service),
+) -> "MedicationService":
     """Get medication service with pipeline service dependency"""
+    from app.core.services.medication import MedicationService
+
     return MedicationService(pipeline_service)
+
+
+def get_admission_controller(request: Request) -> Optional[AdmissionController]:
+    """Get the admission controller of the application, None when disabled"""
+    return getattr(request.app.state, "admission", None)
+
+
+def get_request_deadline(
+    x_request_timeout_ms: Optional[float] = Header(default=None, gt=0),
+) -> Deadline:
+    """Deadline of the request, from its timeout header or the default"""
+    timeout_ms = min(
+        x_request_timeout_ms or settings.REQUEST_TIMEOUT_MS,
+        settings.REQUEST_MAX_TIMEOUT_MS,
+    )
+    return Deadline(timeout_ms / 1000)
+
+
+async def verify_admin_token(
+    authorization: Optional[str] = Header(default=None),
+) -> None:
+    """Allow admin endpoints only for requests bearing the configured admin token"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(), settings.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,59 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+from app.api.dependencies import verify_admin_token
+from app.config.logging import get_logger
+from app.config.settings import settings
+from app.core.monitoring.profiler import SamplingProfiler
+
+
+logger = get_logger(__name__)
+router = APIRouter(dependencies=[Depends(verify_admin_token)])
+
+# Only one on-demand profile runs at a time
+_profile_lock = asyncio.Lock()
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(default=10.0, gt=0),
+    interval_ms: Optional[float] = Query(default=None, gt=0),
+):
+    """
+    Sample all threads of this worker for a while and return collapsed stacks,
+    ready for flamegraph.pl or speedscope.
+    """
+    if seconds > settings.PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Profiles are limited to {settings.PROFILE_MAX_SECONDS} seconds",
+        )
+    if _profile_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already running",
+        )
+
+    async with _profile_lock:
+        interval = (interval_ms or settings.PROFILE_SAMPLE_INTERVAL_MS) / 1000
+        logger.info(f"Profiling worker for {seconds}s every {interval * 1000:.1f}ms")
+        profiler = SamplingProfiler(interval=interval).start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+        return PlainTextResponse(profiler.collapsed())
+
+
+@router.get("/profile/slow")
+async def slow_request_profiles(request: Request) -> List[Dict[str, Any]]:
+    """Profiles of the most recent requests over the slow request threshold"""
+    profiler = getattr(request.app.state, "slow_request_profiler", None)
+    if profiler is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Slow request profiling is disabled",
+        )
+    return list(profiler.profiles)
@@ -1,16 +1,32 @@
-import traceback
-
-from fastapi import APIRouter, Depends
-from app.core.services.medication import MedicationService
-from app.api.dependencies import get_medication_service
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.api.dependencies import (
+    get_admission_controller,
+    get_medication_service,
+    get_request_deadline,
+)
 from app.config.logging import get_logger
+from app.config.settings import settings
+from app.core.pipeline.deadline import Deadline, deadline_context
+from app.utils.serialization import FastJSONResponse
+from app.core.services.admission import (
+    BULK,
+    INTERACTIVE,
+    AdmissionController,
+    AdmissionRejected,
+)
 from app.schemas.medication import (
     MedicationRequest,
     MedicationResponse,
     MedicationIndexRequest,
     MedicationIndexResponse,
+    MedicationUpdateRequest,
 )
 
+if TYPE_CHECKING:
+    from app.core.services.medication import MedicationService
+
 logger = get_logger(__name__)
 router = APIRouter()
 
@@ -18,16 +34,34 @@ router = APIRouter()
 @router.post("/extract", response_model=MedicationResponse)
 async def extract_medications(
     request: MedicationRequest,
-    medication_service: MedicationService = Depends(get_medication_service),
+    deadline: Deadline = Depends(get_request_deadline),
+    admission: Optional[AdmissionController] = Depends(get_admission_controller),
+    medication_service: "MedicationService" = Depends(get_medication_service),
 ):
+    lane = (
+        INTERACTIVE
+        if len(request.texts) <= settings.ADMISSION_INTERACTIVE_MAX_TEXTS
+        else BULK
+    )
     try:
-        result = await medication_service.extract_entities(request.texts)
-        return MedicationResponse(
-            results=result.results, processing_time=result.processing_time
+        with deadline_context(deadline):
+            async with (
+                admission.admit(lane, timeout=deadline.remaining())
+                if admission
+                else nullcontext()
+            ):
+                result = await medication_service.extract_entities(request.texts)
+        # The service builds the response shape itself, it is encoded as is
+        return FastJSONResponse(result)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
         )
     except Exception as e:
-        logger.error(
-            f"An error was encountered while extracting entities: {e}.\n{traceback.format_exc()}"
+        logger.opt(exception=e).error(
+            "An error was encountered while extracting entities: {}", e
         )
         raise
 
@@ -35,7 +69,7 @@ async def extract_medications(
 @router.post("/index", response_model=MedicationIndexResponse)
 async def index_medications(
     request: MedicationIndexRequest,
-    medication_service: MedicationService = Depends(get_medication_service),
+    medication_service: "MedicationService" = Depends(get_medication_service),
 ):
     """
     Index medication entities into the vector database for future retrieval.
@@ -43,10 +77,63 @@ async def index_medications(
     try:
         result = await medication_service.index_medications(request.medications)
         return MedicationIndexResponse(
-            message=result.message, processing_time=result.processing_time
+            message=result.message,
+            processing_time=result.processing_time,
+            ids=result.ids,
+        )
+    except Exception as e:
+        logger.opt(exception=e).error(
+            "An error was encountered while indexing medications: {}", e
+        )
+        raise
+
+
+@router.patch("/index/{document_id}", response_model=MedicationIndexResponse)
+async def update_medication(
+    document_id: str,
+    request: MedicationUpdateRequest,
+    medication_service: "MedicationService" = Depends(get_medication_service),
+):
+    """
+    Update an indexed medication by id, re-embedding it only if its text changed.
+    """
+    try:
+        result = await medication_service.update_medication(document_id, request)
+    except Exception as e:
+        logger.opt(exception=e).error(
+            "An error was encountered while updating medication {}: {}",
+            document_id,
+            e,
         )
+        raise
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Medication {document_id} not found",
+        )
+    return result
+
+
+@router.delete("/index/{document_id}", response_model=MedicationIndexResponse)
+async def delete_medication(
+    document_id: str,
+    medication_service: "MedicationService" = Depends(get_medication_service),
+):
+    """
+    Remove an indexed medication by id.
+    """
+    try:
+        result = await medication_service.delete_medication(document_id)
     except Exception as e:
-        logger.error(
-            f"An error was encountered while indexing medications: {e}.\n{traceback.format_exc()}"
+        logger.opt(exception=e).error(
+            "An error was encountered while deleting medication {}: {}",
+            document_id,
+            e,
         )
         raise
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Medication {document_id} not found",
+        )
+    return result
@@ -1,32 +1,185 @@
+import os
 import sys
+import queue
+import random
+import asyncio
 import logging
+import zipfile
+import threading
 from pathlib import Path
+from typing import Any, Optional
+from logging.handlers import TimedRotatingFileHandler
 from loguru import logger
+from app.config.settings import settings
 
-# Remove default logger
-logger.remove()
 
-# Create logs directory if it doesn't exist
-LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
-
-# Configure loguru logger
-logger.add(
-    sys.stdout,
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="INFO",
-    colorize=True,
+LOG_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
 )
 
-# Add file logging with rotation
-logger.add(
-    LOG_DIR / "app_{time:YYYY-MM-DD}.log",
-    rotation="00:00",  # Create new file at midnight
-    retention="30 days",  # Keep logs for 30 days
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="DEBUG",
-    compression="zip",  # Compress rotated files
-)
+_sampling = {"debug_enabled": True, "rate": 1.0}
+
+
+class BackgroundSink:
+    """Sink that hands formatted records to a writer thread.
+
+    Loguru's own ``enqueue`` pickles every record onto a multiprocessing queue,
+    which costs more on the calling thread than the write it saves. This keeps
+    the records in-process so logging never waits on stdout or disk.
+    """
+
+    _STOP = object()
+
+    def __init__(self, sink: Any):
+        self._sink = sink
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._drain, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        self._queue.put(message)
+
+    def _drain(self) -> None:
+        while True:
+            message = self._queue.get()
+            if message is self._STOP:
+                break
+            if isinstance(message, threading.Event):
+                message.set()
+                continue
+            try:
+                self._sink.write(message)
+                if self._queue.empty() and hasattr(self._sink, "flush"):
+                    self._sink.flush()
+            except Exception as e:
+                sys.stderr.write(f"Logging sink failed: {e}\n")
+
+    def stop(self) -> None:
+        """Write out queued records and stop the writer thread"""
+        self._queue.put(self._STOP)
+        self._thread.join()
+        if hasattr(self._sink, "stop"):
+            self._sink.stop()
+
+    async def complete(self) -> None:
+        """Wait until the records queued so far are written"""
+        written = threading.Event()
+        self._queue.put(written)
+        await asyncio.to_thread(written.wait)
+
+
+class StdoutSink:
+    """Writes to whatever ``sys.stdout`` is at write time.
+
+    Test runners and servers swap ``sys.stdout``, so keeping the stream found at
+    configuration time ends up writing to a closed file.
+    """
+
+    def write(self, message: str) -> None:
+        sys.stdout.write(message)
+
+    def flush(self) -> None:
+        sys.stdout.flush()
+
+
+def _zip_rotated(source: str, dest: str) -> None:
+    with zipfile.ZipFile(dest, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.write(source, Path(source).name)
+    os.remove(source)
+
+
+class RotatingFileSink:
+    """Log file rotated at midnight, zipped once rotated and kept for 30 days.
+
+    The file and its directory are created on the first record.
+    """
+
+    def __init__(self, log_dir: Path, retention_days: int = 30):
+        self._log_dir = Path(log_dir)
+        self._handler = TimedRotatingFileHandler(
+            self._log_dir / "app.log",
+            when="midnight",
+            backupCount=retention_days,
+            encoding="utf-8",
+            delay=True,
+        )
+        self._handler.terminator = ""
+        self._handler.namer = lambda name: f"{name}.zip"
+        self._handler.rotator = _zip_rotated
+
+    def write(self, message: str) -> None:
+        if self._handler.stream is None:
+            self._log_dir.mkdir(parents=True, exist_ok=True)
+        # A record without args is written as is, "%" included
+        self._handler.emit(logging.makeLogRecord({"msg": message}))
+
+    def flush(self) -> None:
+        self._handler.flush()
+
+    def stop(self) -> None:
+        self._handler.close()
+
+
+def configure_logging(
+    level: str = settings.LOG_LEVEL,
+    file_level: Optional[str] = settings.LOG_FILE_LEVEL,
+    log_dir: Path = Path(settings.LOG_DIR),
+    json: bool = settings.LOG_JSON,
+    enqueue: bool = settings.LOG_ENQUEUE,
+    debug_sample_rate: float = settings.LOG_DEBUG_SAMPLE_RATE,
+) -> None:
+    """Replace the loguru sinks with stdout and, if ``file_level`` is set, a file.
+
+    Args:
+        level: Minimum level written to stdout
+        file_level: Minimum level written to the rotating log file, None to disable
+        log_dir: Directory of the log files
+        json: Write one JSON object per record instead of formatted text
+        enqueue: Write through a ``BackgroundSink`` so sink I/O never blocks
+        debug_sample_rate: Fraction of per-item DEBUG events kept by ``sample_debug``
+    """
+    logger.remove()
+    stdout_sink = StdoutSink()
+    logger.add(
+        BackgroundSink(stdout_sink) if enqueue else stdout_sink,
+        format=LOG_FORMAT,
+        level=level,
+        colorize=not json and sys.stdout.isatty(),
+        serialize=json,
+    )
+
+    levels = [logger.level(level).no]
+    if file_level:
+        # Add file logging with rotation, creating the file on the first record
+        file_sink = RotatingFileSink(log_dir)
+        logger.add(
+            BackgroundSink(file_sink) if enqueue else file_sink,
+            format=LOG_FORMAT,
+            level=file_level,
+            colorize=False,
+            serialize=json,
+        )
+        levels.append(logger.level(file_level).no)
+
+    _sampling["debug_enabled"] = min(levels) <= logger.level("DEBUG").no
+    _sampling["rate"] = debug_sample_rate
+
+
+def sample_debug() -> bool:
+    """Whether a per-item DEBUG event should be logged.
+
+    Guarding hot-path debug calls with this skips building the message entirely
+    when no sink takes DEBUG, and keeps only a sample of them otherwise.
+    """
+    if not _sampling["debug_enabled"]:
+        return False
+    rate = _sampling["rate"]
+    return rate >= 1.0 or random.random() < rate
+
+
+configure_logging()
 
 
 # Intercept standard library logging
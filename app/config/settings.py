@@ -1,3 +1,4 @@
+from typing import Optional
 from dotenv import load_dotenv
 from pydantic import computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -11,16 +12,37 @@ class Settings(BaseSettings):
     PROJECT_DESCRIPTION: str
     API_V1_STR: str = "/api/v1"
 
+    FASTAPI_HOST: str = "0.0.0.0"
+    FASTAPI_WORKERS: int = 1
+
     QDRANT_COLLECTION_NAME: str
     QDRANT_EMBEDDING_DIM: int
     QDRANT_HOST: str
     QDRANT_PORT: int
+    QDRANT_LOCATION: Optional[str] = None
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_PREFER_GRPC: bool = False
+    QDRANT_RETURN_EMBEDDING: bool = False
+    QDRANT_COLLECTION_PROFILE: str = "default"
+    QDRANT_HNSW_M: Optional[int] = None
+    QDRANT_HNSW_EF_CONSTRUCT: Optional[int] = None
+    QDRANT_SEARCH_EF: Optional[int] = None
 
     EMBEDDING_MODEL_DENSE: str
     EMBEDDING_MODEL_SPARSE: str
+    EMBEDDING_THREADS: Optional[int] = None
 
     RERANKER_MODEL: str
     RERANKER_TOP_K: int
+    RERANKER_BACKEND: str = "transformers"
+    RERANKER_ONNX_QUANTIZE: bool = True
+    RERANKER_ONNX_DIR: str = "models/onnx"
+    RERANKER_BATCH_SIZE: int = 16
+    RERANKER_MAX_LENGTH: int = 256
+    RERANKER_THREADS: Optional[int] = None
+    RERANKER_SKIP_MARGIN: Optional[float] = None
+    RERANKER_SKIP_EXACT_MATCH: bool = True
+    RERANKER_MIN_BUDGET_MS: Optional[float] = 1000.0
 
     RETRIEVER_TOP_K: int
 
@@ -32,6 +54,57 @@ class Settings(BaseSettings):
     OLLAMA_API_HOST: str
     OLLAMA_API_PORT: int
 
+    PRELOAD_MODELS: bool = False
+
+    PIPELINE_THREADS: Optional[int] = None
+    PIPELINE_INIT_THREADS: Optional[int] = None
+
+    CPU_THREADS_AUTO: bool = False
+    CPU_MODEL_CALLS: int = 2
+    CPU_PIN_WORKERS: bool = False
+
+    REQUEST_TIMEOUT_MS: float = 30000.0
+    REQUEST_MAX_TIMEOUT_MS: float = 120000.0
+
+    EXTRACTION_DEDUP_ENABLED: bool = True
+    RETRIEVAL_CACHE_SIZE: int = 10000
+
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT_S: float = 30.0
+    CIRCUIT_OLLAMA_SLOW_MS: Optional[float] = None
+    CIRCUIT_QDRANT_SLOW_MS: Optional[float] = None
+
+    ADMISSION_MAX_CONCURRENCY: Optional[int] = 8
+    ADMISSION_INTERACTIVE_MAX_TEXTS: int = 1
+    ADMISSION_INTERACTIVE_MAX_QUEUE: int = 64
+    ADMISSION_INTERACTIVE_MAX_WAIT_MS: float = 2000.0
+    ADMISSION_BULK_MAX_QUEUE: int = 16
+    ADMISSION_BULK_MAX_WAIT_MS: float = 10000.0
+
+    INFERENCE_SOCKET: Optional[str] = None
+    INFERENCE_TIMEOUT: float = 30.0
+    INFERENCE_MAX_BATCH: int = 32
+    INFERENCE_MAX_WAIT_MS: float = 2.0
+    INFERENCE_THREADS: Optional[int] = None
+
+    SNAPSHOT_ENABLED: bool = True
+    SNAPSHOT_DIR: str = "snapshots"
+
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE_LEVEL: Optional[str] = "DEBUG"
+    LOG_DIR: str = "logs"
+    LOG_JSON: bool = False
+    LOG_ENQUEUE: bool = True
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0
+
+    OTEL_ENABLED: bool = False
+
+    ADMIN_TOKEN: Optional[str] = None
+    PROFILE_MAX_SECONDS: float = 60.0
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILE_SLOW_REQUEST_MS: Optional[float] = None
+
     @computed_field
     @property
     def QDRANT_URL(self) -> str:
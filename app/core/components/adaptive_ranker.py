@@ -0,0 +1,143 @@
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from haystack import component, default_to_dict
+from haystack.core.serialization import (
+    component_from_dict,
+    component_to_dict,
+    import_class_by_name,
+)
+from haystack.dataclasses import Document
+from app.core.monitoring.metrics import metrics
+from app.core.pipeline.deadline import current_deadline
+from app.config.logging import get_logger, sample_debug
+
+
+logger = get_logger(__name__)
+
+RERANKER_DECISIONS = metrics.counter(
+    "reranker_decisions",
+    "Reranker calls by whether the cross-encoder ran or was bypassed",
+    ["decision"],
+)
+RERANKER_SECONDS = metrics.histogram(
+    "reranker_seconds", "Time spent in the reranker step", ["decision"]
+)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class RetrievalMarginPolicy:
+    """Decides whether fused retrieval scores are decisive enough to skip reranking.
+
+    Retrieval is decisive when the top hit is an exact (case and whitespace
+    insensitive) match of the query, or when its fused score leads the runner-up
+    by at least ``margin`` relative to its own score.
+    """
+
+    def __init__(self, margin: float, exact_match: bool = True):
+        self.margin = margin
+        self.exact_match = exact_match
+
+    @staticmethod
+    def relative_margin(documents: List[Document]) -> float:
+        """Lead of the top fused score over the runner-up, relative to the top"""
+        if len(documents) < 2:
+            return 1.0
+        first, second = documents[0].score, documents[1].score
+        if first is None or second is None or first <= 0:
+            return 0.0
+        return (first - second) / first
+
+    @staticmethod
+    def is_exact_match(query: str, documents: List[Document]) -> bool:
+        return bool(documents) and _normalize(documents[0].content or "") == (
+            _normalize(query)
+        )
+
+    def is_decisive(self, query: str, documents: List[Document]) -> bool:
+        if not documents:
+            return True
+        if self.exact_match and self.is_exact_match(query, documents):
+            return True
+        return self.relative_margin(documents) >= self.margin
+
+
+@component
+class AdaptiveRanker:
+    """Runs the wrapped cross-encoder ranker only when retrieval is not decisive.
+
+    When the policy skips reranking, or the request deadline leaves less than
+    ``min_budget`` seconds, the first ``top_k`` documents are returned in their
+    retrieval order.
+    """
+
+    def __init__(
+        self,
+        ranker: Any,
+        margin: Optional[float] = None,
+        top_k: int = 10,
+        exact_match: bool = True,
+        min_budget: Optional[float] = None,
+    ):
+        self.ranker = ranker
+        self.top_k = top_k
+        self.exact_match = exact_match
+        self.min_budget = min_budget
+        self.policy = (
+            RetrievalMarginPolicy(margin=margin, exact_match=exact_match)
+            if margin is not None
+            else None
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return default_to_dict(
+            self,
+            ranker=component_to_dict(self.ranker),
+            margin=self.policy.margin if self.policy is not None else None,
+            top_k=self.top_k,
+            exact_match=self.exact_match,
+            min_budget=self.min_budget,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AdaptiveRanker":
+        ranker_data = data["init_parameters"]["ranker"]
+        data["init_parameters"]["ranker"] = component_from_dict(
+            import_class_by_name(ranker_data["type"]), ranker_data, "ranker"
+        )
+        return cls(**data["init_parameters"])
+
+    def warm_up(self) -> None:
+        if hasattr(self.ranker, "warm_up"):
+            self.ranker.warm_up()
+
+    @component.output_types(documents=List[Document])
+    def run(self, query: str, documents: List[Document], top_k: Optional[int] = None):
+        """Rerank the documents unless the retrieval scores are decisive"""
+        top_k = top_k or self.top_k
+        start = perf_counter()
+        deadline = current_deadline()
+        if self.policy is not None and self.policy.is_decisive(query, documents):
+            decision = "skipped"
+            result = {"documents": documents[:top_k]}
+        elif (
+            self.min_budget is not None
+            and deadline is not None
+            and deadline.remaining() < self.min_budget
+        ):
+            # Leave the remaining time to generation
+            decision = "deadline"
+            deadline.degrade("rerank_skipped")
+            result = {"documents": documents[:top_k]}
+        else:
+            decision = "reranked"
+            result = self.ranker.run(query=query, documents=documents, top_k=top_k)
+
+        RERANKER_DECISIONS.inc(decision=decision)
+        RERANKER_SECONDS.observe(perf_counter() - start, decision=decision)
+        if sample_debug():
+            logger.debug("Reranker {} for {} documents", decision, len(documents))
+        return {"documents": result["documents"]}
@@ -0,0 +1,65 @@
+from typing import Any, Dict, List, Optional
+
+from haystack import component, default_from_dict, default_to_dict
+from haystack.dataclasses import Document, SparseEmbedding
+from app.core.document_store.store import PooledQdrantDocumentStore
+
+
+@component
+class QdrantBatchHybridRetriever:
+    """Retrieves documents for many queries with a single batched hybrid search"""
+
+    def __init__(
+        self,
+        document_store: PooledQdrantDocumentStore,
+        top_k: int = 10,
+        return_embedding: bool = False,
+        score_threshold: Optional[float] = None,
+    ):
+        if not isinstance(document_store, PooledQdrantDocumentStore):
+            raise ValueError(
+                "document_store must be an instance of PooledQdrantDocumentStore"
+            )
+
+        self._document_store = document_store
+        self._top_k = top_k
+        self._return_embedding = return_embedding
+        self._score_threshold = score_threshold
+
+    def to_dict(self) -> Dict[str, Any]:
+        return default_to_dict(
+            self,
+            document_store=self._document_store.to_dict(),
+            top_k=self._top_k,
+            return_embedding=self._return_embedding,
+            score_threshold=self._score_threshold,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QdrantBatchHybridRetriever":
+        data["init_parameters"]["document_store"] = PooledQdrantDocumentStore.from_dict(
+            data["init_parameters"]["document_store"]
+        )
+        return default_from_dict(cls, data)
+
+    @component.output_types(documents=List[List[Document]])
+    def run(
+        self,
+        query_embeddings: List[List[float]],
+        query_sparse_embeddings: List[SparseEmbedding],
+        top_k: Optional[int] = None,
+        return_embedding: Optional[bool] = None,
+    ):
+        """Retrieve documents for each pair of dense and sparse query embeddings"""
+        if len(query_embeddings) != len(query_sparse_embeddings):
+            raise ValueError("Dense and sparse query embeddings must have equal length")
+
+        documents = self._document_store.query_hybrid_batch(
+            queries=list(zip(query_embeddings, query_sparse_embeddings)),
+            top_k=top_k or self._top_k,
+            return_embedding=(
+                self._return_embedding if return_embedding is None else return_embedding
+            ),
+            score_threshold=self._score_threshold,
+        )
+        return {"documents": documents}
@@ -0,0 +1,114 @@
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from haystack import component, default_to_dict
+from haystack.core.serialization import (
+    component_from_dict,
+    component_to_dict,
+    import_class_by_name,
+)
+from app.core.monitoring.metrics import metrics
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+LLM_CACHE_REQUESTS = metrics.counter(
+    "llm_cache_requests", "LLM cache lookups by result", ["result"]
+)
+
+
+class LLMCache:
+    """Append-only JSONL cache of generator outputs keyed by prompt hash and model.
+
+    Only deterministic generation (temperature 0) should be cached, as a cached
+    reply is returned for every later call with the same prompt and model.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def key(prompt: str, model: str) -> str:
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return f"{model}:{prompt_hash}"
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, mode="r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A run interrupted mid-write leaves a partial last line
+                    continue
+                self._entries[entry["key"]] = entry["output"]
+        logger.info(f"Loaded {len(self._entries)} cached LLM outputs from {self.path}")
+
+    def get(self, prompt: str, model: str) -> Optional[Dict[str, Any]]:
+        output = self._entries.get(self.key(prompt, model))
+        with self._lock:
+            if output is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        LLM_CACHE_REQUESTS.inc(result="miss" if output is None else "hit")
+        return output
+
+    def put(self, prompt: str, model: str, output: Dict[str, Any]) -> None:
+        key = self.key(prompt, model)
+        line = json.dumps({"key": key, "model": model, "output": output}, default=str)
+        with self._lock:
+            self._entries[key] = output
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, mode="a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@component
+class CachedGenerator:
+    """Generator wrapper that serves repeated prompts from an ``LLMCache``"""
+
+    def __init__(self, generator: Any, cache_path: str):
+        self.generator = generator
+        self.cache_path = cache_path
+        self.cache = LLMCache(Path(cache_path))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return default_to_dict(
+            self,
+            generator=component_to_dict(self.generator),
+            cache_path=self.cache_path,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CachedGenerator":
+        generator_data = data["init_parameters"]["generator"]
+        data["init_parameters"]["generator"] = component_from_dict(
+            import_class_by_name(generator_data["type"]), generator_data, "generator"
+        )
+        return cls(**data["init_parameters"])
+
+    @component.output_types(replies=List[str], meta=List[Dict[str, Any]])
+    def run(self, prompt: str, generation_kwargs: Optional[Dict[str, Any]] = None):
+        """Return the cached output for the prompt, or generate and cache it"""
+        model = self.generator.model
+        cached = self.cache.get(prompt, model)
+        if cached is not None:
+            return cached
+
+        output = self.generator.run(prompt=prompt, generation_kwargs=generation_kwargs)
+        self.cache.put(prompt, model, output)
+        return output
@@ -0,0 +1,251 @@
+import os
+import fcntl
+import shutil
+import inspect
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from haystack import component, default_to_dict
+from haystack.dataclasses import Document
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+FP32_MODEL_FILE = "model.onnx"
+INT8_MODEL_FILE = "model.int8.onnx"
+EXPORT_LOCK_FILE = ".export.lock"
+
+
+def export_onnx_model(model: str, output_dir: Path, quantize: bool = True) -> Path:
+    """Export a Hugging Face cross-encoder to ONNX, optionally with int8 weights.
+
+    Workers, the preforking parent and the inference server may export at once,
+    so exports hold a lock on the directory and each file appears complete, by
+    rename, or not at all.
+
+    Args:
+        model: Hugging Face model id or local path of the cross-encoder
+        output_dir: Directory receiving the ONNX files and the tokenizer
+        quantize: Whether to also write a dynamically int8 quantized model
+
+    Returns:
+        Path of the model file to load
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = output_dir / FP32_MODEL_FILE
+    int8_path = output_dir / INT8_MODEL_FILE
+    if fp32_path.exists() and (not quantize or int8_path.exists()):
+        return int8_path if quantize else fp32_path
+
+    with open(output_dir / EXPORT_LOCK_FILE, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            # Another process may have exported while this one waited
+            if not fp32_path.exists():
+                _export_fp32(model, output_dir)
+            if not quantize:
+                return fp32_path
+            if not int8_path.exists():
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+
+                logger.info(f"Quantizing {fp32_path.name} to int8")
+                tmp_path = output_dir / f".{INT8_MODEL_FILE}.{os.getpid()}.tmp"
+                quantize_dynamic(
+                    str(fp32_path), str(tmp_path), weight_type=QuantType.QInt8
+                )
+                os.replace(tmp_path, int8_path)
+            return int8_path
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _export_fp32(model: str, output_dir: Path) -> None:
+    """Export the model and its tokenizer to a temporary directory, then move
+    them into ``output_dir``, the model file last"""
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    logger.info(f"Exporting {model} to ONNX in {output_dir}")
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".export-", dir=output_dir))
+    try:
+        tokenizer = AutoTokenizer.from_pretrained(model)
+        torch_model = AutoModelForSequenceClassification.from_pretrained(model)
+        torch_model.eval()
+        # Keep the logits output only, the export cannot trace ModelOutput
+        torch_model.config.return_dict = False
+
+        sample = tokenizer(["query"], ["document"], return_tensors="pt")
+        # Inputs are traced positionally, so follow the order of forward()
+        input_names = [
+            name
+            for name in inspect.signature(torch_model.forward).parameters
+            if name in sample
+        ]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+
+        export_kwargs = {}
+        if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+            export_kwargs["dynamo"] = False
+        with torch.no_grad():
+            torch.onnx.export(
+                torch_model,
+                tuple(sample[name] for name in input_names),
+                str(tmp_dir / FP32_MODEL_FILE),
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+                **export_kwargs,
+            )
+        tokenizer.save_pretrained(tmp_dir)
+
+        # The model file marks a complete export, so it is moved in last
+        for path in sorted(tmp_dir.iterdir(), key=lambda p: p.name == FP32_MODEL_FILE):
+            os.replace(path, output_dir / path.name)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+@component
+class OnnxCrossEncoderRanker:
+    """Cross-encoder ranker running an ONNX export of the model on ONNX Runtime.
+
+    Drop-in replacement for ``TransformersSimilarityRanker`` on CPU: pairs are
+    scored in length-sorted batches with a capped token length, and the model is
+    dynamically quantized to int8 unless ``quantize`` is False.
+    """
+
+    def __init__(
+        self,
+        model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        top_k: int = 10,
+        batch_size: int = 16,
+        max_length: int = 256,
+        threads: Optional[int] = None,
+        quantize: bool = True,
+        cache_dir: str = "models/onnx",
+        scale_score: bool = True,
+        calibration_factor: float = 1.0,
+        score_threshold: Optional[float] = None,
+    ):
+        if top_k <= 0:
+            raise ValueError(f"top_k must be > 0, but got {top_k}")
+
+        self.model = model
+        self.top_k = top_k
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.threads = threads
+        self.quantize = quantize
+        self.cache_dir = cache_dir
+        self.scale_score = scale_score
+        self.calibration_factor = calibration_factor
+        self.score_threshold = score_threshold
+        self._session = None
+        self._tokenizer = None
+        self._input_names: List[str] = []
+
+    @property
+    def model_dir(self) -> Path:
+        return Path(self.cache_dir) / self.model.replace("/", "--")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return default_to_dict(
+            self,
+            model=self.model,
+            top_k=self.top_k,
+            batch_size=self.batch_size,
+            max_length=self.max_length,
+            threads=self.threads,
+            quantize=self.quantize,
+            cache_dir=self.cache_dir,
+            scale_score=self.scale_score,
+            calibration_factor=self.calibration_factor,
+            score_threshold=self.score_threshold,
+        )
+
+    def warm_up(self) -> None:
+        """Export the model on first use and open the ONNX Runtime session"""
+        if self._session is not None:
+            return
+
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = export_onnx_model(self.model, self.model_dir, self.quantize)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.inter_op_num_threads = 1
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+
+        self._session = ort.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = [node.name for node in self._session.get_inputs()]
+        self._tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+        logger.info(f"Loaded ONNX reranker from {model_path}")
+
+    def score(self, query: str, texts: List[str]) -> np.ndarray:
+        """Raw relevance logits of ``query`` against each text"""
+        if self._session is None:
+            raise RuntimeError(
+                "The component OnnxCrossEncoderRanker wasn't warmed up. "
+                "Run 'warm_up()' before calling 'run()'."
+            )
+
+        scores = np.empty(len(texts), dtype=np.float32)
+        # Batching similar lengths together keeps padding to a minimum
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for offset in range(0, len(order), self.batch_size):
+            batch = order[offset : offset + self.batch_size]
+            features = self._tokenizer(
+                [query] * len(batch),
+                [texts[i] for i in batch],
+                padding=True,
+                truncation="only_second",
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            inputs = {
+                name: features[name].astype(np.int64) for name in self._input_names
+            }
+            logits = self._session.run(["logits"], inputs)[0]
+            scores[batch] = logits[:, 0]
+        return scores
+
+    @component.output_types(documents=List[Document])
+    def run(
+        self,
+        query: str,
+        documents: List[Document],
+        top_k: Optional[int] = None,
+        score_threshold: Optional[float] = None,
+    ):
+        """Return the ``top_k`` documents most relevant to the query"""
+        if not documents:
+            return {"documents": []}
+
+        top_k = top_k or self.top_k
+        score_threshold = score_threshold or self.score_threshold
+        if top_k <= 0:
+            raise ValueError(f"top_k must be > 0, but got {top_k}")
+
+        scores = self.score(query, [doc.content or "" for doc in documents])
+        if self.scale_score:
+            scores = 1 / (1 + np.exp(-scores * self.calibration_factor))
+
+        ranked = [
+            replace(documents[i], score=float(scores[i]))
+            for i in np.argsort(-scores, kind="stable")
+        ]
+        if score_threshold is not None:
+            ranked = [doc for doc in ranked if doc.score >= score_threshold]
+        return {"documents": ranked[:top_k]}
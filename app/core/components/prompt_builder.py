@@ -0,0 +1,40 @@
+from time import perf_counter
+from typing import List, Optional
+
+from haystack import component
+from haystack.dataclasses import Document
+from app.core.monitoring.metrics import metrics
+from app.prompts.template import PROMPT_EXAMPLE_KEY, build_prompt, render_example
+
+
+PROMPT_BUILD_SECONDS = metrics.histogram(
+    "prompt_build_seconds",
+    "Time to assemble one extraction prompt",
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025),
+)
+
+
+def document_example(document: Document) -> str:
+    """Few-shot example of a retrieved document, pre-rendered when it was indexed"""
+    meta = document.meta or {}
+    example = meta.get(PROMPT_EXAMPLE_KEY)
+    if example is None:
+        # Indexed before examples were pre-rendered
+        example = render_example(document.content, meta)
+    return example
+
+
+@component
+class MedicationPromptBuilder:
+    """Builds the extraction prompt by joining the documents' few-shot examples.
+
+    Produces the same prompt as ``PromptBuilder(template=MEDICATION_NER)``
+    without compiling or rendering the Jinja template.
+    """
+
+    @component.output_types(prompt=str)
+    def run(self, query: str, documents: Optional[List[Document]] = None):
+        start = perf_counter()
+        prompt = build_prompt(query, [document_example(d) for d in documents or []])
+        PROMPT_BUILD_SECONDS.observe(perf_counter() - start)
+        return {"prompt": prompt}
@@ -0,0 +1,132 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from haystack import component, default_to_dict
+from haystack.dataclasses import Document, SparseEmbedding
+
+from app.core.components.onnx_ranker import OnnxCrossEncoderRanker
+from app.core.inference.client import InferenceClient, get_inference_client
+
+
+# Documents per request, keeping indexing messages well below the size limit
+DOCUMENT_BATCH_SIZE = 256
+
+
+def _batches(documents: List[Document], size: int = DOCUMENT_BATCH_SIZE):
+    for offset in range(0, len(documents), size):
+        yield documents[offset : offset + size]
+
+
+class _SidecarComponent:
+    """Base of the components delegating their model to the inference server"""
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    @property
+    def client(self) -> InferenceClient:
+        return get_inference_client(self.socket_path, self.timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return default_to_dict(self, socket_path=self.socket_path, timeout=self.timeout)
+
+    def warm_up(self) -> None:
+        """Models are loaded by the inference server"""
+
+
+@component
+class SidecarTextEmbedder(_SidecarComponent):
+    """Drop-in replacement for ``FastembedTextEmbedder`` using the inference server"""
+
+    @component.output_types(embedding=List[float])
+    def run(self, text: str):
+        if not isinstance(text, str):
+            raise TypeError("SidecarTextEmbedder expects a string as input")
+        return {"embedding": self.client.dense([text])[0]}
+
+
+@component
+class SidecarSparseTextEmbedder(_SidecarComponent):
+    """Drop-in replacement for ``FastembedSparseTextEmbedder`` using the inference server"""
+
+    @component.output_types(sparse_embedding=SparseEmbedding)
+    def run(self, text: str):
+        if not isinstance(text, str):
+            raise TypeError("SidecarSparseTextEmbedder expects a string as input")
+        embedding = self.client.sparse([text])[0]
+        return {"sparse_embedding": SparseEmbedding(**embedding)}
+
+
+@component
+class SidecarDocumentEmbedder(_SidecarComponent):
+    """Drop-in replacement for ``FastembedDocumentEmbedder`` using the inference server"""
+
+    @component.output_types(documents=List[Document])
+    def run(self, documents: List[Document]):
+        for batch in _batches(documents):
+            embeddings = self.client.dense([doc.content or "" for doc in batch])
+            for doc, embedding in zip(batch, embeddings):
+                doc.embedding = embedding
+        return {"documents": documents}
+
+
+@component
+class SidecarSparseDocumentEmbedder(_SidecarComponent):
+    """Drop-in replacement for ``FastembedSparseDocumentEmbedder`` using the inference server"""
+
+    @component.output_types(documents=List[Document])
+    def run(self, documents: List[Document]):
+        for batch in _batches(documents):
+            embeddings = self.client.sparse([doc.content or "" for doc in batch])
+            for doc, embedding in zip(batch, embeddings):
+                doc.sparse_embedding = SparseEmbedding(**embedding)
+        return {"documents": documents}
+
+
+@component
+class SidecarRanker(OnnxCrossEncoderRanker):
+    """Cross-encoder ranker scoring the pairs on the inference server.
+
+    Ranks exactly like ``OnnxCrossEncoderRanker``, only the logits come from
+    whichever reranker backend the server runs.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        top_k: int = 10,
+        timeout: float = 30.0,
+        scale_score: bool = True,
+        calibration_factor: float = 1.0,
+        score_threshold: Optional[float] = None,
+    ):
+        # The component decorator recreates the class, so super() cannot be used
+        OnnxCrossEncoderRanker.__init__(
+            self,
+            top_k=top_k,
+            scale_score=scale_score,
+            calibration_factor=calibration_factor,
+            score_threshold=score_threshold,
+        )
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def to_dict(self) -> Dict[str, Any]:
+        return default_to_dict(
+            self,
+            socket_path=self.socket_path,
+            top_k=self.top_k,
+            timeout=self.timeout,
+            scale_score=self.scale_score,
+            calibration_factor=self.calibration_factor,
+            score_threshold=self.score_threshold,
+        )
+
+    def warm_up(self) -> None:
+        """Models are loaded by the inference server"""
+
+    def score(self, query: str, texts: List[str]) -> np.ndarray:
+        client = get_inference_client(self.socket_path, self.timeout)
+        scores = client.score([(query, text) for text in texts])
+        return np.asarray(scores, dtype=np.float32)
@@ -1,4 +1,5 @@
-from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
+from app.core.document_store.store import PooledQdrantDocumentStore
+from app.core.document_store.profiles import get_collection_profile
 from app.config.settings import settings
 from app.config.logging import get_logger
 
@@ -9,16 +10,41 @@ logger = get_logger(__name__)
 class DocumentStoreFactory:
     """Factory for creating fresh document store instances"""
 
-    def create_document_store(self) -> QdrantDocumentStore:
-        """Create a new instance of QdrantDocumentStore with configured parameters"""
+    def create_document_store(self) -> PooledQdrantDocumentStore:
+        """Create a new instance of QdrantDocumentStore with configured parameters.
+
+        Stores share one pooled client per Qdrant target, so creating a store does
+        not open a new connection.
+        """
         logger.info("Creating new QdrantDocumentStore instance")
-        return QdrantDocumentStore(
-            host=settings.QDRANT_HOST,
-            port=settings.QDRANT_PORT,
+        profile = get_collection_profile(
+            settings.QDRANT_COLLECTION_PROFILE,
+            hnsw_m=settings.QDRANT_HNSW_M,
+            hnsw_ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT,
+            search_ef=settings.QDRANT_SEARCH_EF,
+        )
+        # QDRANT_LOCATION (e.g. ":memory:") selects the embedded local mode
+        connection = (
+            {"location": settings.QDRANT_LOCATION}
+            if settings.QDRANT_LOCATION
+            else {
+                "host": settings.QDRANT_HOST,
+                "port": settings.QDRANT_PORT,
+                "grpc_port": settings.QDRANT_GRPC_PORT,
+                "prefer_grpc": settings.QDRANT_PREFER_GRPC,
+            }
+        )
+        return PooledQdrantDocumentStore(
+            **connection,
             recreate_index=False,  # Set to True only for development
-            return_embedding=True,
+            return_embedding=settings.QDRANT_RETURN_EMBEDDING,
             use_sparse_embeddings=True,
             wait_result_from_api=True,
             sparse_idf=True,
             embedding_dim=settings.QDRANT_EMBEDDING_DIM,
+            on_disk=profile.on_disk,
+            on_disk_payload=profile.on_disk_payload,
+            hnsw_config=profile.hnsw_config,
+            quantization_config=profile.quantization_config,
+            search_params=profile.search_params,
         )
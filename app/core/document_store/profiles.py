@@ -0,0 +1,103 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, ConfigDict
+from qdrant_client.http import models as rest
+
+
+class CollectionProfile(BaseModel):
+    """Storage, index and search settings applied to the Qdrant collection.
+
+    Collection settings (``on_disk``, ``hnsw_config``, ``quantization_config``) only
+    take effect when the collection is created. Search settings apply per query.
+    """
+
+    name: str
+    on_disk: bool = False
+    on_disk_payload: Optional[bool] = None
+    hnsw_config: Optional[rest.HnswConfigDiff] = None
+    quantization_config: Optional[rest.ScalarQuantization | rest.BinaryQuantization] = (
+        None
+    )
+    search_params: Optional[rest.SearchParams] = None
+
+    model_config = ConfigDict(frozen=True)
+
+
+COLLECTION_PROFILES: Dict[str, CollectionProfile] = {
+    # float32 vectors and HNSW graph fully in RAM
+    "default": CollectionProfile(name="default"),
+    # int8 vectors in RAM, full vectors rescored on the oversampled candidates
+    "scalar": CollectionProfile(
+        name="scalar",
+        quantization_config=rest.ScalarQuantization(
+            scalar=rest.ScalarQuantizationConfig(
+                type=rest.ScalarType.INT8, quantile=0.99, always_ram=True
+            )
+        ),
+        search_params=rest.SearchParams(
+            quantization=rest.QuantizationSearchParams(rescore=True, oversampling=2.0)
+        ),
+    ),
+    # 1 bit per dimension in RAM, needs more oversampling to keep recall up
+    "binary": CollectionProfile(
+        name="binary",
+        quantization_config=rest.BinaryQuantization(
+            binary=rest.BinaryQuantizationConfig(always_ram=True)
+        ),
+        search_params=rest.SearchParams(
+            quantization=rest.QuantizationSearchParams(rescore=True, oversampling=3.0)
+        ),
+    ),
+    # Original vectors and payload on disk, only int8 copies kept in RAM
+    "on_disk": CollectionProfile(
+        name="on_disk",
+        on_disk=True,
+        on_disk_payload=True,
+        hnsw_config=rest.HnswConfigDiff(on_disk=False),
+        quantization_config=rest.ScalarQuantization(
+            scalar=rest.ScalarQuantizationConfig(
+                type=rest.ScalarType.INT8, quantile=0.99, always_ram=True
+            )
+        ),
+        search_params=rest.SearchParams(
+            quantization=rest.QuantizationSearchParams(rescore=True, oversampling=2.0)
+        ),
+    ),
+}
+
+
+def get_collection_profile(
+    name: str,
+    hnsw_m: Optional[int] = None,
+    hnsw_ef_construct: Optional[int] = None,
+    search_ef: Optional[int] = None,
+) -> CollectionProfile:
+    """Look up a collection profile and apply HNSW overrides on top of it"""
+    try:
+        profile = COLLECTION_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown collection profile '{name}'. "
+            f"Choose one of: {', '.join(COLLECTION_PROFILES)}"
+        )
+
+    updates = {}
+    if hnsw_m is not None or hnsw_ef_construct is not None:
+        hnsw_config = profile.hnsw_config or rest.HnswConfigDiff()
+        updates["hnsw_config"] = hnsw_config.model_copy(
+            update={
+                key: value
+                for key, value in {
+                    "m": hnsw_m,
+                    "ef_construct": hnsw_ef_construct,
+                }.items()
+                if value is not None
+            }
+        )
+    if search_ef is not None:
+        search_params = profile.search_params or rest.SearchParams()
+        updates["search_params"] = search_params.model_copy(
+            update={"hnsw_ef": search_ef}
+        )
+
+    return profile.model_copy(update=updates) if updates else profile
@@ -0,0 +1,44 @@
+import threading
+from typing import Optional
+
+from app.core.document_store.factory import DocumentStoreFactory
+from app.core.document_store.store import PooledQdrantDocumentStore, qdrant_client_pool
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class DocumentStoreRegistry:
+    """Owns the document store shared by every pipeline of the process.
+
+    The store is created once, on first use or at startup, and its pooled Qdrant
+    client is closed on shutdown.
+    """
+
+    def __init__(self, factory: Optional[DocumentStoreFactory] = None):
+        self._factory = factory or DocumentStoreFactory()
+        self._store: Optional[PooledQdrantDocumentStore] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._store is not None
+
+    def get_document_store(self) -> PooledQdrantDocumentStore:
+        """Return the shared document store, creating it on first use"""
+        with self._lock:
+            if self._store is None:
+                self._store = self._factory.create_document_store()
+            return self._store
+
+    def close(self) -> None:
+        """Drop the shared store and close the pooled Qdrant clients"""
+        with self._lock:
+            if self._store is not None:
+                logger.info("Closing shared Qdrant document store")
+            self._store = None
+            qdrant_client_pool.close_all()
+
+
+document_store_registry = DocumentStoreRegistry()
@@ -0,0 +1,267 @@
+import os
+import json
+import fcntl
+import asyncio
+import shutil
+import hashlib
+import uuid
+from pathlib import Path
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+
+import numpy as np
+from pydantic import BaseModel
+from haystack.dataclasses import Document, SparseEmbedding
+from app.utils.serialization import dumps, loads
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# Version 2: documents are identified by a digest of their text, not a position
+SNAPSHOT_FORMAT_VERSION = 2
+CURRENT_POINTER = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+DENSE_FILE = "dense.npy"
+SPARSE_INDPTR_FILE = "sparse_indptr.npy"
+SPARSE_INDICES_FILE = "sparse_indices.npy"
+SPARSE_VALUES_FILE = "sparse_values.npy"
+META_OFFSETS_FILE = "meta_offsets.npy"
+META_BLOB_FILE = "meta.bin"
+
+
+class SnapshotManifest(BaseModel):
+    """Describes the contents of a few-shot index snapshot"""
+
+    format_version: int
+    source_digest: str
+    document_count: int
+    embedding_dim: int
+    sparse_nnz: int
+
+
+def compute_source_digest(source: bytes, *parts: Any) -> str:
+    """Digest of the raw few-shot data and everything that affects its embeddings."""
+    digest = hashlib.sha256()
+    digest.update(f"format={SNAPSHOT_FORMAT_VERSION}".encode())
+    for part in parts:
+        digest.update(f"|{part}".encode())
+    digest.update(source)
+    return digest.hexdigest()
+
+
+class IndexSnapshot:
+    """Read-only, memory-mapped view over an exported few-shot index snapshot.
+
+    The dense matrix and sparse CSR arrays are opened with ``mmap_mode="r"``, so the
+    file pages are shared through the OS page cache and only the batch of documents
+    being written is ever copied into Python objects.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.manifest = SnapshotManifest(
+            **json.loads((path / MANIFEST_FILE).read_text(encoding="utf-8"))
+        )
+        self.dense = np.load(path / DENSE_FILE, mmap_mode="r")
+        self.sparse_indptr = np.load(path / SPARSE_INDPTR_FILE, mmap_mode="r")
+        self.sparse_indices = np.load(path / SPARSE_INDICES_FILE, mmap_mode="r")
+        self.sparse_values = np.load(path / SPARSE_VALUES_FILE, mmap_mode="r")
+        self.meta_offsets = np.load(path / META_OFFSETS_FILE, mmap_mode="r")
+        self.meta_blob = np.memmap(path / META_BLOB_FILE, dtype=np.uint8, mode="r")
+
+    def __len__(self) -> int:
+        return self.manifest.document_count
+
+    def record(self, position: int) -> Dict[str, Any]:
+        """Decode the id, content and meta of the document at ``position``"""
+        start, end = (
+            int(self.meta_offsets[position]),
+            int(self.meta_offsets[position + 1]),
+        )
+        return loads(self.meta_blob[start:end].tobytes())
+
+    def sparse_embedding(self, position: int) -> SparseEmbedding:
+        """Slice the CSR arrays into the sparse embedding of one document"""
+        start, end = (
+            int(self.sparse_indptr[position]),
+            int(self.sparse_indptr[position + 1]),
+        )
+        return SparseEmbedding(
+            indices=self.sparse_indices[start:end].tolist(),
+            values=self.sparse_values[start:end].tolist(),
+        )
+
+    def document(self, position: int) -> Document:
+        """Rebuild the embedded Haystack document at ``position``"""
+        record = self.record(position)
+        return Document(
+            id=record["id"],
+            content=record["content"],
+            meta=record["meta"],
+            embedding=self.dense[position].tolist(),
+            sparse_embedding=self.sparse_embedding(position),
+        )
+
+    def iter_batches(self, batch_size: int = 256) -> Iterator[List[Document]]:
+        """Rebuild the documents in batches ready to be written to the store"""
+        for start in range(0, len(self), batch_size):
+            end = min(start + batch_size, len(self))
+            yield [self.document(position) for position in range(start, end)]
+
+    def to_documents(self) -> List[Document]:
+        """Rebuild all embedded Haystack documents at once"""
+        return [self.document(position) for position in range(len(self))]
+
+
+class SnapshotStore:
+    """Builds and opens versioned few-shot index snapshots under a root directory.
+
+    Each snapshot lives in its own directory named after its source digest. Builds are
+    written to a temporary directory and renamed into place, then published by
+    atomically replacing the ``CURRENT`` pointer file.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def load(self, source_digest: str) -> Optional[IndexSnapshot]:
+        """Open the current snapshot if it was built from ``source_digest``"""
+        pointer = self.root / CURRENT_POINTER
+        if not pointer.exists():
+            return None
+
+        path = self.root / pointer.read_text(encoding="utf-8").strip()
+        try:
+            snapshot = IndexSnapshot(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable index snapshot at {path}: {e}")
+            return None
+
+        if (
+            snapshot.manifest.format_version != SNAPSHOT_FORMAT_VERSION
+            or snapshot.manifest.source_digest != source_digest
+        ):
+            logger.info(f"Index snapshot at {path} is stale, it will be rebuilt")
+            return None
+
+        return snapshot
+
+    def write(self, documents: List[Document], source_digest: str) -> IndexSnapshot:
+        """Export embedded documents as a new snapshot and publish it atomically"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        name = f"v{SNAPSHOT_FORMAT_VERSION}-{source_digest[:16]}"
+        final_path = self.root / name
+        tmp_path = self.root / f".tmp-{name}-{uuid.uuid4().hex}"
+
+        try:
+            tmp_path.mkdir()
+            self._write_arrays(tmp_path, documents, source_digest)
+            try:
+                os.rename(tmp_path, final_path)
+            except OSError:
+                # Another worker already published an identical snapshot
+                if not (final_path / MANIFEST_FILE).exists():
+                    raise
+                shutil.rmtree(tmp_path, ignore_errors=True)
+            self._publish(name)
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+        logger.info(f"Exported index snapshot of {len(documents)} documents to {name}")
+        return IndexSnapshot(final_path)
+
+    @contextmanager
+    def build_lock(self):
+        """Serialize snapshot builds across worker processes"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @asynccontextmanager
+    async def async_build_lock(self):
+        """``build_lock`` waited for on a worker thread instead of the event loop"""
+        lock = self.build_lock()
+        await asyncio.to_thread(lock.__enter__)
+        try:
+            yield
+        finally:
+            lock.__exit__(None, None, None)
+
+    def _publish(self, name: str) -> None:
+        """Atomically point ``CURRENT`` at the snapshot directory ``name``"""
+        tmp_pointer = self.root / f".{CURRENT_POINTER}-{uuid.uuid4().hex}"
+        with open(tmp_pointer, "w", encoding="utf-8") as f:
+            f.write(name)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_pointer, self.root / CURRENT_POINTER)
+
+    @staticmethod
+    def _write_arrays(
+        path: Path, documents: List[Document], source_digest: str
+    ) -> None:
+        """Serialize dense, sparse and metadata arrays into ``path``"""
+        if not documents:
+            raise ValueError("Cannot export an empty index snapshot")
+        if any(
+            doc.embedding is None or doc.sparse_embedding is None for doc in documents
+        ):
+            raise ValueError(
+                "All documents must be embedded before exporting a snapshot"
+            )
+
+        embedding_dim = len(documents[0].embedding)
+        dense = np.asarray(
+            [doc.embedding for doc in documents], dtype=np.float32
+        ).reshape(len(documents), embedding_dim)
+
+        indptr = np.zeros(len(documents) + 1, dtype=np.int64)
+        for position, doc in enumerate(documents):
+            indptr[position + 1] = indptr[position] + len(doc.sparse_embedding.indices)
+        indices = np.fromiter(
+            (i for doc in documents for i in doc.sparse_embedding.indices),
+            dtype=np.int32,
+            count=int(indptr[-1]),
+        )
+        values = np.fromiter(
+            (v for doc in documents for v in doc.sparse_embedding.values),
+            dtype=np.float32,
+            count=int(indptr[-1]),
+        )
+
+        records = [
+            dumps({"id": doc.id, "content": doc.content, "meta": doc.meta})
+            for doc in documents
+        ]
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(record) for record in records])
+
+        np.save(path / DENSE_FILE, dense)
+        np.save(path / SPARSE_INDPTR_FILE, indptr)
+        np.save(path / SPARSE_INDICES_FILE, indices)
+        np.save(path / SPARSE_VALUES_FILE, values)
+        np.save(path / META_OFFSETS_FILE, offsets)
+        with open(path / META_BLOB_FILE, "wb") as f:
+            f.write(b"".join(records))
+
+        manifest = SnapshotManifest(
+            format_version=SNAPSHOT_FORMAT_VERSION,
+            source_digest=source_digest,
+            document_count=len(documents),
+            embedding_dim=embedding_dim,
+            sparse_nnz=int(indptr[-1]),
+        )
+        (path / MANIFEST_FILE).write_text(
+            manifest.model_dump_json(indent=2), encoding="utf-8"
+        )
+
+        # Flush everything to disk before the directory is renamed into place
+        for file in path.iterdir():
+            with open(file, "rb") as f:
+                os.fsync(f.fileno())
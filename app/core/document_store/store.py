@@ -0,0 +1,429 @@
+import inspect
+import threading
+from itertools import islice
+from time import perf_counter
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+import qdrant_client
+from qdrant_client.http import models as rest
+from haystack import default_to_dict
+from haystack.dataclasses import Document, SparseEmbedding
+from haystack.document_stores.types import DuplicatePolicy
+from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
+from haystack_integrations.document_stores.qdrant.converters import (
+    DENSE_VECTORS_NAME,
+    SPARSE_VECTORS_NAME,
+    convert_haystack_documents_to_qdrant_points,
+    convert_id,
+    convert_qdrant_point_to_haystack_document,
+)
+from haystack_integrations.document_stores.qdrant.document_store import (
+    QdrantStoreError,
+)
+from haystack_integrations.document_stores.qdrant.filters import (
+    convert_filters_to_qdrant,
+)
+from app.core.monitoring.metrics import metrics
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+QDRANT_CONNECTIONS_OPENED = metrics.counter(
+    "qdrant_connections_opened", "Qdrant clients opened by the shared pool"
+)
+QDRANT_OPEN_CONNECTIONS = metrics.gauge(
+    "qdrant_open_connections", "Qdrant clients currently held by the shared pool"
+)
+QDRANT_CONNECT_SECONDS = metrics.histogram(
+    "qdrant_connect_seconds",
+    "Time to open a Qdrant client and set up its collection",
+)
+
+
+def documents_to_points(
+    documents: List[Document], use_sparse_embeddings: bool
+) -> List[rest.PointStruct]:
+    """Qdrant points of documents, with the payload Haystack would write
+
+    Haystack deep-copies each document with ``to_dict`` and validates every
+    point, embeddings included. These points are built without either, as
+    their contents are validated before they are indexed. Documents with a blob
+    or dataframe take Haystack's conversion.
+    """
+    points = []
+    for document in documents:
+        if document.blob is not None or document.dataframe is not None:
+            points.extend(
+                convert_haystack_documents_to_qdrant_points(
+                    [document], use_sparse_embeddings=use_sparse_embeddings
+                )
+            )
+            continue
+        payload = {
+            "id": document.id,
+            "content": document.content,
+            "dataframe": None,
+            "blob": None,
+            "meta": document.meta,
+            "score": document.score,
+        }
+        if use_sparse_embeddings:
+            vector = {}
+            if document.embedding is not None:
+                vector[DENSE_VECTORS_NAME] = document.embedding
+            if document.sparse_embedding is not None:
+                vector[SPARSE_VECTORS_NAME] = rest.SparseVector.model_construct(
+                    indices=document.sparse_embedding.indices,
+                    values=document.sparse_embedding.values,
+                )
+        else:
+            # Haystack keeps the sparse embedding in the payload then
+            sparse = document.sparse_embedding
+            payload["sparse_embedding"] = sparse.to_dict() if sparse else None
+            vector = document.embedding or {}
+        points.append(
+            rest.PointStruct.model_construct(
+                id=convert_id(document.id), vector=vector, payload=payload
+            )
+        )
+    return points
+
+
+class QdrantClientPool:
+    """Process-wide pool of Qdrant clients shared by document stores.
+
+    A single client keeps one HTTP connection pool (or gRPC channel) per
+    connection target instead of opening a new one for every pipeline.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Hashable, qdrant_client.QdrantClient] = {}
+        self._lock = threading.RLock()
+
+    def get(
+        self, key: Hashable, create: Callable[[], qdrant_client.QdrantClient]
+    ) -> qdrant_client.QdrantClient:
+        """Return the pooled client for ``key``, creating it on first use"""
+        with self._lock:
+            if key not in self._clients:
+                logger.info("Opening shared Qdrant client connection")
+                start = perf_counter()
+                self._clients[key] = create()
+                QDRANT_CONNECT_SECONDS.observe(perf_counter() - start)
+                QDRANT_CONNECTIONS_OPENED.inc()
+                QDRANT_OPEN_CONNECTIONS.set(len(self._clients))
+            return self._clients[key]
+
+    def close_all(self) -> None:
+        """Close and forget every pooled client"""
+        with self._lock:
+            for client in self._clients.values():
+                try:
+                    client.close()
+                except Exception as e:
+                    logger.error(f"Error closing Qdrant client: {str(e)}")
+            self._clients.clear()
+            QDRANT_OPEN_CONNECTIONS.set(0)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+qdrant_client_pool = QdrantClientPool()
+
+
+class PooledQdrantDocumentStore(QdrantDocumentStore):
+    """QdrantDocumentStore that takes its client from the shared pool.
+
+    It also applies ``search_params`` (HNSW ``ef``, quantization rescoring) to the
+    dense and sparse prefetches of hybrid queries.
+    """
+
+    def __init__(
+        self,
+        *args,
+        search_params: Optional[Union[rest.SearchParams, Dict[str, Any]]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        if isinstance(search_params, dict):
+            search_params = rest.SearchParams(**search_params)
+        self.search_params = search_params
+
+    def to_dict(self) -> Dict[str, Any]:
+        params = inspect.signature(QdrantDocumentStore.__init__).parameters
+        init_params = {k: getattr(self, k) for k in params if k != "self"}
+        init_params["api_key"] = self.api_key.to_dict() if self.api_key else None
+        init_params["search_params"] = (
+            self.search_params.model_dump(exclude_none=True)
+            if self.search_params
+            else None
+        )
+        return default_to_dict(self, **init_params)
+
+    @property
+    def client(self) -> qdrant_client.QdrantClient:
+        if not self._client:
+            # The first store for a target creates the client and sets up the
+            # collection, later stores reuse it as-is
+            self._client = qdrant_client_pool.get(
+                self._pool_key(), lambda: QdrantDocumentStore.client.fget(self)
+            )
+        return self._client
+
+    def _pool_key(self) -> Tuple:
+        return (
+            self.location,
+            self.url,
+            self.host,
+            self.port,
+            self.grpc_port,
+            self.prefer_grpc,
+            self.https,
+            self.prefix,
+            self.path,
+            self.index,
+        )
+
+    def get_documents_by_id(
+        self, ids: List[str], return_embedding: bool = True
+    ) -> List[Document]:
+        """Documents with the given ids, without fetching vectors unless asked to"""
+        records = self.client.retrieve(
+            collection_name=self.index,
+            ids=[convert_id(_id) for _id in ids],
+            with_payload=True,
+            with_vectors=return_embedding,
+        )
+        return [
+            convert_qdrant_point_to_haystack_document(
+                record, use_sparse_embeddings=self.use_sparse_embeddings
+            )
+            for record in records
+        ]
+
+    def write_documents(
+        self,
+        documents: List[Document],
+        policy: DuplicatePolicy = DuplicatePolicy.FAIL,
+    ) -> int:
+        """Write documents like QdrantDocumentStore, building points without copies"""
+        for doc in documents:
+            if not isinstance(doc, Document):
+                raise ValueError(
+                    "DocumentStore.write_documents() expects a list of Documents "
+                    f"but got an element of {type(doc)}."
+                )
+        self._set_up_collection(
+            self.index,
+            self.embedding_dim,
+            False,
+            self.similarity,
+            self.use_sparse_embeddings,
+            self.sparse_idf,
+        )
+        if not documents:
+            logger.warning("Calling write_documents() with an empty list")
+            return 0
+
+        documents = self._handle_duplicate_documents(documents=documents, policy=policy)
+        it = iter(documents)
+        while batch := list(islice(it, self.write_batch_size)):
+            self.client.upsert(
+                collection_name=self.index,
+                points=documents_to_points(batch, self.use_sparse_embeddings),
+                wait=self.wait_result_from_api,
+            )
+        return len(documents)
+
+    def rekey_documents(self, key: Callable[[str], str]) -> int:
+        """Move documents to the id ``key`` derives from their content.
+
+        Documents written under another id scheme are rewritten under the new id
+        with their vectors, so nothing is re-embedded, unless a document already
+        has it. Their old ids are removed either way.
+
+        Returns:
+            Number of documents moved off their old id
+        """
+        stale = []
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=self.index,
+                with_payload=["id", "content"],
+                with_vectors=False,
+                limit=self.write_batch_size,
+                offset=offset,
+            )
+            stale.extend(
+                record.payload["id"]
+                for record in records
+                if record.payload.get("content")
+                and record.payload.get("id") != key(record.payload["content"])
+            )
+            if offset is None:
+                break
+        if not stale:
+            return 0
+
+        moved = {}
+        for document in self.get_documents_by_id(stale, return_embedding=True):
+            new_id = key(document.content)
+            moved[new_id] = Document(
+                id=new_id,
+                content=document.content,
+                meta=document.meta,
+                embedding=document.embedding,
+                sparse_embedding=document.sparse_embedding,
+            )
+        self.write_documents(list(moved.values()), policy=DuplicatePolicy.SKIP)
+        self.delete_documents(stale)
+        return len(stale)
+
+    def update_meta(self, document_id: str, meta: Dict[str, Any]) -> None:
+        """Replace the meta of a document in place, leaving its vectors untouched"""
+        self.client.set_payload(
+            collection_name=self.index,
+            payload={"meta": meta},
+            points=[convert_id(document_id)],
+            wait=self.wait_result_from_api,
+        )
+
+    def query_hybrid_batch(
+        self,
+        queries: List[Tuple[List[float], SparseEmbedding]],
+        top_k: int = 10,
+        return_embedding: bool = False,
+        score_threshold: Optional[float] = None,
+        search_params: Optional[rest.SearchParams] = None,
+    ) -> List[List[Document]]:
+        """Run several hybrid (dense + sparse, RRF fused) searches in one request.
+
+        Args:
+            queries: Pairs of dense and sparse query embeddings
+            top_k: Maximum number of documents to return per query
+            return_embedding: Whether to return the vectors of retrieved points
+            score_threshold: Minimal fused score of the returned points
+            search_params: Overrides the store's search params for this call
+
+        Returns:
+            One list of documents per query, in the order of ``queries``
+        """
+        if not self.use_sparse_embeddings:
+            raise QdrantStoreError(
+                "Hybrid search requires the document store to be initialized "
+                "with `use_sparse_embeddings=True`."
+            )
+        if not queries:
+            return []
+
+        requests = [
+            rest.QueryRequest(
+                prefetch=self._hybrid_prefetch(
+                    dense_embedding, sparse_embedding, None, search_params
+                ),
+                query=rest.FusionQuery(fusion=rest.Fusion.RRF),
+                limit=top_k,
+                score_threshold=score_threshold,
+                with_payload=True,
+                with_vector=return_embedding,
+            )
+            for dense_embedding, sparse_embedding in queries
+        ]
+
+        try:
+            responses = self.client.query_batch_points(
+                collection_name=self.index, requests=requests
+            )
+        except Exception as e:
+            raise QdrantStoreError("Error during batch hybrid search") from e
+
+        return [
+            [
+                convert_qdrant_point_to_haystack_document(
+                    point, use_sparse_embeddings=True
+                )
+                for point in response.points
+            ]
+            for response in responses
+        ]
+
+    def _query_hybrid(
+        self,
+        query_embedding: List[float],
+        query_sparse_embedding: SparseEmbedding,
+        filters: Optional[Union[Dict[str, Any], rest.Filter]] = None,
+        top_k: int = 10,
+        return_embedding: bool = False,
+        score_threshold: Optional[float] = None,
+        group_by: Optional[str] = None,
+        group_size: Optional[int] = None,
+    ) -> List[Document]:
+        """Hybrid search used by QdrantHybridRetriever, with search params applied"""
+        if group_by or self.search_params is None:
+            return super()._query_hybrid(
+                query_embedding=query_embedding,
+                query_sparse_embedding=query_sparse_embedding,
+                filters=filters,
+                top_k=top_k,
+                return_embedding=return_embedding,
+                score_threshold=score_threshold,
+                group_by=group_by,
+                group_size=group_size,
+            )
+
+        if not self.use_sparse_embeddings:
+            raise QdrantStoreError(
+                "Hybrid search requires the document store to be initialized "
+                "with `use_sparse_embeddings=True`."
+            )
+
+        try:
+            points = self.client.query_points(
+                collection_name=self.index,
+                prefetch=self._hybrid_prefetch(
+                    query_embedding,
+                    query_sparse_embedding,
+                    convert_filters_to_qdrant(filters),
+                ),
+                query=rest.FusionQuery(fusion=rest.Fusion.RRF),
+                limit=top_k,
+                score_threshold=score_threshold,
+                with_payload=True,
+                with_vectors=return_embedding,
+            ).points
+        except Exception as e:
+            raise QdrantStoreError("Error during hybrid search") from e
+
+        return [
+            convert_qdrant_point_to_haystack_document(point, use_sparse_embeddings=True)
+            for point in points
+        ]
+
+    def _hybrid_prefetch(
+        self,
+        dense_embedding: List[float],
+        sparse_embedding: SparseEmbedding,
+        qdrant_filters: Optional[rest.Filter] = None,
+        search_params: Optional[rest.SearchParams] = None,
+    ) -> List[rest.Prefetch]:
+        """Sparse and dense prefetches that are fused with RRF"""
+        params = search_params or self.search_params
+        return [
+            rest.Prefetch(
+                query=rest.SparseVector(
+                    indices=sparse_embedding.indices, values=sparse_embedding.values
+                ),
+                using=SPARSE_VECTORS_NAME,
+                filter=qdrant_filters,
+                params=params,
+            ),
+            rest.Prefetch(
+                query=dense_embedding,
+                using=DENSE_VECTORS_NAME,
+                filter=qdrant_filters,
+                params=params,
+            ),
+        ]
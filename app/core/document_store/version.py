@@ -0,0 +1,46 @@
+import os
+import fcntl
+import uuid
+from pathlib import Path
+
+from app.config.settings import settings
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class IndexVersion:
+    """Monotonically increasing version of the indexed documents.
+
+    Every write to the index bumps it, so results derived from the index can be
+    cached under the version they were computed at. The version lives in a file,
+    letting every worker process see a bump made by any of them.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def current(self) -> int:
+        try:
+            return int(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def bump(self) -> int:
+        """Advance the version after the index changed, returning the new one"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(f".{self.path.name}.lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                version = self.current() + 1
+                tmp_path = self.path.with_name(f".{self.path.name}-{uuid.uuid4().hex}")
+                tmp_path.write_text(str(version), encoding="utf-8")
+                os.replace(tmp_path, self.path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        logger.info(f"Index version is now {version}")
+        return version
+
+
+index_version = IndexVersion(Path(settings.SNAPSHOT_DIR) / "index_version")
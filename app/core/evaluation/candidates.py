@@ -0,0 +1,32 @@
+from typing import List
+
+from haystack.dataclasses import Document
+from app.core.pipeline.factory import PipelineFactory
+from app.schemas.medication import MedicationEntity
+
+
+async def retrieve_candidates(
+    eval_data: List[MedicationEntity],
+    pipeline_factory: PipelineFactory,
+) -> List[List[Document]]:
+    """Retrieve the reranker candidates of every evaluation query"""
+    retrieval = await pipeline_factory.create_retrieval_pipeline()
+    candidates = []
+    for item in eval_data:
+        result = retrieval.run(
+            {
+                "sparse_embedder": {"text": item.original_text},
+                "dense_embedder": {"text": item.original_text},
+            }
+        )
+        candidates.append(result["retriever"]["documents"])
+    return candidates
+
+
+def shares_drug_name(expected: MedicationEntity, documents: List[Document]) -> bool:
+    """Whether any example shares a drug name with the expected entities"""
+    expected_drugs = {drug.lower() for drug in expected.drug_name}
+    return any(
+        expected_drugs & {drug.lower() for drug in doc.meta.get("drug_name", [])}
+        for doc in documents
+    )
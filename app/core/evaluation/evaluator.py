@@ -1,10 +1,22 @@
 import json
+import asyncio
+from pathlib import Path
 from time import perf_counter
 from pydantic import BaseModel
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+from haystack import Pipeline
+from app.config.settings import settings
 from app.core.pipeline.factory import PipelineFactory
+from app.core.pipeline.tracing import collect_stage_timings
+from app.core.evaluation.report import (
+    FieldMetrics,
+    StageLatency,
+    TokenUsage,
+    compute_field_metrics,
+    compute_stage_latency,
+    compute_token_usage,
+)
 from app.schemas.medication import MedicationEntity
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 from app.config.logging import get_logger
 
 
@@ -12,15 +24,41 @@ logger = get_logger(__name__)
 
 
 class EvaluationOutput(BaseModel):
-    accuracy: float
-    precision: float
-    recall: float
-    f1_score: float
+    """Exact-match accuracy plus entity-level (micro) precision, recall and F1"""
+
+    accuracy: Optional[float]
+    precision: Optional[float]
+    recall: Optional[float]
+    f1_score: Optional[float]
+    items: int = 0
+    failures: int = 0
+    elapsed_seconds: float = 0.0
+    fields: Dict[str, FieldMetrics] = {}
+    latency: Dict[str, StageLatency] = {}
+    tokens: TokenUsage = TokenUsage()
+    config: Dict[str, Any] = {}
 
 
 class Evaluator:
-    def __init__(self):
-        self._factory = PipelineFactory()
+    """Runs the query pipeline over a test dataset and scores the extractions.
+
+    Up to ``workers`` items run concurrently, each on a warm pipeline of its own,
+    as runs of one pipeline share its per-component visit counts. LLM outputs
+    are cached in ``llm_cache_path`` and per-item records are appended to
+    ``results_path`` so an interrupted run can be resumed.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        llm_cache_path: Optional[Path] = None,
+        results_path: Optional[Path] = None,
+        pipeline_factory: Optional[PipelineFactory] = None,
+    ):
+        self._factory = pipeline_factory or PipelineFactory()
+        self._workers = max(1, workers)
+        self._llm_cache_path = llm_cache_path
+        self._results_path = results_path
 
     def _format_llm_response(self, response: Dict[str, Any]) -> Tuple[str, List[str]]:
         """Format the LLM response into usable format for evaluation."""
@@ -28,38 +66,37 @@ class Evaluator:
             answer = json.loads(response["llm"]["replies"][0])
             _contexts = [doc.meta for doc in response["reranker"]["documents"]]
             contexts = [
-                f"Query: {ctx["original_text"]}\nAnswer: {ctx}" for ctx in _contexts
+                f"Query: {ctx['original_text']}\nAnswer: {ctx}" for ctx in _contexts
             ]
             return answer, contexts
         except Exception as e:
             logger.error(f"Error formatting LLM response: {e}")
             raise
 
-    def _compute_metrics(self, dataset: Dict[str, float]) -> EvaluationOutput:
-        """Compute standard ML evaluation metrics for the test dataset."""
+    def _compute_metrics(self, dataset: Dict[str, List]) -> EvaluationOutput:
+        """Compute exact-match accuracy and per-field entity metrics."""
         try:
             generated_answer = dataset["answer"]
             ground_truth = dataset["ground_truth"]
 
-            # Compare JSON objects and output True/False
-            boolean_comparisons = [
+            # Whole-object equality, kept as the strictest accuracy measure
+            exact_matches = [
                 gen == gt for gen, gt in zip(generated_answer, ground_truth)
             ]
+            accuracy = sum(exact_matches) / len(exact_matches) if exact_matches else 0.0
 
-            # Convert boolean comparisons to binary labels (True -> 1, False -> 0)
-            y_pred = [int(b) for b in boolean_comparisons]
-            y_true = [1] * len(
-                generated_answer
-            )  # Since ground truth is considered "correct", it is all 1s
-
-            # Compute metrics
-            accuracy = accuracy_score(y_true, y_pred)
-            precision = precision_score(y_true, y_pred, zero_division=0)
-            recall = recall_score(y_true, y_pred, zero_division=0)
-            f1 = f1_score(y_true, y_pred, zero_division=0)
-
+            fields = compute_field_metrics(generated_answer, ground_truth)
             return EvaluationOutput(
-                accuracy=accuracy, precision=precision, recall=recall, f1_score=f1
+                accuracy=accuracy,
+                precision=fields["micro"].precision,
+                recall=fields["micro"].recall,
+                f1_score=fields["micro"].f1_score,
+                items=len(generated_answer),
+                failures=sum(answer is None for answer in generated_answer),
+                fields=fields,
+                latency=compute_stage_latency(dataset.get("timings", [])),
+                tokens=compute_token_usage(dataset.get("tokens", [])),
+                config=self._config_snapshot(),
             )
         except Exception as e:
             logger.error(f"Error during evaluation: {e}")
@@ -67,15 +104,39 @@ class Evaluator:
                 accuracy=None, precision=None, recall=None, f1_score=None
             )
 
-    async def run(self, test_data: List[MedicationEntity]) -> EvaluationOutput:
-        """Run the evaluation on the provided test dataset."""
-        eval_dataset = {"question": [], "answer": [], "context": [], "ground_truth": []}
+    @staticmethod
+    def _config_snapshot() -> Dict[str, Any]:
+        """Settings that trade speed against quality, recorded with the report"""
+        return {
+            "EMBEDDING_MODEL_DENSE": settings.EMBEDDING_MODEL_DENSE,
+            "EMBEDDING_MODEL_SPARSE": settings.EMBEDDING_MODEL_SPARSE,
+            "RETRIEVER_TOP_K": settings.RETRIEVER_TOP_K,
+            "RERANKER_MODEL": settings.RERANKER_MODEL,
+            "RERANKER_BACKEND": settings.RERANKER_BACKEND,
+            "RERANKER_TOP_K": settings.RERANKER_TOP_K,
+            "RERANKER_SKIP_MARGIN": settings.RERANKER_SKIP_MARGIN,
+            "OLLAMA_MODEL": settings.OLLAMA_MODEL,
+            "OLLAMA_MAX_TOKENS": settings.OLLAMA_MAX_TOKENS,
+            "QDRANT_COLLECTION_PROFILE": settings.QDRANT_COLLECTION_PROFILE,
+        }
+
+    def _evaluate_item(
+        self, pipeline: Pipeline, index: int, item: MedicationEntity
+    ) -> Dict[str, Any]:
+        """Run one test item through the pipeline and build its result record"""
+        query = item.original_text
+        record = {
+            "index": index,
+            "question": query,
+            "answer": None,
+            "context": [],
+            "ground_truth": item.model_dump(),
+            "timings": {},
+            "tokens": {},
+        }
         try:
-            start = perf_counter()
-            for _input in test_data:
-                query = _input.original_text
-                query_pipeline = await self._factory.create_query_pipeline()
-                llm_response = query_pipeline.run(
+            with collect_stage_timings() as timings:
+                llm_response = pipeline.run(
                     data={
                         "sparse_embedder": {"text": query},
                         "dense_embedder": {"text": query},
@@ -84,18 +145,142 @@ class Evaluator:
                     },
                     include_outputs_from={"reranker"},
                 )
-                answers, contexts = self._format_llm_response(llm_response)
-                eval_dataset["question"].append(query)
-                eval_dataset["answer"].append(answers)
-                eval_dataset["context"].extend(contexts)
-                eval_dataset["ground_truth"].append(_input.model_dump())
+            record["timings"] = timings
+            record["tokens"] = self._token_counts(llm_response)
+            record["answer"], record["context"] = self._format_llm_response(
+                llm_response
+            )
+        except Exception as e:
+            # A failed item counts as a wrong answer instead of aborting the run
+            logger.error(f"Error evaluating item {index}: {e}")
+            record["error"] = str(e)
+        return record
+
+    @staticmethod
+    def _token_counts(response: Dict[str, Any]) -> Dict[str, int]:
+        """Prompt and completion token counts reported by Ollama"""
+        meta = (response.get("llm", {}).get("meta") or [{}])[0]
+        return {
+            "in": int(meta.get("prompt_eval_count") or 0),
+            "out": int(meta.get("eval_count") or 0),
+        }
+
+    def _load_records(self, test_data: List[MedicationEntity]) -> Dict[int, Dict]:
+        """Load records of a previous run that still match the test data"""
+        records = {}
+        if not self._results_path or not self._results_path.exists():
+            return records
+
+        with open(self._results_path, mode="r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                index = record.get("index")
+                if (
+                    isinstance(index, int)
+                    and index < len(test_data)
+                    and record.get("question") == test_data[index].original_text
+                    and "error" not in record
+                ):
+                    records[index] = record
+        return records
+
+    async def run(
+        self, test_data: List[MedicationEntity], resume: bool = False
+    ) -> EvaluationOutput:
+        """Run the evaluation on the provided test dataset."""
+        try:
+            start = perf_counter()
+            records = self._load_records(test_data) if resume else {}
+            pending = [
+                (index, item)
+                for index, item in enumerate(test_data)
+                if index not in records
+            ]
+            if records:
+                logger.info(f"Resuming evaluation, {len(records)} items already done")
+
+            if pending:
+                await self._run_pending(pending, records, append=resume)
+
+            eval_dataset = {
+                "question": [],
+                "answer": [],
+                "context": [],
+                "ground_truth": [],
+                "timings": [],
+                "tokens": [],
+            }
+            for index in range(len(test_data)):
+                record = records[index]
+                eval_dataset["question"].append(record["question"])
+                eval_dataset["answer"].append(record["answer"])
+                eval_dataset["context"].extend(record["context"])
+                eval_dataset["ground_truth"].append(record["ground_truth"])
+                eval_dataset["timings"].append(record.get("timings", {}))
+                eval_dataset["tokens"].append(record.get("tokens", {}))
+
             elapsed = perf_counter() - start
             logger.info("Evaluation completed successfully.")
             logger.info(
-                f"Evaluation took {elapsed:.2f} seconds for processing {len(test_data)} medication text."
+                f"Evaluation took {elapsed:.2f} seconds for processing "
+                f"{len(pending)} of {len(test_data)} medication texts "
+                f"with {self._workers} workers."
             )
 
-            return self._compute_metrics(eval_dataset)
+            output = self._compute_metrics(eval_dataset)
+            output.elapsed_seconds = elapsed
+            return output
         except Exception as e:
             logger.error(f"Error during evaluation: {e}")
             raise
+
+    async def _run_pending(
+        self,
+        pending: List[Tuple[int, MedicationEntity]],
+        records: Dict[int, Dict],
+        append: bool,
+    ) -> None:
+        """Evaluate pending items concurrently, one warm query pipeline per worker"""
+        llm_cache_path = str(self._llm_cache_path) if self._llm_cache_path else None
+        pipelines = await asyncio.gather(
+            *(
+                self._factory.create_query_pipeline(llm_cache_path=llm_cache_path)
+                for _ in range(min(self._workers, len(pending)))
+            )
+        )
+        # Load models up front instead of racing to load them per item, the
+        # model registry shares the weights between the pipelines
+        for pipeline in pipelines:
+            await asyncio.to_thread(pipeline.warm_up)
+        idle: asyncio.Queue = asyncio.Queue()
+        for pipeline in pipelines:
+            idle.put_nowait(pipeline)
+
+        results_file = None
+        if self._results_path:
+            self._results_path.parent.mkdir(parents=True, exist_ok=True)
+            results_file = open(
+                self._results_path, mode="a" if append else "w", encoding="utf-8"
+            )
+
+        async def evaluate(index: int, item: MedicationEntity) -> None:
+            pipeline = await idle.get()
+            try:
+                record = await asyncio.to_thread(
+                    self._evaluate_item, pipeline, index, item
+                )
+            finally:
+                idle.put_nowait(pipeline)
+            records[index] = record
+            if results_file:
+                results_file.write(json.dumps(record) + "\n")
+                results_file.flush()
+
+        try:
+            await asyncio.gather(*(evaluate(index, item) for index, item in pending))
+        finally:
+            if results_file:
+                results_file.close()
@@ -0,0 +1,209 @@
+import html
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+
+ENTITY_FIELDS = ["drug_name", "dosage", "quantity", "administration_type", "brand"]
+STAGES = ["embed", "retrieve", "rerank", "prompt", "generate"]
+
+
+class FieldMetrics(BaseModel):
+    precision: float
+    recall: float
+    f1_score: float
+    true_positives: int
+    false_positives: int
+    false_negatives: int
+
+
+class StageLatency(BaseModel):
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+class TokenUsage(BaseModel):
+    tokens_in: int = 0
+    tokens_out: int = 0
+    mean_tokens_in: float = 0.0
+    mean_tokens_out: float = 0.0
+
+
+def _normalize(value: Any) -> str:
+    return " ".join(str(value).lower().split())
+
+
+def _scores(tp: int, fp: int, fn: int) -> FieldMetrics:
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return FieldMetrics(
+        precision=precision,
+        recall=recall,
+        f1_score=f1,
+        true_positives=tp,
+        false_positives=fp,
+        false_negatives=fn,
+    )
+
+
+def compute_field_metrics(
+    answers: List[Optional[Dict[str, Any]]], ground_truths: List[Dict[str, Any]]
+) -> Dict[str, FieldMetrics]:
+    """Per-field precision, recall and F1 over extracted entity values.
+
+    Values are compared case and whitespace insensitively as multisets, so a
+    missing answer counts every expected value as a false negative. The
+    ``micro`` entry pools the counts of all fields.
+    """
+    counts = {field: [0, 0, 0] for field in ENTITY_FIELDS}
+    for answer, truth in zip(answers, ground_truths):
+        answer = answer if isinstance(answer, dict) else {}
+        for field in ENTITY_FIELDS:
+            predicted = answer.get(field) or []
+            if not isinstance(predicted, list):
+                predicted = [predicted]
+            predicted = Counter(_normalize(value) for value in predicted)
+            expected = Counter(_normalize(value) for value in truth.get(field) or [])
+            matched = sum((predicted & expected).values())
+            counts[field][0] += matched
+            counts[field][1] += sum(predicted.values()) - matched
+            counts[field][2] += sum(expected.values()) - matched
+
+    metrics = {field: _scores(*counts[field]) for field in ENTITY_FIELDS}
+    metrics["micro"] = _scores(*(sum(c[i] for c in counts.values()) for i in range(3)))
+    return metrics
+
+
+def compute_stage_latency(
+    timings: List[Dict[str, float]],
+) -> Dict[str, StageLatency]:
+    """Latency percentiles of each pipeline stage and of the whole run"""
+    latency = {}
+    for stage in STAGES + ["total"]:
+        if stage == "total":
+            values = [sum(t.values()) for t in timings if t]
+        else:
+            values = [t[stage] for t in timings if stage in t]
+        if not values:
+            continue
+        ms = np.asarray(values) * 1000
+        latency[stage] = StageLatency(
+            count=len(values),
+            mean_ms=float(ms.mean()),
+            p50_ms=float(np.percentile(ms, 50)),
+            p95_ms=float(np.percentile(ms, 95)),
+            p99_ms=float(np.percentile(ms, 99)),
+        )
+    return latency
+
+
+def compute_token_usage(tokens: List[Dict[str, int]]) -> TokenUsage:
+    """Total and mean prompt (in) and completion (out) tokens"""
+    tokens = [t for t in tokens if t]
+    if not tokens:
+        return TokenUsage()
+    tokens_in = sum(t.get("in", 0) for t in tokens)
+    tokens_out = sum(t.get("out", 0) for t in tokens)
+    return TokenUsage(
+        tokens_in=tokens_in,
+        tokens_out=tokens_out,
+        mean_tokens_in=tokens_in / len(tokens),
+        mean_tokens_out=tokens_out / len(tokens),
+    )
+
+
+def render_html(report: Dict[str, Any]) -> str:
+    """Render an evaluation report as a standalone HTML page"""
+
+    def table(headers: List[str], rows: List[List[Any]]) -> str:
+        head = "".join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+        body = "".join(
+            "<tr>"
+            + "".join(
+                f"<td>{value:.3f}</td>"
+                if isinstance(value, float)
+                else f"<td>{html.escape(str(value))}</td>"
+                for value in row
+            )
+            + "</tr>"
+            for row in rows
+        )
+        return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+    summary = table(
+        ["Items", "Failures", "Exact match", "Precision", "Recall", "F1", "Elapsed s"],
+        [
+            [
+                report["items"],
+                report["failures"],
+                report["accuracy"],
+                report["precision"],
+                report["recall"],
+                report["f1_score"],
+                report["elapsed_seconds"],
+            ]
+        ],
+    )
+    fields = table(
+        ["Field", "Precision", "Recall", "F1", "TP", "FP", "FN"],
+        [
+            [
+                name,
+                m["precision"],
+                m["recall"],
+                m["f1_score"],
+                m["true_positives"],
+                m["false_positives"],
+                m["false_negatives"],
+            ]
+            for name, m in report["fields"].items()
+        ],
+    )
+    latency = table(
+        ["Stage", "Count", "Mean ms", "p50 ms", "p95 ms", "p99 ms"],
+        [
+            [name, m["count"], m["mean_ms"], m["p50_ms"], m["p95_ms"], m["p99_ms"]]
+            for name, m in report["latency"].items()
+        ],
+    )
+    tokens = table(
+        ["Tokens in", "Tokens out", "Mean in", "Mean out"],
+        [
+            [
+                report["tokens"]["tokens_in"],
+                report["tokens"]["tokens_out"],
+                report["tokens"]["mean_tokens_in"],
+                report["tokens"]["mean_tokens_out"],
+            ]
+        ],
+    )
+    config = table(["Setting", "Value"], [[k, v] for k, v in report["config"].items()])
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        "<title>Medication NER evaluation</title><style>"
+        "body{font-family:sans-serif;margin:2em}"
+        "table{border-collapse:collapse;margin-bottom:1.5em}"
+        "th,td{border:1px solid #ccc;padding:4px 10px;text-align:right}"
+        "th:first-child,td:first-child{text-align:left}"
+        "</style></head><body><h1>Medication NER evaluation</h1>"
+        f"<h2>Summary</h2>{summary}<h2>Entity fields</h2>{fields}"
+        f"<h2>Stage latency</h2>{latency}<h2>Tokens</h2>{tokens}"
+        f"<h2>Configuration</h2>{config}</body></html>"
+    )
+
+
+def write_report(report: Dict[str, Any], path: Path) -> None:
+    """Write the report as HTML for ``.html`` paths and as JSON otherwise"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() in (".html", ".htm"):
+        path.write_text(render_html(report), encoding="utf-8")
+    else:
+        path.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
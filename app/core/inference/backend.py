@@ -0,0 +1,113 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config.settings import settings
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class InferenceBackend:
+    """Model operations served by the inference server, on whole batches"""
+
+    def dense(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+    def sparse(self, texts: List[str]) -> List[Dict[str, List]]:
+        raise NotImplementedError
+
+    def score(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Raw cross-encoder logits of (query, text) pairs"""
+        raise NotImplementedError
+
+
+class ModelBackend(InferenceBackend):
+    """Fastembed embedders and the configured cross-encoder, loaded once.
+
+    Args:
+        threads: Intra-op threads of each model, all cores when None
+    """
+
+    def __init__(self, threads: Optional[int] = None):
+        from fastembed import SparseTextEmbedding, TextEmbedding
+
+        self.threads = threads
+        self._dense = TextEmbedding(settings.EMBEDDING_MODEL_DENSE, threads=threads)
+        self._sparse = SparseTextEmbedding(
+            settings.EMBEDDING_MODEL_SPARSE, threads=threads
+        )
+        self._onnx_ranker = None
+        self._model = None
+        self._tokenizer = None
+        if settings.RERANKER_BACKEND == "onnx":
+            from app.core.components.onnx_ranker import OnnxCrossEncoderRanker
+
+            self._onnx_ranker = OnnxCrossEncoderRanker(
+                model=settings.RERANKER_MODEL,
+                batch_size=settings.RERANKER_BATCH_SIZE,
+                max_length=settings.RERANKER_MAX_LENGTH,
+                threads=threads,
+                quantize=settings.RERANKER_ONNX_QUANTIZE,
+                cache_dir=settings.RERANKER_ONNX_DIR,
+            )
+            self._onnx_ranker.warm_up()
+        else:
+            import torch
+            from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+            if threads:
+                torch.set_num_threads(threads)
+            self._tokenizer = AutoTokenizer.from_pretrained(settings.RERANKER_MODEL)
+            self._model = AutoModelForSequenceClassification.from_pretrained(
+                settings.RERANKER_MODEL
+            ).eval()
+        logger.info(f"Inference models loaded with {threads or 'all'} threads")
+
+    def dense(self, texts: List[str]) -> List[List[float]]:
+        return [
+            vector.tolist()
+            for vector in self._dense.embed(texts, batch_size=max(1, len(texts)))
+        ]
+
+    def sparse(self, texts: List[str]) -> List[Dict[str, List]]:
+        return [
+            {"indices": e.indices.tolist(), "values": e.values.tolist()}
+            for e in self._sparse.embed(texts, batch_size=max(1, len(texts)))
+        ]
+
+    def score(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        if self._onnx_ranker is not None:
+            return self._score_onnx(pairs)
+
+        import torch
+
+        scores = []
+        batch_size = settings.RERANKER_BATCH_SIZE
+        with torch.inference_mode():
+            for offset in range(0, len(pairs), batch_size):
+                batch = pairs[offset : offset + batch_size]
+                features = self._tokenizer(
+                    [query for query, _ in batch],
+                    [text for _, text in batch],
+                    padding=True,
+                    truncation="only_second",
+                    max_length=settings.RERANKER_MAX_LENGTH,
+                    return_tensors="pt",
+                )
+                scores.extend(self._model(**features).logits[:, 0].tolist())
+        return scores
+
+    def _score_onnx(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        # The ONNX ranker scores one query at a time against many texts
+        by_query: Dict[str, List[int]] = defaultdict(list)
+        for i, (query, _) in enumerate(pairs):
+            by_query[query].append(i)
+        scores = np.empty(len(pairs), dtype=np.float32)
+        for query, indices in by_query.items():
+            scores[indices] = self._onnx_ranker.score(
+                query, [pairs[i][1] for i in indices]
+            )
+        return scores.tolist()
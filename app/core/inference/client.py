@@ -0,0 +1,101 @@
+import socket
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+from app.core.inference.protocol import encode, recv_message
+
+
+class InferenceError(RuntimeError):
+    """Raised when the inference server fails a request"""
+
+
+class InferenceClient:
+    """Blocking client of the inference server, safe to share between threads.
+
+    Pipeline components run on executor threads, so each thread keeps its own
+    connection and its requests never wait on another thread's response.
+
+    Args:
+        path: Filesystem path of the server's Unix domain socket
+        timeout: Seconds to wait for a response
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._next_id = 0
+        self._id_lock = threading.Lock()
+
+    def _socket(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            self._local.sock = sock
+        return sock
+
+    def _disconnect(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            self._local.sock = None
+            sock.close()
+
+    def _request(self, op: str, items: Sequence[Any]) -> List[Any]:
+        if not items:
+            return []
+        with self._id_lock:
+            self._next_id += 1
+            request_id = self._next_id
+        message = encode({"id": request_id, "op": op, "items": list(items)})
+
+        for attempt in range(2):
+            try:
+                sock = self._socket()
+                sock.sendall(message)
+                response = recv_message(sock)
+                break
+            except ConnectionError:
+                # The server may have restarted since this connection was opened
+                self._disconnect()
+                if attempt:
+                    raise
+            except OSError:
+                # A timed out request may still be answered, on a connection that
+                # is then out of step, and is not sent again
+                self._disconnect()
+                raise
+
+        if response.get("id") != request_id:
+            self._disconnect()
+            raise InferenceError(f"Response {response.get('id')} for {request_id}")
+        if "error" in response:
+            raise InferenceError(response["error"])
+        return response["result"]
+
+    def dense(self, texts: Sequence[str]) -> List[List[float]]:
+        return self._request("dense", texts)
+
+    def sparse(self, texts: Sequence[str]) -> List[Dict[str, List]]:
+        return self._request("sparse", texts)
+
+    def score(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        return self._request("score", [list(pair) for pair in pairs])
+
+    def close(self) -> None:
+        self._disconnect()
+
+
+_clients: Dict[str, InferenceClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_inference_client(path: str, timeout: float = 30.0) -> InferenceClient:
+    """Client of the server at ``path``, shared by every component in the process"""
+    with _clients_lock:
+        client = _clients.get(path)
+        if client is None:
+            client = InferenceClient(path, timeout)
+            _clients[path] = client
+        return client
@@ -0,0 +1,44 @@
+import json
+import struct
+import asyncio
+import socket
+from typing import Any, Dict
+
+# Every message is a JSON object preceded by its length as a 4-byte big-endian int
+HEADER = struct.Struct(">I")
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+OPERATIONS = ("dense", "sparse", "score")
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+
+def _check_size(size: int) -> int:
+    if size > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Message of {size} bytes exceeds {MAX_MESSAGE_BYTES}")
+    return size
+
+
+async def read_message(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    """Read one framed message, raising ``asyncio.IncompleteReadError`` at EOF"""
+    (size,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return json.loads(await reader.readexactly(_check_size(size)))
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Inference server closed the connection")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def recv_message(sock: socket.socket) -> Dict[str, Any]:
+    """Blocking counterpart of ``read_message`` for client sockets"""
+    (size,) = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    return json.loads(_recv_exactly(sock, _check_size(size)))
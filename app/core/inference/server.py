@@ -0,0 +1,253 @@
+import os
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.config.settings import settings
+from app.config.logging import get_logger
+from app.core.inference.backend import InferenceBackend
+from app.core.inference.protocol import OPERATIONS, encode, read_message
+from app.core.monitoring.metrics import metrics
+
+
+logger = get_logger(__name__)
+
+INFERENCE_BATCH_SIZE = metrics.histogram(
+    "inference_batch_size",
+    "Items per batch run by the inference server",
+    ["operation"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+INFERENCE_SECONDS = metrics.histogram(
+    "inference_batch_seconds", "Model time per inference batch", ["operation"]
+)
+
+
+class MicroBatcher:
+    """Merges concurrent requests for one operation into model-sized batches.
+
+    A batch runs once it holds ``max_batch`` items or its first request has
+    waited ``max_wait`` seconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[List[Any]], List[Any]],
+        executor: ThreadPoolExecutor,
+        max_batch: int = 32,
+        max_wait: float = 0.002,
+    ):
+        self.name = name
+        self._fn = fn
+        self._executor = executor
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def submit(self, items: List[Any]) -> List[Any]:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((items, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[List[Any], asyncio.Future]]:
+        requests = [await self._queue.get()]
+        size = len(requests[0][0])
+        deadline = asyncio.get_running_loop().time() + self._max_wait
+        while size < self._max_batch:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                request = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            requests.append(request)
+            size += len(request[0])
+        return requests
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            requests = await self._collect()
+            items = [item for request_items, _ in requests for item in request_items]
+            start = perf_counter()
+            try:
+                results = await loop.run_in_executor(self._executor, self._fn, items)
+            except Exception as e:
+                logger.error(f"Inference {self.name} batch failed: {e}")
+                for _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            INFERENCE_BATCH_SIZE.observe(len(items), operation=self.name)
+            INFERENCE_SECONDS.observe(perf_counter() - start, operation=self.name)
+
+            offset = 0
+            for request_items, future in requests:
+                if not future.done():
+                    future.set_result(results[offset : offset + len(request_items)])
+                offset += len(request_items)
+
+
+class InferenceServer:
+    """Serves embeddings and rerank scores to the API workers over a Unix socket.
+
+    Models run on one executor thread, so their own intra-op threads are the
+    only compute threads and requests from every worker share the batches.
+
+    Args:
+        backend: Models answering the requests
+        path: Filesystem path of the Unix domain socket
+        max_batch: Items per model batch
+        max_wait: Seconds a request waits for others to join its batch
+    """
+
+    def __init__(
+        self,
+        backend: InferenceBackend,
+        path: str,
+        max_batch: int = 32,
+        max_wait: float = 0.002,
+    ):
+        self.path = path
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="inference-"
+        )
+        self._batchers = {
+            operation: MicroBatcher(
+                operation,
+                getattr(backend, operation),
+                self._executor,
+                max_batch=max_batch,
+                max_wait=max_wait,
+            )
+            for operation in OPERATIONS
+        }
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            # Left behind by a server that did not shut down cleanly
+            os.unlink(self.path)
+        for batcher in self._batchers.values():
+            batcher.start()
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        os.chmod(self.path, 0o660)
+        logger.info(f"Inference server listening on {self.path}")
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # Clients keep their connections open, so end them here
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        for batcher in self._batchers.values():
+            await batcher.stop()
+        self._executor.shutdown(wait=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _answer(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        batcher = self._batchers.get(request.get("op"))
+        if batcher is None:
+            return {"id": request.get("id"), "error": f"Unknown op {request.get('op')}"}
+        try:
+            result = await batcher.submit(request["items"])
+            return {"id": request.get("id"), "result": result}
+        except Exception as e:
+            return {"id": request.get("id"), "error": str(e)}
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        write_lock = asyncio.Lock()
+        pending: Set[asyncio.Task] = set()
+
+        async def respond(request: Dict[str, Any]) -> None:
+            response = await self._answer(request)
+            async with write_lock:
+                writer.write(encode(response))
+                await writer.drain()
+
+        try:
+            while True:
+                request = await read_message(reader)
+                if not isinstance(request, dict):
+                    raise ValueError("Message is not a JSON object")
+                # Requests on one connection may be pipelined
+                task = asyncio.create_task(respond(request))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError as e:
+            # The rest of the stream cannot be framed, so the connection ends
+            logger.warning(f"Closing inference connection on a malformed message: {e}")
+            async with write_lock:
+                writer.write(encode({"id": None, "error": f"Malformed message: {e}"}))
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    pass
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            writer.close()
+            self._connections.discard(connection)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Local inference server for embeddings and reranking"
+    )
+    parser.add_argument("--socket", default=settings.INFERENCE_SOCKET)
+    parser.add_argument("--threads", type=int, default=settings.INFERENCE_THREADS)
+    parser.add_argument("--max-batch", type=int, default=settings.INFERENCE_MAX_BATCH)
+    parser.add_argument(
+        "--max-wait-ms", type=float, default=settings.INFERENCE_MAX_WAIT_MS
+    )
+    args = parser.parse_args(argv)
+    if not args.socket:
+        parser.error("Set INFERENCE_SOCKET or pass --socket")
+
+    from app.core.inference.backend import ModelBackend
+
+    server = InferenceServer(
+        ModelBackend(threads=args.threads),
+        args.socket,
+        max_batch=args.max_batch,
+        max_wait=args.max_wait_ms / 1000,
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logger.info("Inference server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,23 @@
 import json
+import asyncio
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
 from typing import List
 
+from haystack import Pipeline
+from haystack.dataclasses import Document
+from app.config.settings import settings
 from app.core.pipeline.factory import PipelineFactory
+from app.core.pipeline.executors import executors, PIPELINE_INIT
+from app.core.document_store.snapshot import (
+    IndexSnapshot,
+    SnapshotStore,
+    compute_source_digest,
+)
+from app.core.document_store.version import index_version
 from app.schemas.medication import MedicationEntity
-from app.utils.common import create_index_documents
+from app.utils.common import create_index_documents, medication_id
 from app.config.logging import get_logger
 
 
@@ -18,24 +31,105 @@ class DataLoader:
         self.data_dir = Path(__file__).parent.parent.parent / "data"
         self.few_shot_path = self.data_dir / "few_shot_examples.json"
         self.eval_path = self.data_dir / "eval_dataset.json"
+        self.snapshot_store = SnapshotStore(Path(settings.SNAPSHOT_DIR))
 
     async def load_initial_data(self) -> None:
         """Load initial data into document store"""
         pipeline_factory = PipelineFactory()
+        use_snapshot = settings.SNAPSHOT_ENABLED and self.few_shot_path.exists()
         try:
-            medications = self._load_medication_data()
-            documents = create_index_documents(medications)
-
-            index_pipeline = await pipeline_factory.create_indexing_pipeline()
-            logger.success("✨ Pipelines initialized successfully")
-
-            index_pipeline.run({"sparse_embedder": {"documents": documents}})
-            logger.success("✨ Initial medication data loaded successfully")
+            # Holding the build lock lets only the first worker embed the data,
+            # the others wait and then load the snapshot it exported
+            async with (
+                self.snapshot_store.async_build_lock()
+                if use_snapshot
+                else nullcontext()
+            ):
+                await self._migrate_document_ids(pipeline_factory)
+                if use_snapshot and await self._load_from_snapshot(pipeline_factory):
+                    index_version.bump()
+                    return
+
+                medications = self._load_medication_data()
+                documents = create_index_documents(medications)
+
+                index_pipeline = await pipeline_factory.create_indexing_pipeline()
+                logger.success("✨ Pipelines initialized successfully")
+
+                result = await executors.run(
+                    PIPELINE_INIT,
+                    partial(
+                        index_pipeline.run,
+                        {"sparse_embedder": {"documents": documents}},
+                        include_outputs_from={"dense_embedder"},
+                    ),
+                )
+                logger.success("✨ Initial medication data loaded successfully")
+                # Results cached against the previous contents are stale now
+                index_version.bump()
+
+                if use_snapshot and documents:
+                    await executors.run(
+                        PIPELINE_INIT,
+                        self._export_snapshot,
+                        result["dense_embedder"]["documents"],
+                    )
 
         except Exception as e:
             logger.error(f"Failed to load data into document store. Error: {e}")
             raise
 
+    async def _migrate_document_ids(self, pipeline_factory: PipelineFactory) -> None:
+        """Move documents indexed under positional ids to their text-derived ids
+
+        Otherwise they stay next to the same documents written under the new ids,
+        and every few-shot example is retrieved twice.
+        """
+        doc_store = await pipeline_factory.get_document_store()
+        moved = await asyncio.to_thread(doc_store.rekey_documents, medication_id)
+        if moved:
+            logger.info(f"Moved {moved} documents to text-derived ids")
+
+    async def _load_from_snapshot(self, pipeline_factory: PipelineFactory) -> bool:
+        """Write pre-embedded few-shot documents from the current snapshot"""
+        snapshot = await executors.run(
+            PIPELINE_INIT, self.snapshot_store.load, self._source_digest()
+        )
+        if snapshot is None:
+            return False
+
+        writer_pipeline = await pipeline_factory.create_writer_pipeline()
+        await executors.run(
+            PIPELINE_INIT, self._write_snapshot, writer_pipeline, snapshot
+        )
+        logger.success(
+            f"✨ Initial medication data loaded from snapshot ({len(snapshot)} documents)"
+        )
+        return True
+
+    @staticmethod
+    def _write_snapshot(writer_pipeline: Pipeline, snapshot: IndexSnapshot) -> None:
+        """Write the snapshot batch by batch, copying one batch out of it at a time"""
+        for documents in snapshot.iter_batches():
+            writer_pipeline.run({"writer": {"documents": documents}})
+
+    def _export_snapshot(self, documents: List[Document]) -> None:
+        """Export embedded few-shot documents so other workers can skip embedding"""
+        try:
+            self.snapshot_store.write(documents, self._source_digest())
+        except Exception as e:
+            # The snapshot is only an optimisation, startup can carry on without it
+            logger.warning(f"Failed to export index snapshot. Error: {e}")
+
+    def _source_digest(self) -> str:
+        """Digest of the few-shot data and embedding models behind a snapshot"""
+        return compute_source_digest(
+            self.few_shot_path.read_bytes(),
+            settings.EMBEDDING_MODEL_DENSE,
+            settings.EMBEDDING_MODEL_SPARSE,
+            settings.QDRANT_EMBEDDING_DIM,
+        )
+
     def load_eval_data(self) -> None:
         """Load evaluation data."""
         try:
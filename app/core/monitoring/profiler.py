@@ -0,0 +1,158 @@
+import sys
+import time
+import threading
+from collections import Counter, deque
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def _stack(frame: Optional[FrameType]) -> str:
+    """Semicolon separated frames of a stack, outermost first"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", code.co_filename)
+        names.append(f"{module}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _idle(frame: FrameType) -> bool:
+    """Whether a thread is an executor worker waiting for work"""
+    return (
+        frame.f_code.co_name == "_worker"
+        and frame.f_globals.get("__name__") == "concurrent.futures.thread"
+    )
+
+
+def collapse(stacks: Iterable[str]) -> str:
+    """Render stacks in the collapsed format read by flamegraph.pl and speedscope"""
+    counts = Counter(stacks)
+    return "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
+
+
+class SamplingProfiler:
+    """Periodically samples the Python stacks of running threads.
+
+    Sampling happens on a separate thread through ``sys._current_frames``, so the
+    profiled code runs unmodified and pays only for the GIL hand-offs. Executor
+    workers waiting for work are left out.
+
+    Args:
+        interval: Seconds between samples
+        thread_ids: Threads to sample, all but the sampler itself when None
+        max_samples: Samples kept, the oldest being dropped first
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        thread_ids: Optional[List[int]] = None,
+        max_samples: Optional[int] = None,
+    ):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.samples: Deque[Tuple[float, int, str]] = deque(maxlen=max_samples)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "SamplingProfiler":
+        if self.running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._sample_loop, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sample_loop(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self.thread_ids is not None and thread_id not in self.thread_ids:
+                    continue
+                if _idle(frame):
+                    continue
+                self.samples.append((now, thread_id, _stack(frame)))
+
+    def collapsed(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> str:
+        """Collapsed stacks of the samples taken between ``start`` and ``end``"""
+        return collapse(
+            stack
+            for taken, _, stack in list(self.samples)
+            if (start is None or taken >= start) and (end is None or taken <= end)
+        )
+
+
+class SlowRequestProfiler:
+    """Keeps profiles of requests that took longer than a latency threshold.
+
+    A continuous sampler watches every thread, as pipelines run on executor
+    threads rather than the event loop, and keeps a short window of samples.
+    When a request ends over the threshold, the samples taken while it ran are
+    saved. Overlapping requests share samples, so a profile can include work
+    done for concurrent requests.
+
+    Args:
+        threshold: Request duration in seconds from which a profile is kept
+        interval: Seconds between samples
+        window: Seconds of samples retained for requests still running
+        max_profiles: Number of most recent slow request profiles kept
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        interval: float = 0.005,
+        window: float = 60.0,
+        max_profiles: int = 20,
+    ):
+        self.threshold = threshold
+        self.profiles: Deque[Dict[str, Any]] = deque(maxlen=max_profiles)
+        self._sampler = SamplingProfiler(
+            interval=interval,
+            max_samples=max(1, int(window / interval)),
+        )
+
+    def start(self) -> None:
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._sampler.stop()
+
+    def record(self, name: str, start: float, end: float) -> Optional[Dict[str, Any]]:
+        """Save the profile of a finished request if it was slow"""
+        duration = end - start
+        if duration < self.threshold:
+            return None
+        profile = {
+            "request": name,
+            "duration_ms": duration * 1000,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "collapsed": self._sampler.collapsed(start, end),
+        }
+        self.profiles.append(profile)
+        logger.warning(f"Slow request {name} took {duration * 1000:.0f}ms, profiled")
+        return profile
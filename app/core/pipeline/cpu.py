@@ -0,0 +1,145 @@
+import os
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.config.settings import settings
+from app.config.logging import get_logger
+from app.core.monitoring.metrics import metrics
+
+
+logger = get_logger(__name__)
+
+# Set by the preforking server in each worker, read before the models load
+WORKER_SLOT_ENV = "WORKER_SLOT"
+WORKER_COUNT_ENV = "WORKER_COUNT"
+
+MODEL_THREADS = metrics.gauge(
+    "model_intra_op_threads", "Intra-op threads of each local model", ["model"]
+)
+WORKER_CORES = metrics.gauge("worker_cores", "Cores this worker may run on")
+
+
+@dataclass
+class CpuPlan:
+    """How one worker uses the cores of the machine
+
+    Attributes:
+        cores: Cores the worker runs on, all available ones unless pinned
+        embedder_threads: Intra-op threads of each Fastembed model
+        reranker_threads: Intra-op threads of the reranker, ONNX or torch
+        pinned: Whether the worker is restricted to ``cores``
+    """
+
+    cores: List[int]
+    embedder_threads: int
+    reranker_threads: int
+    pinned: bool = False
+
+
+def available_cores() -> List[int]:
+    """Cores this process may run on, honouring an inherited affinity mask"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_cpu(
+    cores: List[int],
+    workers: int = 1,
+    model_calls: int = 1,
+    slot: Optional[int] = None,
+    pin: bool = False,
+) -> CpuPlan:
+    """Divide cores between workers, then between the model calls of a worker.
+
+    Args:
+        cores: Cores available to every worker together
+        workers: Worker processes sharing the cores
+        model_calls: Model calls expected to run at once in a worker
+        slot: Index of this worker, needed to give it its own cores
+        pin: Restrict the worker to its share of the cores
+    """
+    workers = max(1, workers)
+    share = max(1, len(cores) // workers)
+    pinned = pin and slot is not None and len(cores) >= workers
+    if pinned:
+        start = (slot % workers) * share
+        worker_cores = cores[start : start + share]
+    else:
+        worker_cores = list(cores)
+    threads = max(1, share // max(1, model_calls))
+    return CpuPlan(
+        cores=worker_cores,
+        embedder_threads=threads,
+        reranker_threads=threads,
+        pinned=pinned,
+    )
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name, "").strip()
+    return int(value) if value.isdigit() else None
+
+
+def worker_labels() -> Dict[str, str]:
+    """Metric labels telling the workers of a multi-worker server apart
+
+    The preforking server gives each worker a slot, kept when it restarts.
+    Workers started by ``uvicorn --workers`` are told apart by their pid.
+    """
+    if (_env_int(WORKER_COUNT_ENV) or settings.FASTAPI_WORKERS) <= 1:
+        return {}
+    slot = _env_int(WORKER_SLOT_ENV)
+    return {"worker": str(slot if slot is not None else os.getpid())}
+
+
+def configure_cpu() -> Optional[CpuPlan]:
+    """Apply the thread and affinity settings to this worker, before models load.
+
+    Thread counts set explicitly are kept, the auto-tuner only fills the ones
+    left unset. Returns the applied plan, None when tuning is disabled or the
+    models run in the inference server.
+    """
+    if not (settings.CPU_THREADS_AUTO or settings.CPU_PIN_WORKERS):
+        return None
+    if settings.INFERENCE_SOCKET:
+        # The inference server owns the model threads
+        return None
+
+    plan = plan_cpu(
+        available_cores(),
+        workers=_env_int(WORKER_COUNT_ENV) or settings.FASTAPI_WORKERS,
+        model_calls=settings.CPU_MODEL_CALLS,
+        slot=_env_int(WORKER_SLOT_ENV),
+        pin=settings.CPU_PIN_WORKERS,
+    )
+    if settings.CPU_PIN_WORKERS and not plan.pinned:
+        logger.warning(
+            "CPU pinning needs the worker slot of the preforking server, "
+            "running on all cores"
+        )
+    if plan.pinned and hasattr(os, "sched_setaffinity"):
+        # Threads started from here on, model threads included, inherit the mask
+        os.sched_setaffinity(0, plan.cores)
+
+    if settings.CPU_THREADS_AUTO:
+        settings.EMBEDDING_THREADS = settings.EMBEDDING_THREADS or plan.embedder_threads
+        settings.RERANKER_THREADS = settings.RERANKER_THREADS or plan.reranker_threads
+        plan.embedder_threads = settings.EMBEDDING_THREADS
+        plan.reranker_threads = settings.RERANKER_THREADS
+        # Read by torch when it is imported, applied directly when it already is
+        os.environ.setdefault("OMP_NUM_THREADS", str(plan.reranker_threads))
+        torch = sys.modules.get("torch")
+        if torch is not None:
+            torch.set_num_threads(plan.reranker_threads)
+        MODEL_THREADS.set(plan.embedder_threads, model="embedder")
+        MODEL_THREADS.set(plan.reranker_threads, model="reranker")
+
+    WORKER_CORES.set(len(plan.cores))
+    logger.info(
+        f"CPU plan: {len(plan.cores)} cores{' (pinned)' if plan.pinned else ''}, "
+        f"embedder threads={settings.EMBEDDING_THREADS or 'all'}, "
+        f"reranker threads={settings.RERANKER_THREADS or 'all'}"
+    )
+    return plan
@@ -0,0 +1,69 @@
+import contextvars
+from contextlib import contextmanager
+from time import monotonic
+from typing import Iterator, List, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request runs out of time before its work is done"""
+
+
+class Deadline:
+    """Time budget of one request, shared by every stage that serves it.
+
+    Stages record the optional work they skipped to stay within the budget, so
+    that the response can report how it was degraded.
+
+    Args:
+        timeout: Seconds from now until the request must be answered
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = monotonic() + timeout
+        self.degraded: List[str] = []
+
+    def remaining(self) -> float:
+        """Seconds left, never negative"""
+        return max(0.0, self.expires_at - monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return monotonic() >= self.expires_at
+
+    def check(self, stage: str) -> None:
+        """Raise ``DeadlineExceeded`` when no time is left to run ``stage``"""
+        if self.expired:
+            self.degrade("deadline_exceeded")
+            raise DeadlineExceeded(
+                f"Deadline of {self.timeout:.2f}s exceeded before {stage}"
+            )
+
+    def degrade(self, reason: str) -> None:
+        if reason not in self.degraded:
+            self.degraded.append(reason)
+
+
+_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the request being handled in this context, if any"""
+    return _deadline.get()
+
+
+@contextmanager
+def deadline_context(deadline: Deadline) -> Iterator[Deadline]:
+    """Apply the deadline to the work done inside the block.
+
+    The deadline follows the context into ``asyncio.to_thread`` and
+    ``executors.run`` calls, so pipeline components running on worker threads
+    see it too.
+    """
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
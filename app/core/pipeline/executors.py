@@ -0,0 +1,166 @@
+import os
+import sys
+import asyncio
+import threading
+import contextvars
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config.settings import settings
+from app.config.logging import get_logger
+from app.core.monitoring.metrics import metrics
+
+
+logger = get_logger(__name__)
+
+# Builds pipeline components, loading models on first use
+PIPELINE_INIT = "pipeline-init"
+# Runs pipelines, whose embedders and reranker each start their intra-op threads
+PIPELINE_RUN = "pipeline-run"
+
+EXECUTOR_THREADS = metrics.gauge(
+    "executor_threads", "Threads started by each executor", ["executor"]
+)
+EXECUTOR_MAX_THREADS = metrics.gauge(
+    "executor_max_threads", "Maximum threads of each executor", ["executor"]
+)
+
+
+def _env_threads(name: str) -> Optional[int]:
+    value = os.environ.get(name, "").strip()
+    return int(value) if value.isdigit() and int(value) > 0 else None
+
+
+def intra_op_threads() -> Dict[str, int]:
+    """Threads each local model uses for one call, by model.
+
+    Models served by the inference server use none of this process's cores.
+    """
+    if settings.INFERENCE_SOCKET:
+        return {}
+    cpus = os.cpu_count() or 1
+    # ONNX Runtime, behind Fastembed and the ONNX reranker, uses every core
+    # unless given a thread count
+    threads = {"embedder": settings.EMBEDDING_THREADS or cpus}
+    if settings.RERANKER_BACKEND == "onnx":
+        threads["reranker"] = settings.RERANKER_THREADS or cpus
+    else:
+        torch = sys.modules.get("torch")
+        threads["reranker"] = (
+            torch.get_num_threads()
+            if torch is not None
+            else _env_threads("OMP_NUM_THREADS") or cpus
+        )
+    return {model: min(max(1, count), cpus) for model, count in threads.items()}
+
+
+def executor_sizes() -> Dict[str, int]:
+    """Maximum threads of each executor, from the settings or the intra-op threads.
+
+    Pipeline runs call the embedders and the reranker, each starting a team of
+    intra-op threads, so only as many run at once as the cores fit next to the
+    intra-op threads of one model. Building components waits on model loads
+    shared through the model registry and is sized like the default asyncio
+    executor, unless set.
+    """
+    cpus = os.cpu_count() or 1
+    compute = max(intra_op_threads().values(), default=1)
+    return {
+        PIPELINE_INIT: settings.PIPELINE_INIT_THREADS or min(32, cpus + 4),
+        PIPELINE_RUN: settings.PIPELINE_THREADS or max(1, cpus // compute),
+    }
+
+
+class ExecutorRegistry:
+    """Thread pools shared by every pipeline factory and service of the process.
+
+    Started by the application lifespan and shut down with it. Scripts that
+    never start it get each executor on first use.
+    """
+
+    def __init__(self):
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._sizes: Dict[str, int] = {}
+        self._threads: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Create every executor, sized for this process"""
+        for name, size in executor_sizes().items():
+            self._create(name, size)
+        logger.info(
+            "Executors started: "
+            + ", ".join(f"{name}={size}" for name, size in self._sizes.items())
+        )
+
+    def _create(self, name: str, size: int) -> ThreadPoolExecutor:
+        with self._lock:
+            executor = self._executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=size,
+                    thread_name_prefix=f"{name}-",
+                    initializer=self._thread_started,
+                    initargs=(name,),
+                )
+                self._executors[name] = executor
+                self._sizes[name] = size
+                self._threads[name] = 0
+                EXECUTOR_MAX_THREADS.set(size, executor=name)
+                EXECUTOR_THREADS.set(0, executor=name)
+            return executor
+
+    def _thread_started(self, name: str) -> None:
+        # Runs first on every new thread of the executor
+        with self._lock:
+            if name in self._threads:
+                self._threads[name] += 1
+                EXECUTOR_THREADS.set(self._threads[name], executor=name)
+
+    def size(self, name: str) -> Optional[int]:
+        """Maximum threads of a started executor"""
+        return self._sizes.get(name)
+
+    def get(self, name: str) -> ThreadPoolExecutor:
+        executor = self._executors.get(name)
+        if executor is None:
+            executor = self._create(name, executor_sizes()[name])
+        return executor
+
+    async def run(self, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn`` on the named executor, in a copy of the current context.
+
+        Like ``asyncio.to_thread``, the request deadline follows the call.
+        """
+        executor = self.get(name)
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, partial(context.run, fn, *args)
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop every executor, dropping calls that have not started"""
+        with self._lock:
+            executors, self._executors = self._executors, {}
+            self._sizes, self._threads = {}, {}
+        for name, executor in executors.items():
+            executor.shutdown(wait=wait, cancel_futures=True)
+            EXECUTOR_THREADS.set(0, executor=name)
+        if executors:
+            logger.info(f"Executors shut down: {', '.join(executors)}")
+
+    def _forget(self) -> None:
+        # The threads of the parent do not exist in a forked child
+        self._executors = {}
+        self._sizes, self._threads = {}, {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._executors
+
+
+executors = ExecutorRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=executors._forget)
@@ -1,13 +1,11 @@
-import os
+import math
 import asyncio
-from typing import Tuple
+from typing import Optional, Tuple
 from functools import partial
-from concurrent.futures import ThreadPoolExecutor
 
 from haystack import Pipeline
 from haystack.components.writers import DocumentWriter
 from haystack.document_stores.types import DuplicatePolicy
-from haystack.components.builders.prompt_builder import PromptBuilder
 from haystack.components.rankers import TransformersSimilarityRanker
 from haystack_integrations.components.retrievers.qdrant import QdrantHybridRetriever
 from haystack_integrations.components.generators.ollama import OllamaGenerator
@@ -18,8 +16,20 @@ from haystack_integrations.components.embedders.fastembed import (
     FastembedSparseDocumentEmbedder,
 )
 from app.config.settings import settings
-from app.prompts.template import MEDICATION_NER
-from app.core.document_store.factory import DocumentStoreFactory
+from app.core.components.prompt_builder import MedicationPromptBuilder
+from app.core.document_store.registry import document_store_registry
+from app.core.components.onnx_ranker import OnnxCrossEncoderRanker
+from app.core.components.adaptive_ranker import AdaptiveRanker
+from app.core.components.cached_generator import CachedGenerator
+from app.core.components.sidecar import (
+    SidecarRanker,
+    SidecarTextEmbedder,
+    SidecarDocumentEmbedder,
+    SidecarSparseTextEmbedder,
+    SidecarSparseDocumentEmbedder,
+)
+from app.core.pipeline.models import model_registry
+from app.core.pipeline.executors import PIPELINE_INIT, executors
 from app.config.logging import get_logger
 
 
@@ -27,12 +37,6 @@ logger = get_logger(__name__)
 
 
 class PipelineFactory:
-    def __init__(self):
-        self._thread_pool = ThreadPoolExecutor(
-            max_workers=max(1, os.cpu_count() * 3 // 4),
-            thread_name_prefix="pipeline-init-",
-        )
-
     async def create_indexing_pipeline(self) -> Pipeline:
         """Create indexing pipeline with concurrent component initialization"""
         logger.info("Creating indexing pipeline...")
@@ -62,8 +66,32 @@ class PipelineFactory:
             logger.exception("Failed to create indexing pipeline")
             raise
 
-    async def create_query_pipeline(self) -> Pipeline:
-        """Create query pipeline with concurrent component initialization"""
+    async def create_writer_pipeline(self) -> Pipeline:
+        """Create pipeline that writes pre-embedded documents without embedders"""
+        logger.info("Creating writer pipeline...")
+        try:
+            doc_store = await self._async_init(self._create_doc_store)
+            document_writer = await self._async_init(
+                partial(self._create_document_writer, doc_store)
+            )
+
+            writing = Pipeline()
+            writing.add_component("writer", document_writer)
+
+            return writing
+
+        except Exception:
+            logger.exception("Failed to create writer pipeline")
+            raise
+
+    async def create_query_pipeline(
+        self, llm_cache_path: Optional[str] = None
+    ) -> Pipeline:
+        """Create query pipeline with concurrent component initialization.
+
+        Args:
+            llm_cache_path: JSONL file caching LLM outputs by prompt and model
+        """
         logger.info("Creating query pipeline...")
         try:
             # Initialize doc_store and text embedders concurrently
@@ -76,7 +104,7 @@ class PipelineFactory:
             retriever, reranker, generator, prompt_builder = await asyncio.gather(
                 self._async_init(partial(self._create_retriever, doc_store)),
                 self._async_init(self._create_reranker),
-                self._async_init(self._create_generator),
+                self._async_init(partial(self._create_generator, llm_cache_path)),
                 self._async_init(self._create_prompt_builder),
             )
 
@@ -102,19 +130,81 @@ class PipelineFactory:
             logger.exception("Failed to create query pipeline")
             raise
 
+    async def create_retrieval_pipeline(self) -> Pipeline:
+        """Create pipeline that embeds a query and retrieves candidates only"""
+        logger.info("Creating retrieval pipeline...")
+        try:
+            doc_store, (dense_embedder, sparse_embedder) = await asyncio.gather(
+                self._async_init(self._create_doc_store),
+                self._async_init(self._create_text_embedders),
+            )
+            retriever = await self._async_init(
+                partial(self._create_retriever, doc_store)
+            )
+
+            retrieval = Pipeline()
+            retrieval.add_component("sparse_embedder", sparse_embedder)
+            retrieval.add_component("dense_embedder", dense_embedder)
+            retrieval.add_component("retriever", retriever)
+            retrieval.connect(
+                "sparse_embedder.sparse_embedding", "retriever.query_sparse_embedding"
+            )
+            retrieval.connect("dense_embedder.embedding", "retriever.query_embedding")
+
+            return retrieval
+
+        except Exception:
+            logger.exception("Failed to create retrieval pipeline")
+            raise
+
+    async def get_document_store(self):
+        """Get the shared document store, for reads and writes outside pipelines"""
+        return await self._async_init(self._create_doc_store)
+
+    async def create_generation_pipeline(
+        self, llm_cache_path: Optional[str] = None
+    ) -> Pipeline:
+        """Create pipeline that prompts the LLM with already reranked documents"""
+        logger.info("Creating generation pipeline...")
+        try:
+            generator, prompt_builder = await asyncio.gather(
+                self._async_init(partial(self._create_generator, llm_cache_path)),
+                self._async_init(self._create_prompt_builder),
+            )
+
+            generation = Pipeline()
+            generation.add_component("prompt_builder", prompt_builder)
+            generation.add_component("llm", generator)
+            generation.connect("prompt_builder", "llm")
+
+            return generation
+
+        except Exception:
+            logger.exception("Failed to create generation pipeline")
+            raise
+
     async def _async_init(self, factory_func):
-        """Run synchronous initialization in thread pool"""
-        return await asyncio.get_event_loop().run_in_executor(
-            self._thread_pool, factory_func
-        )
+        """Run synchronous initialization on the shared executor"""
+        return await executors.run(PIPELINE_INIT, factory_func)
 
     def _create_document_embedders(
         self,
     ) -> Tuple[FastembedDocumentEmbedder, FastembedSparseDocumentEmbedder]:
         """Create dense and sparse document embedders"""
-        dense_embedder = FastembedDocumentEmbedder(model=settings.EMBEDDING_MODEL_DENSE)
+        if settings.INFERENCE_SOCKET:
+            return (
+                SidecarDocumentEmbedder(
+                    settings.INFERENCE_SOCKET, settings.INFERENCE_TIMEOUT
+                ),
+                SidecarSparseDocumentEmbedder(
+                    settings.INFERENCE_SOCKET, settings.INFERENCE_TIMEOUT
+                ),
+            )
+        dense_embedder = FastembedDocumentEmbedder(
+            model=settings.EMBEDDING_MODEL_DENSE, threads=settings.EMBEDDING_THREADS
+        )
         sparse_embedder = FastembedSparseDocumentEmbedder(
-            model=settings.EMBEDDING_MODEL_SPARSE
+            model=settings.EMBEDDING_MODEL_SPARSE, threads=settings.EMBEDDING_THREADS
         )
         return dense_embedder, sparse_embedder
 
@@ -122,41 +212,97 @@ class PipelineFactory:
         self,
     ) -> Tuple[FastembedTextEmbedder, FastembedSparseTextEmbedder]:
         """Create dense and sparse text embedders"""
-        dense_embedder = FastembedTextEmbedder(model=settings.EMBEDDING_MODEL_DENSE)
+        if settings.INFERENCE_SOCKET:
+            return (
+                SidecarTextEmbedder(
+                    settings.INFERENCE_SOCKET, settings.INFERENCE_TIMEOUT
+                ),
+                SidecarSparseTextEmbedder(
+                    settings.INFERENCE_SOCKET, settings.INFERENCE_TIMEOUT
+                ),
+            )
+        dense_embedder = FastembedTextEmbedder(
+            model=settings.EMBEDDING_MODEL_DENSE, threads=settings.EMBEDDING_THREADS
+        )
         sparse_embedder = FastembedSparseTextEmbedder(
-            model=settings.EMBEDDING_MODEL_SPARSE
+            model=settings.EMBEDDING_MODEL_SPARSE, threads=settings.EMBEDDING_THREADS
         )
         return dense_embedder, sparse_embedder
 
     def _create_doc_store(self):
-        doc_factory = DocumentStoreFactory()
-        return doc_factory.create_document_store()
+        return document_store_registry.get_document_store()
 
     def _create_retriever(self, doc_store):
         return QdrantHybridRetriever(
-            document_store=doc_store, top_k=settings.RETRIEVER_TOP_K
+            document_store=doc_store,
+            top_k=settings.RETRIEVER_TOP_K,
+            return_embedding=settings.QDRANT_RETURN_EMBEDDING,
         )
 
     def _create_reranker(self):
-        reranker = TransformersSimilarityRanker(
-            model=settings.RERANKER_MODEL, top_k=settings.RERANKER_TOP_K
-        )
-        reranker.warm_up()
+        if settings.INFERENCE_SOCKET:
+            # The inference server runs the configured reranker backend
+            reranker = SidecarRanker(
+                settings.INFERENCE_SOCKET,
+                top_k=settings.RERANKER_TOP_K,
+                timeout=settings.INFERENCE_TIMEOUT,
+            )
+        elif settings.RERANKER_BACKEND == "onnx":
+            reranker = OnnxCrossEncoderRanker(
+                model=settings.RERANKER_MODEL,
+                top_k=settings.RERANKER_TOP_K,
+                batch_size=settings.RERANKER_BATCH_SIZE,
+                max_length=settings.RERANKER_MAX_LENGTH,
+                threads=settings.RERANKER_THREADS,
+                quantize=settings.RERANKER_ONNX_QUANTIZE,
+                cache_dir=settings.RERANKER_ONNX_DIR,
+            )
+        elif settings.RERANKER_BACKEND == "transformers":
+            reranker = TransformersSimilarityRanker(
+                model=settings.RERANKER_MODEL, top_k=settings.RERANKER_TOP_K
+            )
+        else:
+            raise ValueError(f"Unknown reranker backend: {settings.RERANKER_BACKEND}")
+        # Reuse the weights already loaded for an earlier pipeline
+        model_registry.warm_up(reranker)
+
+        if (
+            settings.RERANKER_SKIP_MARGIN is not None
+            or settings.RERANKER_MIN_BUDGET_MS is not None
+        ):
+            # Skip the cross-encoder when the fused retrieval scores are decisive
+            # or the request deadline is too close
+            return AdaptiveRanker(
+                ranker=reranker,
+                margin=settings.RERANKER_SKIP_MARGIN,
+                top_k=settings.RERANKER_TOP_K,
+                exact_match=settings.RERANKER_SKIP_EXACT_MATCH,
+                min_budget=(
+                    settings.RERANKER_MIN_BUDGET_MS / 1000
+                    if settings.RERANKER_MIN_BUDGET_MS is not None
+                    else None
+                ),
+            )
         return reranker
 
-    def _create_generator(self):
-        return OllamaGenerator(
+    def _create_generator(self, llm_cache_path: Optional[str] = None):
+        generator = OllamaGenerator(
             model=settings.OLLAMA_MODEL,
             url=settings.OLLAMA_API_URL,
+            # A hung call must not outlive the longest request deadline
+            timeout=math.ceil(settings.REQUEST_MAX_TIMEOUT_MS / 1000),
             generation_kwargs={
                 "temperature": settings.OLLAMA_TEMPERATURE,
                 "num_predict": settings.OLLAMA_MAX_TOKENS,
                 "num_ctx": settings.OLLAMA_MAX_CONTEXT,
             },
         )
+        if llm_cache_path:
+            return CachedGenerator(generator=generator, cache_path=llm_cache_path)
+        return generator
 
     def _create_prompt_builder(self):
-        return PromptBuilder(template=MEDICATION_NER)
+        return MedicationPromptBuilder()
 
     def _create_document_writer(self, doc_store):
         return DocumentWriter(
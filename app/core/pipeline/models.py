@@ -0,0 +1,144 @@
+import gc
+import json
+import threading
+from typing import Any, Dict, Tuple
+
+from app.config.settings import settings
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# Attributes holding the loaded model of each component type
+LOADED_ATTRIBUTES: Dict[str, Tuple[str, ...]] = {
+    "TransformersSimilarityRanker": ("model", "tokenizer", "device"),
+    "OnnxCrossEncoderRanker": ("_session", "_tokenizer", "_input_names"),
+}
+
+
+class ModelRegistry:
+    """Loaded models shared by the components of every pipeline in the process.
+
+    Pipelines are built per request, so without sharing each new reranker would
+    load its weights again. Components of the same type and configuration get the
+    model state of the first one warmed up instead.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.preloaded = False
+
+    @staticmethod
+    def _key(component: Any) -> str:
+        from haystack.core.serialization import component_to_dict
+
+        return json.dumps(component_to_dict(component), sort_keys=True, default=str)
+
+    def warm_up(self, component: Any) -> Any:
+        """Warm up the component, reusing an already loaded model when possible"""
+        attributes = LOADED_ATTRIBUTES.get(type(component).__name__)
+        if attributes is None:
+            component.warm_up()
+            return component
+
+        key = self._key(component)
+        with self._lock:
+            loaded = self._models.get(key)
+            if loaded is None:
+                component.warm_up()
+                loaded = {name: getattr(component, name) for name in attributes}
+                self._models[key] = loaded
+                logger.info(f"Loaded model for {type(component).__name__}")
+        for name, value in loaded.items():
+            setattr(component, name, value)
+        return component
+
+    def freeze(self) -> None:
+        """Put loaded PyTorch models in inference mode with read-only weights.
+
+        Without gradients nothing writes to the parameter tensors, so forked
+        workers keep sharing their pages instead of copying them.
+        """
+        with self._lock:
+            for loaded in self._models.values():
+                for value in loaded.values():
+                    if hasattr(value, "requires_grad_"):
+                        value.eval()
+                        value.requires_grad_(False)
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+model_registry = ModelRegistry()
+
+
+def resolve_model_files() -> None:
+    """Download or export every model the pipelines use, without loading them"""
+    from fastembed import SparseTextEmbedding, TextEmbedding
+
+    TextEmbedding(model_name=settings.EMBEDDING_MODEL_DENSE, lazy_load=True)
+    SparseTextEmbedding(model_name=settings.EMBEDDING_MODEL_SPARSE, lazy_load=True)
+
+    if settings.RERANKER_BACKEND == "onnx":
+        from app.core.components.onnx_ranker import (
+            OnnxCrossEncoderRanker,
+            export_onnx_model,
+        )
+
+        ranker = OnnxCrossEncoderRanker(
+            model=settings.RERANKER_MODEL, cache_dir=settings.RERANKER_ONNX_DIR
+        )
+        # Exports only when the files are not there yet
+        export_onnx_model(
+            settings.RERANKER_MODEL, ranker.model_dir, settings.RERANKER_ONNX_QUANTIZE
+        )
+    else:
+        from huggingface_hub import snapshot_download
+
+        snapshot_download(settings.RERANKER_MODEL)
+
+
+def warm_up_models(fork_safe_only: bool = False) -> None:
+    """Load the reranker and embedder models into this process.
+
+    Args:
+        fork_safe_only: Load only PyTorch weights. ONNX Runtime sessions, used by
+            Fastembed and the ONNX reranker, own thread pools that do not survive
+            a fork, so they must be created in each worker.
+    """
+    from app.core.pipeline.factory import PipelineFactory
+
+    factory = PipelineFactory()
+    if not fork_safe_only or settings.RERANKER_BACKEND == "transformers":
+        factory._create_reranker()
+    if not fork_safe_only:
+        # Fastembed keeps one loaded backend per model and process
+        for embedder in factory._create_text_embedders():
+            embedder.warm_up()
+
+
+def preload_models() -> None:
+    """Resolve model files and load the weights workers can share after a fork.
+
+    The loaded objects are frozen out of garbage collection so that its
+    bookkeeping does not copy the shared pages into every forked worker.
+    """
+    if model_registry.preloaded:
+        return
+    if settings.INFERENCE_SOCKET:
+        # The inference server loads the models, workers only talk to it
+        model_registry.preloaded = True
+        return
+    resolve_model_files()
+    warm_up_models(fork_safe_only=True)
+    model_registry.freeze()
+    gc.collect()
+    gc.freeze()
+    model_registry.preloaded = True
+    logger.info(f"Preloaded models ({len(model_registry)} shared)")
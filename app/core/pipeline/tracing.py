@@ -0,0 +1,331 @@
+import contextvars
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
+
+from haystack import tracing
+from haystack.tracing import Span, Tracer
+from app.core.monitoring.metrics import metrics
+from app.core.pipeline.deadline import DeadlineExceeded, current_deadline
+from app.core.services.circuit_breaker import CircuitOpenError, circuit_breakers
+from app.config.logging import get_logger
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # OpenTelemetry is an optional dependency
+    otel_trace = None
+
+
+logger = get_logger(__name__)
+
+COMPONENT_RUN = "haystack.component.run"
+PIPELINE_RUN = "haystack.pipeline.run"
+
+# Pipeline component names grouped into the stages reported on
+COMPONENT_STAGES: Dict[str, str] = {
+    "sparse_embedder": "embed",
+    "dense_embedder": "embed",
+    "retriever": "retrieve",
+    "reranker": "rerank",
+    "prompt_builder": "prompt",
+    "llm": "generate",
+}
+
+REQUEST_ID_TAG = "request.id"
+
+PIPELINE_SECONDS = metrics.histogram(
+    "pipeline_run_seconds", "Duration of pipeline runs", ["status"]
+)
+COMPONENT_SECONDS = metrics.histogram(
+    "pipeline_component_seconds",
+    "Duration of pipeline component runs",
+    ["component", "stage"],
+)
+COMPONENT_ERRORS = metrics.counter(
+    "pipeline_component_errors", "Pipeline component runs that raised", ["component"]
+)
+PIPELINES_IN_FLIGHT = metrics.gauge(
+    "pipeline_runs_in_flight", "Pipeline runs currently executing"
+)
+
+
+class TimedSpan(Span):
+    """Span recording its tags, duration and the error it ended with"""
+
+    def __init__(
+        self,
+        operation_name: str,
+        tags: Optional[Dict[str, Any]] = None,
+        parent: Optional["TimedSpan"] = None,
+    ):
+        self.operation_name = operation_name
+        self.tags: Dict[str, Any] = dict(tags or {})
+        self.parent = parent
+        self.start = perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self.otel_span: Optional[Any] = None
+
+    @property
+    def component_name(self) -> Optional[str]:
+        return self.tags.get("haystack.component.name")
+
+    @property
+    def stage(self) -> Optional[str]:
+        return COMPONENT_STAGES.get(self.component_name)
+
+    def set_tag(self, key: str, value: Any) -> None:
+        self.tags[key] = value
+
+
+class TracingHook:
+    """Callbacks run around every traced operation.
+
+    Raising from ``on_start`` aborts the operation, and with it the pipeline run.
+    """
+
+    def on_start(self, span: TimedSpan) -> None:
+        pass
+
+    def on_end(self, span: TimedSpan) -> None:
+        pass
+
+
+_current_span: contextvars.ContextVar[Optional[TimedSpan]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "request_id", default=None
+)
+
+
+def current_request_id() -> Optional[str]:
+    """Id of the request being handled in this context, if any"""
+    return _request_id.get()
+
+
+@contextmanager
+def request_context(request_id: str) -> Iterator[str]:
+    """Tag the spans traced inside the block with the given request id"""
+    token = _request_id.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(token)
+
+
+class PipelineTracer(Tracer):
+    """Haystack tracer that times pipeline and component runs and calls hooks"""
+
+    def __init__(self):
+        self._hooks: List[TracingHook] = []
+
+    @property
+    def hooks(self) -> List[TracingHook]:
+        return list(self._hooks)
+
+    def add_hook(self, hook: TracingHook) -> None:
+        if hook not in self._hooks:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook: TracingHook) -> None:
+        if hook in self._hooks:
+            self._hooks.remove(hook)
+
+    @contextmanager
+    def trace(
+        self, operation_name: str, tags: Optional[Dict[str, Any]] = None
+    ) -> Iterator[TimedSpan]:
+        span = TimedSpan(operation_name, tags, parent=_current_span.get())
+        request_id = _request_id.get()
+        if request_id is not None:
+            span.set_tag(REQUEST_ID_TAG, request_id)
+        token = _current_span.set(span)
+        started: List[TracingHook] = []
+        try:
+            for hook in self._hooks:
+                hook.on_start(span)
+                started.append(hook)
+            yield span
+        except BaseException as e:
+            span.error = e
+            raise
+        finally:
+            span.duration = perf_counter() - span.start
+            _current_span.reset(token)
+            for hook in started:
+                try:
+                    hook.on_end(span)
+                except Exception as e:
+                    logger.warning(f"Tracing hook {type(hook).__name__} failed: {e}")
+
+    def current_span(self) -> Optional[TimedSpan]:
+        return _current_span.get()
+
+
+pipeline_tracer = PipelineTracer()
+
+
+def enable_pipeline_tracing() -> PipelineTracer:
+    """Route Haystack tracing to the shared pipeline tracer"""
+    if tracing.tracer.actual_tracer is not pipeline_tracer:
+        tracing.enable_tracing(pipeline_tracer)
+    return pipeline_tracer
+
+
+class MetricsHook(TracingHook):
+    """Exports pipeline and component durations to the metrics registry"""
+
+    def on_start(self, span: TimedSpan) -> None:
+        if span.operation_name == PIPELINE_RUN:
+            PIPELINES_IN_FLIGHT.inc()
+
+    def on_end(self, span: TimedSpan) -> None:
+        if span.operation_name == PIPELINE_RUN:
+            PIPELINES_IN_FLIGHT.dec()
+            status = "error" if span.error is not None else "ok"
+            PIPELINE_SECONDS.observe(span.duration, status=status)
+        elif span.operation_name == COMPONENT_RUN:
+            component = span.component_name or "unknown"
+            COMPONENT_SECONDS.observe(
+                span.duration, component=component, stage=span.stage or "other"
+            )
+            if span.error is not None:
+                COMPONENT_ERRORS.inc(component=component)
+
+
+metrics_hook = MetricsHook()
+
+
+def _otel_attributes(tags: Dict[str, Any]) -> Dict[str, Any]:
+    # OpenTelemetry attributes only accept primitive values
+    return {
+        key: value
+        for key, value in tags.items()
+        if isinstance(value, (str, bool, int, float))
+    }
+
+
+class OpenTelemetryHook(TracingHook):
+    """Mirrors traced pipeline and component runs as OpenTelemetry spans.
+
+    Spans are created with the globally configured tracer provider, so exporting
+    is set up the usual way, e.g. with ``opentelemetry-instrument``.
+    """
+
+    def __init__(self, tracer_name: str = "medication_ner.pipeline"):
+        if otel_trace is None:
+            raise ImportError(
+                "OpenTelemetry tracing requires the opentelemetry-api package"
+            )
+        self._tracer = otel_trace.get_tracer(tracer_name)
+
+    def on_start(self, span: TimedSpan) -> None:
+        parent = span.parent.otel_span if span.parent is not None else None
+        context = otel_trace.set_span_in_context(parent) if parent is not None else None
+        span.otel_span = self._tracer.start_span(
+            span.operation_name, context=context, attributes=_otel_attributes(span.tags)
+        )
+
+    def on_end(self, span: TimedSpan) -> None:
+        if span.otel_span is None:
+            return
+        span.otel_span.set_attributes(_otel_attributes(span.tags))
+        if span.error is not None:
+            span.otel_span.record_exception(span.error)
+            span.otel_span.set_status(
+                otel_trace.Status(otel_trace.StatusCode.ERROR, str(span.error))
+            )
+        span.otel_span.end()
+
+
+class DeadlineHook(TracingHook):
+    """Stops a pipeline run before the next component once its deadline passed"""
+
+    def on_start(self, span: TimedSpan) -> None:
+        deadline = current_deadline()
+        if deadline is not None and span.operation_name == COMPONENT_RUN:
+            deadline.check(span.stage or span.component_name or "component")
+
+
+deadline_hook = DeadlineHook()
+
+
+class CircuitBreakerHook(TracingHook):
+    """Guards the components calling Qdrant and Ollama with circuit breakers.
+
+    A component whose dependency's circuit is open is not run, the pipeline run
+    fails fast with ``CircuitOpenError`` instead.
+    """
+
+    def on_start(self, span: TimedSpan) -> None:
+        if span.operation_name != COMPONENT_RUN:
+            return
+        breaker = circuit_breakers.for_component(span.component_name)
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(breaker.name)
+
+    def on_end(self, span: TimedSpan) -> None:
+        if span.operation_name != COMPONENT_RUN:
+            return
+        breaker = circuit_breakers.for_component(span.component_name)
+        if breaker is None:
+            return
+        if isinstance(span.error, DeadlineExceeded):
+            # Stopped by a later hook before reaching the dependency
+            breaker.release()
+        elif span.error is not None:
+            breaker.record_failure()
+        else:
+            breaker.record_success(span.duration)
+
+
+circuit_breaker_hook = CircuitBreakerHook()
+
+
+def configure_pipeline_tracing(
+    otel_enabled: bool = False, circuit_breakers_enabled: bool = False
+) -> PipelineTracer:
+    """Enable pipeline tracing with its metrics, deadline and optional hooks"""
+    tracer = enable_pipeline_tracing()
+    tracer.add_hook(metrics_hook)
+    tracer.add_hook(deadline_hook)
+    if circuit_breakers_enabled:
+        tracer.add_hook(circuit_breaker_hook)
+    if otel_enabled:
+        if otel_trace is None:
+            logger.warning("OpenTelemetry is not installed, skipping span export")
+        elif not any(isinstance(h, OpenTelemetryHook) for h in tracer.hooks):
+            tracer.add_hook(OpenTelemetryHook())
+    return tracer
+
+
+_stage_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = (
+    contextvars.ContextVar("stage_timings", default=None)
+)
+
+
+class StageTimingHook(TracingHook):
+    """Adds component durations to the stage timings being collected, if any"""
+
+    def on_end(self, span: TimedSpan) -> None:
+        timings = _stage_timings.get()
+        if timings is None or span.operation_name != COMPONENT_RUN:
+            return
+        stage = span.stage or span.component_name
+        timings[stage] = timings.get(stage, 0.0) + span.duration
+
+
+stage_timing_hook = StageTimingHook()
+
+
+@contextmanager
+def collect_stage_timings() -> Iterator[Dict[str, float]]:
+    """Collect per-stage seconds of the pipeline runs made inside the block"""
+    enable_pipeline_tracing().add_hook(stage_timing_hook)
+    timings: Dict[str, float] = {}
+    token = _stage_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _stage_timings.reset(token)
@@ -0,0 +1,174 @@
+import math
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from app.core.monitoring.metrics import metrics
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# Lanes in priority order, a free slot always goes to the first non-empty lane
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANES = (INTERACTIVE, BULK)
+
+ADMISSION_QUEUE_DEPTH = metrics.gauge(
+    "admission_queue_depth", "Requests waiting for admission", ["lane"]
+)
+ADMISSION_IN_FLIGHT = metrics.gauge(
+    "admission_in_flight", "Admitted requests currently being processed"
+)
+ADMISSION_WAIT_SECONDS = metrics.histogram(
+    "admission_wait_seconds", "Time requests waited for admission", ["lane"]
+)
+ADMISSION_REJECTIONS = metrics.counter(
+    "admission_rejections", "Requests shed by admission control", ["lane", "reason"]
+)
+
+
+@dataclass
+class LaneLimits:
+    """Queue bounds of one lane
+
+    Args:
+        max_depth: Requests allowed to wait at once, more are rejected right away
+        max_wait: Seconds a request may wait before it is rejected
+    """
+
+    max_depth: int
+    max_wait: float
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of queued or served
+
+    Args:
+        reason: ``queue_full`` when the lane was full, ``timeout`` when the wait
+            for a slot ran out
+        retry_after: Whole seconds the client should wait before retrying
+    """
+
+    def __init__(self, lane: str, reason: str, retry_after: int):
+        super().__init__(f"Server overloaded ({lane} lane {reason.replace('_', ' ')})")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def status_code(self) -> int:
+        # A full queue asks the client to slow down, a timeout signals overload
+        return 429 if self.reason == "queue_full" else 503
+
+
+class AdmissionController:
+    """Bounded, prioritized admission in front of the extraction service.
+
+    At most ``max_concurrency`` requests are processed at once. Others wait in
+    their lane, interactive requests ahead of bulk ones, and are rejected when
+    their lane is full or their wait exceeds its limit, so that a burst fails
+    fast instead of piling up behind the LLM.
+
+    Args:
+        max_concurrency: Requests processed at once
+        limits: Queue bounds of each lane
+    """
+
+    def __init__(self, max_concurrency: int, limits: Dict[str, LaneLimits]):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limits = limits
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {
+            lane: deque() for lane in LANES
+        }
+        self._active = 0
+        # Moving average of the service time, used to estimate Retry-After
+        self._service_time = 1.0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def queued(self, lane: str) -> int:
+        return len(self._waiters[lane])
+
+    def retry_after(self) -> int:
+        """Estimated seconds until the current backlog has drained"""
+        backlog = self._active + sum(len(waiters) for waiters in self._waiters.values())
+        seconds = self._service_time * backlog / self.max_concurrency
+        return min(60, max(1, math.ceil(seconds)))
+
+    def _reject(self, lane: str, reason: str) -> AdmissionRejected:
+        ADMISSION_REJECTIONS.inc(lane=lane, reason=reason)
+        return AdmissionRejected(lane, reason, self.retry_after())
+
+    def _release(self) -> None:
+        for lane in LANES:
+            waiters = self._waiters[lane]
+            while waiters:
+                waiter = waiters.popleft()
+                ADMISSION_QUEUE_DEPTH.set(len(waiters), lane=lane)
+                if not waiter.done():
+                    # Hand the slot over without freeing it
+                    waiter.set_result(None)
+                    return
+        self._active -= 1
+        ADMISSION_IN_FLIGHT.set(self._active)
+
+    async def _acquire(self, lane: str, timeout: Optional[float]) -> None:
+        waiters = self._waiters[lane]
+        if self._active < self.max_concurrency and not any(self._waiters.values()):
+            self._active += 1
+            ADMISSION_IN_FLIGHT.set(self._active)
+            ADMISSION_WAIT_SECONDS.observe(0.0, lane=lane)
+            return
+        if len(waiters) >= self.limits[lane].max_depth:
+            raise self._reject(lane, "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        ADMISSION_QUEUE_DEPTH.set(len(waiters), lane=lane)
+        start = perf_counter()
+        try:
+            max_wait = self.limits[lane].max_wait
+            await asyncio.wait_for(
+                waiter, max_wait if timeout is None else min(max_wait, timeout)
+            )
+        except asyncio.TimeoutError:
+            raise self._reject(lane, "timeout")
+        except asyncio.CancelledError:
+            # The client went away, pass on a slot handed over meanwhile
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+                ADMISSION_QUEUE_DEPTH.set(len(waiters), lane=lane)
+            ADMISSION_WAIT_SECONDS.observe(perf_counter() - start, lane=lane)
+
+    @asynccontextmanager
+    async def admit(
+        self, lane: str, timeout: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """Hold a processing slot for the duration of the block
+
+        Args:
+            lane: Lane to wait in when no slot is free
+            timeout: Seconds the caller can wait at most, e.g. until its deadline
+
+        Raises:
+            AdmissionRejected: If the request is shed
+        """
+        await self._acquire(lane, timeout)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._service_time = 0.8 * self._service_time + 0.2 * (
+                perf_counter() - start
+            )
+            self._release()
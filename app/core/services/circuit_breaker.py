@@ -0,0 +1,179 @@
+import threading
+from time import monotonic
+from typing import Dict, Optional
+
+from app.config.settings import settings
+from app.core.monitoring.metrics import metrics
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+# Gauge values of the states, ordered by severity
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Pipeline components and the external dependency each one calls
+COMPONENT_DEPENDENCIES: Dict[str, str] = {"retriever": "qdrant", "llm": "ollama"}
+
+BREAKER_STATE = metrics.gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state per dependency: 0 closed, 1 half-open, 2 open",
+    ["dependency"],
+)
+BREAKER_TRANSITIONS = metrics.counter(
+    "circuit_breaker_transitions",
+    "Circuit breaker state changes per dependency",
+    ["dependency", "state"],
+)
+BREAKER_REJECTIONS = metrics.counter(
+    "circuit_breaker_rejections",
+    "Calls refused because the dependency's circuit was open",
+    ["dependency"],
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit is open"""
+
+    def __init__(self, dependency: str):
+        super().__init__(f"Circuit for {dependency} is open")
+        self.dependency = dependency
+
+
+class CircuitBreaker:
+    """Stops calling a dependency after repeated failures, then probes it.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and calls
+    are refused. Once ``reset_timeout`` seconds have passed it is half-open: a
+    single probe call is let through, closing the circuit when it succeeds and
+    opening it again when it fails. Calls slower than ``slow_call`` seconds
+    count as failures.
+
+    Args:
+        name: Dependency guarded, used as the metrics label
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds the circuit stays open before probing
+        slow_call: Seconds after which a successful call counts as failed
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        slow_call: Optional[float] = None,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.slow_call = slow_call
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        BREAKER_STATE.set(STATE_VALUES[CLOSED], dependency=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and monotonic() - self._opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        self._state = state
+        if state == OPEN:
+            self._opened_at = monotonic()
+        BREAKER_STATE.set(STATE_VALUES[state], dependency=self.name)
+        BREAKER_TRANSITIONS.inc(dependency=self.name, state=state)
+        log = logger.warning if state == OPEN else logger.info
+        log(f"Circuit for {self.name} is now {state.replace('_', '-')}")
+
+    def available(self) -> bool:
+        """Whether a call would be let through now, without reserving it"""
+        with self._lock:
+            state = self._current_state()
+            return state == CLOSED or (state == HALF_OPEN and not self._probing)
+
+    def allow(self) -> bool:
+        """Reserve a call, which must be followed by a ``record_*`` call"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+        BREAKER_REJECTIONS.inc(dependency=self.name)
+        return False
+
+    def record_success(self, duration: float = 0.0) -> None:
+        if self.slow_call is not None and duration > self.slow_call:
+            self.record_failure()
+            return
+        with self._lock:
+            self._probing = False
+            if self._state == OPEN:
+                # A call started before the circuit opened says little
+                return
+            self._failures = 0
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            was_probe, self._probing = self._probing, False
+            if self._state == OPEN:
+                return
+            if was_probe or self._failures >= self.failure_threshold:
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """Give back a reserved call that did not reach the dependency"""
+        with self._lock:
+            self._probing = False
+
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per dependency, shared by every request in the process"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, dependency: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(dependency)
+            if breaker is None:
+                slow_ms = {
+                    "ollama": settings.CIRCUIT_OLLAMA_SLOW_MS,
+                    "qdrant": settings.CIRCUIT_QDRANT_SLOW_MS,
+                }.get(dependency)
+                breaker = CircuitBreaker(
+                    dependency,
+                    failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                    reset_timeout=settings.CIRCUIT_RESET_TIMEOUT_S,
+                    slow_call=slow_ms / 1000 if slow_ms is not None else None,
+                )
+                self._breakers[dependency] = breaker
+            return breaker
+
+    def for_component(self, component_name: Optional[str]) -> Optional[CircuitBreaker]:
+        dependency = COMPONENT_DEPENDENCIES.get(component_name)
+        return self.get(dependency) if dependency is not None else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+circuit_breakers = CircuitBreakerRegistry()
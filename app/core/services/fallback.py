@@ -0,0 +1,49 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from app.core.services.records import ENTITY_FIELDS
+
+DOSAGE_PATTERN = re.compile(
+    r"\d+(?:\.\d+)?\s*(?:MG|MCG|ML|UNT|MEQ|%)(?:/\w+)?", re.IGNORECASE
+)
+BRAND_PATTERN = re.compile(r"\[(.+?)\]")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def parse_medication(text: str) -> Dict[str, Any]:
+    """Deterministic rule-based extraction, used when the LLM is unavailable.
+
+    Handles the RxNorm-style ``<drug> <dosage> <form> [<brand>]`` layout: the
+    drug name precedes the first dosage and the administration type follows it.
+    """
+    dosage = DOSAGE_PATTERN.findall(text)
+    drug, _, rest = text.partition(dosage[0]) if dosage else (text, "", "")
+    drug = BRAND_PATTERN.sub("", drug).strip()
+    administration = BRAND_PATTERN.sub("", rest).strip()
+    return {
+        "original_text": text,
+        "quantity": [],
+        "drug_name": [drug] if drug else [],
+        "dosage": [d.strip() for d in dosage],
+        "administration_type": [administration] if administration else [],
+        "brand": BRAND_PATTERN.findall(text),
+    }
+
+
+def nearest_neighbour_entities(
+    text: str, documents: List[Any]
+) -> Optional[Dict[str, Any]]:
+    """Entities of the indexed example matching ``text``, if retrieval found one.
+
+    Only a top hit with the same text (ignoring case and whitespace) is trusted,
+    a merely similar example would lend its drug name or dosage to the text.
+    """
+    if not documents or _normalize(documents[0].content or "") != _normalize(text):
+        return None
+    meta = documents[0].meta or {}
+    entities = {field: list(meta.get(field) or []) for field in ENTITY_FIELDS}
+    entities["original_text"] = text
+    return entities
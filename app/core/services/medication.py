@@ -1,20 +1,64 @@
 import json
 import time
 import uuid
-from typing import List, Dict, Any
+import asyncio
+from collections import Counter
+from dataclasses import replace
+from typing import List, Dict, Any, Hashable, Optional
 
 from app.core.services.pipeline import PipelineService
-from app.utils.common import create_index_documents
+from app.core.pipeline.tracing import request_context
+from app.core.pipeline.deadline import DeadlineExceeded, current_deadline
+from app.core.services.circuit_breaker import circuit_breakers
+from app.core.document_store.version import index_version
+from app.core.services.fallback import nearest_neighbour_entities, parse_medication
+from app.core.services.single_flight import in_flight_extractions, normalize_text
+from app.core.services.records import ExtractedMedication, ExtractionResult
+from app.config.settings import settings
+from app.core.monitoring.metrics import metrics
+from app.utils.common import create_index_documents, medication_meta
+from app.utils.serialization import loads
 from app.schemas.medication import (
     MedicationEntity,
-    MedicationResponse,
     MedicationIndexResponse,
+    MedicationUpdateRequest,
 )
-from app.config.logging import get_logger
+from app.config.logging import get_logger, sample_debug
 
 
 logger = get_logger(__name__)
 
+EXTRACTION_QUEUE_DEPTH = metrics.gauge(
+    "extraction_queue_depth", "Texts received and not yet processed"
+)
+LLM_PARSE_FAILURES = metrics.counter(
+    "llm_parse_failures", "LLM replies that could not be parsed as JSON"
+)
+EXTRACTION_FALLBACKS = metrics.counter(
+    "extraction_fallbacks",
+    "Texts answered without the LLM because a dependency was unavailable",
+    ["mode"],
+)
+EXTRACTION_TEXTS = metrics.counter("extraction_texts", "Texts received for extraction")
+EXTRACTION_TEXTS_DEDUPLICATED = metrics.counter(
+    "extraction_texts_deduplicated",
+    "Texts answered by the extraction of an identical text, within the request "
+    "or in flight for a concurrent one",
+    ["scope"],
+)
+EXTRACTION_DEDUP_RATIO = metrics.gauge(
+    "extraction_dedup_ratio", "Share of received texts answered by deduplication"
+)
+
+
+def _record_deduplicated(count: int, scope: str) -> None:
+    if count:
+        EXTRACTION_TEXTS_DEDUPLICATED.inc(count, scope=scope)
+    deduplicated = EXTRACTION_TEXTS_DEDUPLICATED.value(
+        scope="request"
+    ) + EXTRACTION_TEXTS_DEDUPLICATED.value(scope="in_flight")
+    EXTRACTION_DEDUP_RATIO.set(deduplicated / max(1.0, EXTRACTION_TEXTS.value()))
+
 
 class MedicationService:
     """Service for processing medication-related operations"""
@@ -50,7 +94,10 @@ class MedicationService:
             documents = create_index_documents(medications)
 
             # Execute indexing pipeline
-            await self._pipeline_service.execute_index_pipeline(documents)
+            with request_context(request_id):
+                await self._pipeline_service.execute_index_pipeline(documents)
+            # Results cached against the previous contents are stale now
+            index_version.bump()
 
             processing_time = time.perf_counter() - start_time
 
@@ -62,13 +109,91 @@ class MedicationService:
             return MedicationIndexResponse(
                 message=f"Successfully indexed {len(medications)} medications",
                 processing_time=processing_time,
+                ids=[doc.id for doc in documents],
             )
 
         except Exception as e:
             logger.exception(f"Request {request_id}: Failed to index medications. {e}")
             raise
 
-    async def extract_entities(self, texts: List[str]) -> MedicationResponse:
+    async def update_medication(
+        self, document_id: str, update: MedicationUpdateRequest
+    ) -> Optional[MedicationIndexResponse]:
+        """
+        Update an indexed medication in place.
+
+        Only a changed ``original_text`` is re-embedded, changes to the entity
+        fields alone rewrite the stored payload. As ids are derived from the
+        text, a changed text moves the medication to the id of the new text.
+
+        Args:
+            document_id: Id returned when the medication was indexed
+            update: Fields to change, fields left out are kept
+
+        Returns:
+            Update metadata with the current id, or None if no medication has
+            this id
+        """
+        start_time = time.perf_counter()
+        documents = await self._pipeline_service.get_documents([document_id])
+        if not documents:
+            return None
+
+        current = MedicationEntity(**documents[0].meta)
+        medication = current.model_copy(
+            update=update.model_dump(exclude_unset=True, exclude_none=True)
+        )
+        if medication.original_text != current.original_text:
+            (document,) = create_index_documents([medication])
+            await self._pipeline_service.execute_index_pipeline([document])
+            # Indexing the new text later then overwrites it instead of adding
+            # a duplicate
+            if document.id != document_id:
+                await self._pipeline_service.delete_documents([document_id])
+            message = f"Re-embedded medication {document_id} as {document.id}"
+            document_id = document.id
+        else:
+            await self._pipeline_service.update_document_meta(
+                document_id, medication_meta(medication)
+            )
+            message = f"Updated medication {document_id}"
+        # Results cached against the previous contents are stale now
+        index_version.bump()
+
+        processing_time = time.perf_counter() - start_time
+        logger.info(f"{message} in {processing_time:.2f} seconds")
+        return MedicationIndexResponse(
+            message=message, processing_time=processing_time, ids=[document_id]
+        )
+
+    async def delete_medication(
+        self, document_id: str
+    ) -> Optional[MedicationIndexResponse]:
+        """
+        Remove an indexed medication.
+
+        Args:
+            document_id: Id returned when the medication was indexed
+
+        Returns:
+            Deletion metadata, or None if no medication has this id
+        """
+        start_time = time.perf_counter()
+        if not await self._pipeline_service.get_documents([document_id]):
+            return None
+
+        await self._pipeline_service.delete_documents([document_id])
+        index_version.bump()
+
+        processing_time = time.perf_counter() - start_time
+        logger.info(f"Deleted medication {document_id}")
+        return MedicationIndexResponse(
+            message=f"Deleted medication {document_id}",
+            processing_time=processing_time,
+            ids=[document_id],
+        )
+
+    async def extract_entities(self, texts: List[str]) -> ExtractionResult:
         """
         Extract medication entities from a list of texts.
 
@@ -76,7 +201,8 @@ class MedicationService:
             texts: List of medication strings to process
 
         Returns:
-            ProcessingResult containing extracted entities and metadata
+            ExtractionResult containing extracted entities and metadata, in the
+            shape of MedicationResponse but not validated against it
 
         Raises:
             EntityExtractionError: If extraction fails
@@ -85,18 +211,56 @@ class MedicationService:
         logger.info(f"Starting entity extraction for request {request_id}")
 
         start_time = time.perf_counter()
-        results: List[MedicationEntity] = []
+        deadline = current_deadline()
+        fallbacks: List[str] = []
+        dedup = settings.EXTRACTION_DEDUP_ENABLED
+        # Identical texts share one extraction, fanned out to each occurrence
+        keys: List[Hashable] = [
+            normalize_text(text) if dedup else i for i, text in enumerate(texts)
+        ]
+        occurrences = Counter(keys)
+        extracted: Dict[Hashable, ExtractedMedication] = {}
+        pending = len(texts)
+        EXTRACTION_QUEUE_DEPTH.inc(pending)
+        EXTRACTION_TEXTS.inc(len(texts))
+        _record_deduplicated(len(texts) - len(occurrences), "request")
 
         try:
-            for idx, text in enumerate(texts, 1):
-                logger.debug(
-                    f"Request {request_id}: Processing text {idx}/{len(texts)}: {text}"
-                )
+            for idx, (text, key) in enumerate(zip(texts, keys), 1):
+                if key in extracted:
+                    continue
+
+                if deadline is not None and deadline.expired:
+                    # Out of time, answer the remaining texts without entities
+                    deadline.degrade("deadline_exceeded")
+                    extracted[key] = ExtractedMedication(text)
+                    pending -= occurrences[key]
+                    EXTRACTION_QUEUE_DEPTH.dec(occurrences[key])
+                    continue
+
+                if sample_debug():
+                    logger.debug(
+                        "Request {}: Processing text {}/{}: {}",
+                        request_id,
+                        idx,
+                        len(texts),
+                        text,
+                    )
 
                 # Execute pipeline and extract entities
-                entities = await self._process_single_text(text, request_id, idx)
-                results.append(entities)
-
+                with request_context(request_id):
+                    extracted[key] = await self._extract_once(
+                        text, request_id, idx, fallbacks, key if dedup else None
+                    )
+                pending -= occurrences[key]
+                EXTRACTION_QUEUE_DEPTH.dec(occurrences[key])
+
+            results = [
+                extracted[key]
+                if extracted[key].original_text == text
+                else replace(extracted[key], original_text=text)
+                for text, key in zip(texts, keys)
+            ]
             processing_time = time.perf_counter() - start_time
 
             logger.info(
@@ -104,53 +268,153 @@ class MedicationService:
                 f"in {processing_time:.2f} seconds"
             )
 
-            return MedicationResponse(results=results, processing_time=processing_time)
+            degraded = list(deadline.degraded) if deadline is not None else []
+            degraded.extend(mode for mode in fallbacks if mode not in degraded)
+            return ExtractionResult(
+                results=results,
+                processing_time=processing_time,
+                degraded=degraded,
+            )
 
         except Exception as e:
             logger.exception(
                 f"Request {request_id}: Error during entity extraction. {e}"
             )
             raise
+        finally:
+            # Texts left unprocessed by a failure are no longer waiting
+            EXTRACTION_QUEUE_DEPTH.dec(pending)
+
+    async def _extract_once(
+        self,
+        text: str,
+        request_id: str,
+        idx: int,
+        fallbacks: List[str],
+        key: Optional[str] = None,
+    ) -> ExtractedMedication:
+        """Extract entities, sharing the run of an identical text already in flight"""
+        if key is None:
+            return await self._process_single_text(text, request_id, idx, fallbacks)
+
+        async def extract():
+            modes: List[str] = []
+            entities = await self._process_single_text(text, request_id, idx, modes)
+            return entities, modes
+
+        # The shared run serves another request's deadline, wait only for ours
+        deadline = current_deadline()
+        try:
+            (entities, modes), shared = await in_flight_extractions.do(
+                key, extract, timeout=deadline.remaining() if deadline else None
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Request {}: Text {} not processed: deadline exceeded while "
+                "waiting for an identical extraction",
+                request_id,
+                idx,
+            )
+            deadline.degrade("deadline_exceeded")
+            return ExtractedMedication(text)
+        if shared and "deadline_exceeded" in modes:
+            # The shared run ran out of the other request's time, not ours
+            return await self._process_single_text(text, request_id, idx, fallbacks)
+        if shared:
+            _record_deduplicated(1, "in_flight")
+        fallbacks.extend(mode for mode in modes if mode not in fallbacks)
+        return entities
 
     async def _process_single_text(
-        self, text: str, request_id: str, idx: int
-    ) -> MedicationEntity:
+        self, text: str, request_id: str, idx: int, fallbacks: List[str]
+    ) -> ExtractedMedication:
         """Process a single medication text and extract entities"""
+        if not (
+            circuit_breakers.get("qdrant").available()
+            and circuit_breakers.get("ollama").available()
+        ):
+            # Skip the LLM call that would only be refused
+            return await self._fallback(text, request_id, idx, fallbacks)
+
         try:
             # Execute query pipeline
             response = await self._pipeline_service.execute_query_pipeline(text)
 
             # Parse LLM response
-            extracted_data = self._parse_llm_response(response, text)
+            entities = self._parse_llm_response(response, text)
 
-            logger.debug(
-                f"Request {request_id}: Successfully extracted entities from text {idx}"
-            )
+            if sample_debug():
+                logger.debug(
+                    "Request {}: Successfully extracted entities from text {}",
+                    request_id,
+                    idx,
+                )
 
-            return MedicationEntity(**extracted_data)
+            return entities
 
+        except DeadlineExceeded as e:
+            logger.warning("Request {}: Text {} not processed: {}", request_id, idx, e)
+            # Also tells requests sharing this extraction why it came back empty
+            fallbacks.append("deadline_exceeded")
+            return ExtractedMedication(text)
         except Exception as e:
             logger.error(
-                f"Request {request_id}: Failed to process text {idx}: {str(e)}"
+                "Request {}: Failed to process text {}: {}", request_id, idx, e
             )
-            # Return empty entity on failure
-            return MedicationEntity(original_text=text)
+            return await self._fallback(text, request_id, idx, fallbacks)
+
+    async def _fallback(
+        self, text: str, request_id: str, idx: int, fallbacks: List[str]
+    ) -> ExtractedMedication:
+        """Extract entities without the LLM: nearest indexed example, else the parser"""
+        if circuit_breakers.get("qdrant").available():
+            try:
+                documents = await self._pipeline_service.execute_retrieval_pipeline(
+                    text
+                )
+                extracted = nearest_neighbour_entities(text, documents)
+                if extracted is not None:
+                    return self._fallback_entity(
+                        extracted, "llm_fallback_retrieval", fallbacks
+                    )
+            except DeadlineExceeded as e:
+                logger.warning(
+                    "Request {}: Text {} not processed: {}", request_id, idx, e
+                )
+                fallbacks.append("deadline_exceeded")
+                return ExtractedMedication(text)
+            except Exception as e:
+                logger.warning(
+                    "Request {}: Retrieval fallback failed for text {}: {}",
+                    request_id,
+                    idx,
+                    e,
+                )
+        return self._fallback_entity(
+            parse_medication(text), "llm_fallback_parser", fallbacks
+        )
+
+    @staticmethod
+    def _fallback_entity(
+        extracted: Dict[str, Any], mode: str, fallbacks: List[str]
+    ) -> ExtractedMedication:
+        EXTRACTION_FALLBACKS.inc(mode=mode)
+        if mode not in fallbacks:
+            fallbacks.append(mode)
+        return ExtractedMedication.from_dict(extracted, extracted["original_text"])
 
     def _parse_llm_response(
-        self, llm_response: str, original_text: str
-    ) -> Dict[str, Any]:
-        """Parse LLM response into structured data"""
+        self, llm_response: Dict[str, Any], original_text: str
+    ) -> ExtractedMedication:
+        """Parse LLM response into the entities of the text"""
         try:
-            extracted = json.loads(llm_response["llm"]["replies"][0])
-            extracted["original_text"] = original_text
-            return extracted
+            extracted = loads(llm_response["llm"]["replies"][0])
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse LLM response: {str(e)}")
-            return {
-                "original_text": original_text,
-                "quantity": [],
-                "drug_name": [],
-                "dosage": [],
-                "administration_type": [],
-                "brand": [],
-            }
+            LLM_PARSE_FAILURES.inc()
+            logger.error("Failed to parse LLM response: {}", e)
+            return ExtractedMedication(original_text)
+        if not isinstance(extracted, dict):
+            LLM_PARSE_FAILURES.inc()
+            logger.error("LLM response is not a JSON object: {:.100}", str(extracted))
+            return ExtractedMedication(original_text)
+        return ExtractedMedication.from_dict(extracted, original_text)
@@ -1,17 +1,38 @@
-import traceback
+import asyncio
+from functools import partial
 from time import perf_counter
-from typing import List, Dict, Union, Any
+from typing import List, Dict, Union, Any, Optional, Set
 from contextlib import asynccontextmanager
 from pydantic import BaseModel
 from haystack import Pipeline
 from haystack.dataclasses import Document
 
 from app.core.pipeline.factory import PipelineFactory
-from app.config.logging import get_logger
+from app.core.pipeline.deadline import DeadlineExceeded, current_deadline
+from app.core.pipeline.executors import PIPELINE_RUN, executors
+from app.core.services.circuit_breaker import CircuitOpenError
+from app.core.services.retrieval_cache import RetrievalCache
+from app.core.document_store.version import index_version
+from app.core.pipeline.tracing import (
+    circuit_breaker_hook,
+    collect_stage_timings,
+    deadline_hook,
+    enable_pipeline_tracing,
+)
+from app.config.settings import settings
+from app.core.monitoring.metrics import metrics
+from app.config.logging import get_logger, sample_debug
 
 
 logger = get_logger(__name__)
 
+PIPELINE_CREATION_SECONDS = metrics.histogram(
+    "pipeline_creation_seconds", "Time spent building pipelines", ["pipeline"]
+)
+
+# Stages whose output the retrieval cache replaces
+CACHED_STAGES = ("embed", "retrieve", "rerank")
+
 
 class PipelineMetrics(BaseModel):
     """Metrics for pipeline execution"""
@@ -24,8 +45,13 @@ class PipelineMetrics(BaseModel):
 class PipelineService:
     """Service for managing and executing pipelines"""
 
-    def __init__(self, pipeline_factory: PipelineFactory):
+    def __init__(
+        self,
+        pipeline_factory: PipelineFactory,
+        retrieval_cache: Optional[RetrievalCache] = None,
+    ):
         self._pipeline_factory = pipeline_factory
+        self._retrieval_cache = retrieval_cache
 
     @asynccontextmanager
     async def _pipeline_lifecycle(self, pipeline_type: str):
@@ -37,13 +63,21 @@ class PipelineService:
                 pipeline = await self._pipeline_factory.create_query_pipeline()
             elif pipeline_type == "index":
                 pipeline = await self._pipeline_factory.create_indexing_pipeline()
+            elif pipeline_type == "retrieval":
+                pipeline = await self._pipeline_factory.create_retrieval_pipeline()
+            elif pipeline_type == "generation":
+                pipeline = await self._pipeline_factory.create_generation_pipeline()
             else:
                 raise ValueError(f"Unknown pipeline type: {pipeline_type}")
 
             creation_time = perf_counter() - start_time
-            logger.debug(
-                f"{pipeline_type.capitalize()} pipeline created in {creation_time:.2f}s"
-            )
+            PIPELINE_CREATION_SECONDS.observe(creation_time, pipeline=pipeline_type)
+            if sample_debug():
+                logger.debug(
+                    "{} pipeline created in {:.2f}s",
+                    pipeline_type.capitalize(),
+                    creation_time,
+                )
 
             try:
                 yield pipeline, creation_time, start_time
@@ -60,6 +94,12 @@ class PipelineService:
         if not isinstance(text, str) or not text.strip():
             raise ValueError("Query text must be a non-empty string")
 
+        if self._retrieval_cache is not None:
+            version = index_version.current()
+            documents = self._retrieval_cache.get(text, version)
+            if documents is not None:
+                return await self._execute_generation_pipeline(text, documents)
+
         async with self._pipeline_lifecycle("query") as (
             pipeline,
             creation_time,
@@ -67,26 +107,73 @@ class PipelineService:
         ):
             try:
                 pipeline_input = self._create_query_input(text)
-                result = await self._run_pipeline(pipeline, pipeline_input)
+                if self._retrieval_cache is None:
+                    result = await self._run_pipeline(pipeline, pipeline_input)
+                else:
+                    with collect_stage_timings() as timings:
+                        result = await self._run_pipeline(
+                            pipeline, pipeline_input, include_outputs_from={"reranker"}
+                        )
+                    self._cache_reranked(text, version, result, timings)
 
                 # Calculate and log metrics
                 metrics = self._calculate_metrics(creation_time, start_time)
                 logger.info(
-                    "Query pipeline metrics: "
-                    f"creation={metrics.pipeline_creation_time:.2f}s, "
-                    f"execution={metrics.execution_time:.2f}s, "
-                    f"total={metrics.total_time:.2f}s"
+                    "Query pipeline metrics: creation={:.2f}s, execution={:.2f}s, "
+                    "total={:.2f}s",
+                    metrics.pipeline_creation_time,
+                    metrics.execution_time,
+                    metrics.total_time,
                 )
 
                 return result
 
             except Exception as e:
+                # Log truncated query for context
                 logger.error(
-                    f"Query pipeline execution failed: {str(e)}",
-                    extra={"query_text": text[:100]},  # Log truncated query for context
+                    "Query pipeline execution failed: {} (query: {})", e, text[:100]
                 )
                 raise
 
+    async def _execute_generation_pipeline(
+        self, text: str, documents: List[Document]
+    ) -> Dict[str, Any]:
+        """Prompt the LLM with the reranked documents cached for the text"""
+        async with self._pipeline_lifecycle("generation") as (pipeline, _, _):
+            result = await self._run_pipeline(
+                pipeline, {"prompt_builder": {"query": text, "documents": documents}}
+            )
+            result["reranker"] = {"documents": documents}
+            return result
+
+    def _cache_reranked(
+        self,
+        text: str,
+        version: int,
+        result: Dict[str, Any],
+        timings: Dict[str, float],
+    ) -> None:
+        deadline = current_deadline()
+        if deadline is not None and "rerank_skipped" in deadline.degraded:
+            # Documents left unranked for lack of time must not be served later
+            return
+        documents = result.get("reranker", {}).get("documents")
+        if documents is not None:
+            seconds = sum(timings.get(stage, 0.0) for stage in CACHED_STAGES)
+            self._retrieval_cache.put(text, version, documents, seconds)
+
+    async def execute_retrieval_pipeline(self, text: str) -> List[Document]:
+        """Retrieve the indexed examples closest to the text, without reranking"""
+        async with self._pipeline_lifecycle("retrieval") as (pipeline, _, _):
+            result = await self._run_pipeline(
+                pipeline,
+                {
+                    "sparse_embedder": {"text": text},
+                    "dense_embedder": {"text": text},
+                },
+            )
+            return result["retriever"]["documents"]
+
     async def execute_index_pipeline(
         self, documents: List[Union[Dict, Document]]
     ) -> None:
@@ -122,6 +209,24 @@ class PipelineService:
                 )
                 raise
 
+    async def get_documents(self, ids: List[str]) -> List[Document]:
+        """Fetch indexed documents by id, without their embeddings"""
+        doc_store = await self._pipeline_factory.get_document_store()
+        return await asyncio.to_thread(
+            doc_store.get_documents_by_id, ids, return_embedding=False
+        )
+
+    async def update_document_meta(
+        self, document_id: str, meta: Dict[str, Any]
+    ) -> None:
+        """Rewrite the meta of an indexed document without re-embedding it"""
+        doc_store = await self._pipeline_factory.get_document_store()
+        await asyncio.to_thread(doc_store.update_meta, document_id, meta)
+
+    async def delete_documents(self, ids: List[str]) -> None:
+        doc_store = await self._pipeline_factory.get_document_store()
+        await asyncio.to_thread(doc_store.delete_documents, ids)
+
     @staticmethod
     def _create_query_input(text: str) -> Dict[str, Dict[str, str]]:
         """Create formatted input for query pipeline"""
@@ -140,17 +245,42 @@ class PipelineService:
         return {"sparse_embedder": {"documents": documents}}
 
     async def _run_pipeline(
-        self, pipeline: Pipeline, pipeline_input: Dict[str, Any]
+        self,
+        pipeline: Pipeline,
+        pipeline_input: Dict[str, Any],
+        include_outputs_from: Optional[Set[str]] = None,
     ) -> Dict[str, Any]:
-        """Execute pipeline with error handling"""
+        """Execute pipeline on a worker thread, within the request deadline if any"""
+        deadline = current_deadline()
+        if settings.CIRCUIT_BREAKER_ENABLED:
+            # Fails fast instead of calling a dependency with an open circuit
+            enable_pipeline_tracing().add_hook(circuit_breaker_hook)
+        run = partial(
+            pipeline.run, pipeline_input, include_outputs_from=include_outputs_from
+        )
         try:
-            return pipeline.run(pipeline_input)
+            if deadline is None:
+                return await executors.run(PIPELINE_RUN, run)
+
+            deadline.check("pipeline")
+            # Stops the run in its thread before the next component once time is up
+            enable_pipeline_tracing().add_hook(deadline_hook)
+            try:
+                return await asyncio.wait_for(
+                    executors.run(PIPELINE_RUN, run),
+                    deadline.remaining(),
+                )
+            except asyncio.TimeoutError:
+                deadline.degrade("deadline_exceeded")
+                raise DeadlineExceeded(
+                    f"Deadline of {deadline.timeout:.2f}s exceeded during pipeline run"
+                )
+        except (DeadlineExceeded, CircuitOpenError) as e:
+            logger.warning("Pipeline run stopped: {}", e)
+            raise
         except Exception as e:
-            logger.error(
-                f"Pipeline run failed: {str(e)}.\n{traceback.format_exc()}",
-                extra={
-                    "pipeline_input": str(pipeline_input)[:200]
-                },  # Log truncated input
+            logger.opt(exception=e).error(
+                "Pipeline run failed: {} (input: {:.200})", e, str(pipeline_input)
             )
             raise
 
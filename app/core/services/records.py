@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+# Entity fields of a medication, in the order of MedicationEntity
+ENTITY_FIELDS = ("quantity", "drug_name", "dosage", "administration_type", "brand")
+
+
+def _as_strings(value: Any) -> List[str]:
+    """Coerce a loosely typed entity field of LLM output to a list of strings"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [item if isinstance(item, str) else str(item) for item in value]
+    return [str(value)]
+
+
+@dataclass(slots=True)
+class ExtractedMedication:
+    """Entities extracted from one text, the internal form of ``MedicationEntity``
+
+    Passed between the extraction stages and serialized straight into the
+    response, without pydantic validation.
+    """
+
+    original_text: str
+    quantity: List[str] = field(default_factory=list)
+    drug_name: List[str] = field(default_factory=list)
+    dosage: List[str] = field(default_factory=list)
+    administration_type: List[str] = field(default_factory=list)
+    brand: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(
+        cls, data: Dict[str, Any], original_text: str
+    ) -> "ExtractedMedication":
+        """Build from parsed LLM output or a stored payload"""
+        return cls(
+            original_text, *(_as_strings(data.get(name)) for name in ENTITY_FIELDS)
+        )
+
+
+@dataclass(slots=True)
+class ExtractionResult:
+    """Internal form of ``MedicationResponse``"""
+
+    results: List[ExtractedMedication]
+    processing_time: float
+    degraded: List[str] = field(default_factory=list)
@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+from haystack.dataclasses import Document
+from app.core.monitoring.metrics import metrics
+from app.config.settings import settings
+
+
+RETRIEVAL_CACHE_REQUESTS = metrics.counter(
+    "retrieval_cache_requests", "Retrieval cache lookups by result", ["result"]
+)
+RETRIEVAL_CACHE_HIT_RATIO = metrics.gauge(
+    "retrieval_cache_hit_ratio", "Share of retrieval cache lookups that hit"
+)
+RETRIEVAL_CACHE_SAVED_SECONDS = metrics.counter(
+    "retrieval_cache_saved_seconds",
+    "Embedding, retrieval and reranking time saved by cache hits",
+)
+RETRIEVAL_CACHE_ENTRIES = metrics.gauge(
+    "retrieval_cache_entries", "Texts held by the retrieval cache"
+)
+
+
+class RetrievalCache:
+    """LRU cache of the reranked documents retrieved for a text.
+
+    Retrieval and reranking are deterministic for a fixed index, so an entry
+    holds the ids and scores of the reranked documents together with the time it
+    took to compute them. Entries are only valid for the index version they were
+    computed at, and a lookup at a newer version drops the whole cache. Document
+    contents are kept once per id, without their embeddings.
+
+    Args:
+        max_entries: Texts kept before the least recently used is evicted
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._version = 0
+        self._entries: OrderedDict[str, Tuple[List[Tuple[str, float]], float]] = (
+            OrderedDict()
+        )
+        self._documents: Dict[str, Document] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sync_version(self, version: int) -> bool:
+        """Drop entries of an older index version, False if ``version`` is stale"""
+        if version > self._version:
+            self._version = version
+            self._entries.clear()
+            self._documents.clear()
+            RETRIEVAL_CACHE_ENTRIES.set(0)
+        return version == self._version
+
+    def get(self, text: str, version: int) -> Optional[List[Document]]:
+        with self._lock:
+            entry = self._entries.get(text) if self._sync_version(version) else None
+            if entry is not None:
+                self._entries.move_to_end(text)
+                ranked, seconds = entry
+                documents = [
+                    replace(self._documents[doc_id], score=score)
+                    for doc_id, score in ranked
+                ]
+        RETRIEVAL_CACHE_REQUESTS.inc(result="miss" if entry is None else "hit")
+        hits = RETRIEVAL_CACHE_REQUESTS.value(result="hit")
+        RETRIEVAL_CACHE_HIT_RATIO.set(
+            hits / (hits + RETRIEVAL_CACHE_REQUESTS.value(result="miss"))
+        )
+        if entry is None:
+            return None
+        RETRIEVAL_CACHE_SAVED_SECONDS.inc(seconds)
+        return documents
+
+    def put(
+        self, text: str, version: int, documents: List[Document], seconds: float
+    ) -> None:
+        """Cache the reranked documents of a text and the seconds they took"""
+        with self._lock:
+            if not self._sync_version(version):
+                return
+            for doc in documents:
+                if doc.id not in self._documents:
+                    self._documents[doc.id] = replace(
+                        doc, embedding=None, sparse_embedding=None, score=None
+                    )
+            self._entries[text] = ([(doc.id, doc.score) for doc in documents], seconds)
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            RETRIEVAL_CACHE_ENTRIES.set(len(self._entries))
+
+
+retrieval_cache = (
+    RetrievalCache(settings.RETRIEVAL_CACHE_SIZE)
+    if settings.RETRIEVAL_CACHE_SIZE
+    else None
+)
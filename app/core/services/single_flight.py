@@ -0,0 +1,65 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+def normalize_text(text: str) -> str:
+    """Key of a text for deduplication, ignoring surrounding and repeated spaces"""
+    return " ".join(text.split())
+
+
+class SingleFlight:
+    """Shares one execution between concurrent calls with the same key.
+
+    The first caller of a key starts the work as a task, callers arriving before
+    it finishes await that task instead of starting their own. The task is
+    shielded, so that a leader whose client went away does not cancel the work
+    others are waiting for. Results are not kept once the task is done.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[T]],
+        timeout: Optional[float] = None,
+    ) -> Tuple[T, bool]:
+        """Run ``fn`` unless a call with the same key is in flight
+
+        Args:
+            key: Calls with equal keys share one execution
+            fn: Starts the work when no call with the key is in flight
+            timeout: Seconds a caller joining another's call waits for it, the
+                shared work itself keeps running
+
+        Returns:
+            The result and whether it was shared from another call
+
+        Raises:
+            asyncio.TimeoutError: When the joined call outlasts ``timeout``
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            return await asyncio.wait_for(asyncio.shield(task), timeout), True
+
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+
+        def _forget(done: asyncio.Future) -> None:
+            if self._calls.get(key) is done:
+                del self._calls[key]
+
+        task.add_done_callback(_forget)
+        return await asyncio.shield(task), False
+
+
+# Extractions in flight in this process, shared across requests
+in_flight_extractions = SingleFlight()
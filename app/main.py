@@ -1,11 +1,19 @@
-from fastapi import FastAPI
+import asyncio
+from time import perf_counter
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
-from app.api.endpoints import medication
+from app.api.endpoints import admin, medication
 from app.config.logging import get_logger
 from app.config.settings import settings
-
-from app.core.document_store.initializer import DocumentStoreInitializer
-from app.core.initialization.data_loader import DataLoader
+from app.core.monitoring.metrics import metrics
+from app.core.monitoring.profiler import SlowRequestProfiler
+from app.core.services.admission import (
+    BULK,
+    INTERACTIVE,
+    AdmissionController,
+    LaneLimits,
+)
 
 
 logger = get_logger(__name__)
@@ -15,9 +23,33 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI):
     """Lifecycle manager for FastAPI application"""
     logger.info("Initializing application components...")
+    # Haystack and the model runtimes load here, not when the app is imported
+    from app.core.document_store.initializer import DocumentStoreInitializer
+    from app.core.initialization.data_loader import DataLoader
+    from app.core.pipeline.tracing import configure_pipeline_tracing
+    from app.core.pipeline.models import model_registry, warm_up_models
+    from app.core.pipeline.cpu import configure_cpu, worker_labels
+    from app.core.pipeline.executors import executors
+
+    configure_pipeline_tracing(
+        otel_enabled=settings.OTEL_ENABLED,
+        circuit_breakers_enabled=settings.CIRCUIT_BREAKER_ENABLED,
+    )
+    # Each worker serves only its own metrics
+    metrics.set_constant_labels(**worker_labels())
+    # Model threads are set before the executors are sized and models load
+    configure_cpu()
+    # Thread pools shared by every pipeline, sized next to the model threads
+    executors.start()
+    if settings.PRELOAD_MODELS or model_registry.preloaded:
+        # Load models before serving instead of on the first request
+        await asyncio.to_thread(warm_up_models)
 
     initializer = DocumentStoreInitializer()
     data_loader = DataLoader()
+    slow_request_profiler = getattr(app.state, "slow_request_profiler", None)
+    if slow_request_profiler is not None:
+        slow_request_profiler.start()
 
     try:
         # Test connection to document store
@@ -33,20 +65,90 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         logger.info("Shutting down application...")
+        await initializer.cleanup()
+        # Requests have finished, so this only waits for abandoned pipeline runs
+        await asyncio.to_thread(executors.shutdown)
+        if slow_request_profiler is not None:
+            slow_request_profiler.stop()
+        # Flush records still queued for the enqueued log sinks
+        await logger.complete()
 
 
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    description=settings.PROJECT_DESCRIPTION,
-    lifespan=lifespan,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
-)
+def _add_slow_request_profiling(app: FastAPI, threshold_ms: float) -> None:
+    """Keep sampled profiles of requests slower than ``threshold_ms``"""
+    profiler = SlowRequestProfiler(
+        threshold=threshold_ms / 1000,
+        interval=settings.PROFILE_SAMPLE_INTERVAL_MS / 1000,
+    )
+    app.state.slow_request_profiler = profiler
+
+    @app.middleware("http")
+    async def profile_slow_requests(request: Request, call_next):
+        start = perf_counter()
+        try:
+            return await call_next(request)
+        finally:
+            profiler.record(
+                f"{request.method} {request.url.path}", start, perf_counter()
+            )
+
+
+def _create_admission_controller() -> AdmissionController:
+    return AdmissionController(
+        max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+        limits={
+            INTERACTIVE: LaneLimits(
+                max_depth=settings.ADMISSION_INTERACTIVE_MAX_QUEUE,
+                max_wait=settings.ADMISSION_INTERACTIVE_MAX_WAIT_MS / 1000,
+            ),
+            BULK: LaneLimits(
+                max_depth=settings.ADMISSION_BULK_MAX_QUEUE,
+                max_wait=settings.ADMISSION_BULK_MAX_WAIT_MS / 1000,
+            ),
+        },
+    )
+
+
+def create_app() -> FastAPI:
+    """Build the FastAPI application with its routers and optional admin tooling"""
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        description=settings.PROJECT_DESCRIPTION,
+        lifespan=lifespan,
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    )
+
+    if settings.ADMISSION_MAX_CONCURRENCY:
+        app.state.admission = _create_admission_controller()
+
+    # Include routers
+    app.include_router(
+        medication.router, prefix=settings.API_V1_STR, tags=["Medication"]
+    )
+    if settings.ADMIN_TOKEN:
+        app.include_router(admin.router, prefix="/admin", tags=["Admin"])
+    if settings.PROFILE_SLOW_REQUEST_MS:
+        _add_slow_request_profiling(app, settings.PROFILE_SLOW_REQUEST_MS)
+
+    @app.get("/health", tags=["System"])
+    async def health_check():
+        """Health check endpoint"""
+        return {"status": "healthy", "version": "1.0.0"}
+
+    @app.get("/metrics", tags=["System"], response_class=PlainTextResponse)
+    async def metrics_endpoint():
+        """Prometheus metrics endpoint"""
+        return PlainTextResponse(
+            metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    return app
+
 
-# Include routers
-app.include_router(medication.router, prefix=settings.API_V1_STR, tags=["Medication"])
+app = create_app()
 
+if settings.PRELOAD_MODELS:
+    from app.core.pipeline.models import preload_models
 
-@app.get("/health", tags=["System"])
-async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "version": "1.0.0"}
+    # Under a preloading server this runs once before the workers are forked
+    preload_models()
@@ -1,3 +1,5 @@
+from typing import Any, Dict, List, Tuple
+
 MEDICATION_NER = """
     Given the following examples of medication entities:
 
@@ -21,3 +23,32 @@ MEDICATION_NER = """
     For keys without any values, provide an empty list.
     Respond only with valid JSON. Do not write an introduction or summary.
     """
+
+# Key of the pre-rendered few-shot example stored in the meta of indexed documents
+PROMPT_EXAMPLE_KEY = "prompt_example"
+
+
+def _split(template: str, marker: str) -> Tuple[str, str]:
+    head, found, tail = template.partition(marker)
+    if not found:
+        raise ValueError(f"Prompt template has no {marker!r}")
+    return head, tail
+
+
+# MEDICATION_NER split once around its placeholders, so that prompts are
+# assembled by joining strings instead of rendering the Jinja template
+_PROMPT_HEAD, _rest = _split(MEDICATION_NER, "{% for document in documents %}")
+_EXAMPLE, _rest = _split(_rest, "{% endfor %}")
+_QUERY_HEAD, _QUERY_TAIL = _split(_rest, "{{ query }}")
+_EXAMPLE_HEAD, _example_rest = _split(_EXAMPLE, "{{ document.content }}")
+_EXAMPLE_MIDDLE, _EXAMPLE_TAIL = _split(_example_rest, "{{ document.meta }}")
+
+
+def render_example(content: str, answer: Dict[str, Any]) -> str:
+    """Few-shot example of an indexed medication, as the template renders it"""
+    return f"{_EXAMPLE_HEAD}{content}{_EXAMPLE_MIDDLE}{answer}{_EXAMPLE_TAIL}"
+
+
+def build_prompt(query: str, examples: List[str]) -> str:
+    """Extraction prompt for a query from its rendered few-shot examples"""
+    return "".join((_PROMPT_HEAD, *examples, _QUERY_HEAD, query, _QUERY_TAIL))
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -52,6 +52,12 @@ class MedicationResponse(BaseModel):
         ..., description="List of extracted medication entities"
     )
     processing_time: float = Field(..., description="Total processing time in seconds")
+    degraded: List[str] = Field(
+        default_factory=list,
+        description="Work skipped to meet the request deadline or answered by a "
+        "fallback while a dependency was down, e.g. rerank_skipped, "
+        "deadline_exceeded or llm_fallback_parser",
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -68,6 +74,7 @@ class MedicationResponse(BaseModel):
                         }
                     ],
                     "processing_time": 0.15,
+                    "degraded": [],
                 }
             ]
         }
@@ -80,11 +87,36 @@ class MedicationIndexRequest(BaseModel):
     )
 
 
+class MedicationUpdateRequest(BaseModel):
+    original_text: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        description="New medication text, the medication is re-embedded if it changed",
+    )
+    quantity: Optional[List[str]] = Field(default=None, description="New quantities")
+    drug_name: Optional[List[str]] = Field(default=None, description="New drug names")
+    dosage: Optional[List[str]] = Field(default=None, description="New dosages")
+    administration_type: Optional[List[str]] = Field(
+        default=None, description="New administration types"
+    )
+    brand: Optional[List[str]] = Field(default=None, description="New brands")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{"dosage": ["325 MG"], "brand": ["Tylenol"]}]
+        }
+    }
+
+
 class MedicationIndexResponse(BaseModel):
     message: str = Field(
         ..., description="Message indicating the success or failure of the operation"
     )
     processing_time: float = Field(..., description="Total processing time in seconds")
+    ids: List[str] = Field(
+        default_factory=list,
+        description="Ids of the medications written, used to update or delete them",
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -92,6 +124,7 @@ class MedicationIndexResponse(BaseModel):
                 {
                     "message": "Successfully indexed 1 entity",
                     "processing_time": 0.05,
+                    "ids": ["0b8f3e0e-55a1-5c3c-9a57-2f1d6b3e8c41"],
                 }
             ]
         }
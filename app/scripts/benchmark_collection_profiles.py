@@ -0,0 +1,200 @@
+import json
+import argparse
+import statistics
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from qdrant_client.http import models as rest
+from haystack.dataclasses import Document, SparseEmbedding
+from app.core.document_store.store import PooledQdrantDocumentStore, qdrant_client_pool
+from app.core.document_store.profiles import (
+    COLLECTION_PROFILES,
+    CollectionProfile,
+    get_collection_profile,
+)
+from app.config.settings import settings
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+SPARSE_VOCABULARY = 30_000
+SPARSE_TERMS = 12
+EXACT_SEARCH = rest.SearchParams(
+    exact=True, quantization=rest.QuantizationSearchParams(ignore=True)
+)
+
+
+def _synthetic_corpus(
+    documents: int, queries: int, dim: int, seed: int
+) -> Dict[str, Any]:
+    """Clustered unit vectors, so neighbourhoods look like real embeddings"""
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(max(1, documents // 50), dim))
+
+    def sample(count: int) -> np.ndarray:
+        points = centroids[rng.integers(len(centroids), size=count)]
+        points = points + 0.3 * rng.normal(size=(count, dim))
+        return (points / np.linalg.norm(points, axis=1, keepdims=True)).astype(
+            np.float32
+        )
+
+    def sparse(count: int) -> List[SparseEmbedding]:
+        return [
+            SparseEmbedding(
+                indices=sorted(
+                    rng.choice(SPARSE_VOCABULARY, SPARSE_TERMS, replace=False).tolist()
+                ),
+                values=rng.random(SPARSE_TERMS).tolist(),
+            )
+            for _ in range(count)
+        ]
+
+    return {
+        "dense": sample(documents),
+        "sparse": sparse(documents),
+        "query_dense": sample(queries),
+        "query_sparse": sparse(queries),
+    }
+
+
+def _ram_estimate_mb(profile: CollectionProfile, documents: int, dim: int) -> float:
+    """Approximate RAM taken by dense vectors under a profile"""
+    ram = 0 if profile.on_disk else documents * dim * 4
+    if isinstance(profile.quantization_config, rest.ScalarQuantization):
+        ram += documents * dim
+    elif isinstance(profile.quantization_config, rest.BinaryQuantization):
+        ram += documents * dim / 8
+    return ram / 1024**2
+
+
+def _create_store(
+    profile: CollectionProfile, dim: int, args: argparse.Namespace
+) -> PooledQdrantDocumentStore:
+    return PooledQdrantDocumentStore(
+        location=args.location if not (args.url or args.path) else None,
+        url=args.url,
+        path=args.path,
+        index=f"profile_benchmark_{profile.name}",
+        recreate_index=True,
+        use_sparse_embeddings=True,
+        sparse_idf=True,
+        embedding_dim=dim,
+        progress_bar=False,
+        on_disk=profile.on_disk,
+        on_disk_payload=profile.on_disk_payload,
+        hnsw_config=profile.hnsw_config,
+        quantization_config=profile.quantization_config,
+        search_params=profile.search_params,
+    )
+
+
+def benchmark_profile(
+    profile: CollectionProfile,
+    corpus: Dict[str, Any],
+    top_k: int,
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    """Index the corpus under ``profile`` and measure recall@k and query latency"""
+    documents, dim = corpus["dense"].shape
+    store = _create_store(profile, dim, args)
+
+    start = perf_counter()
+    store.write_documents(
+        [
+            Document(
+                id=str(i),
+                content=f"medication {i}",
+                embedding=corpus["dense"][i].tolist(),
+                sparse_embedding=corpus["sparse"][i],
+            )
+            for i in range(documents)
+        ]
+    )
+    indexing_time = perf_counter() - start
+
+    queries = list(zip(corpus["query_dense"].tolist(), corpus["query_sparse"]))
+    reference = store.query_hybrid_batch(
+        queries, top_k=top_k, search_params=EXACT_SEARCH
+    )
+
+    latencies, recalls = [], []
+    for (dense, sparse), expected in zip(queries, reference):
+        start = perf_counter()
+        found = store._query_hybrid(dense, sparse, top_k=top_k)
+        latencies.append(perf_counter() - start)
+        expected_ids = {doc.id for doc in expected}
+        recalls.append(
+            len(expected_ids & {doc.id for doc in found}) / max(1, len(expected_ids))
+        )
+
+    latencies.sort()
+    return {
+        "profile": profile.name,
+        "documents": documents,
+        "recall_at_k": statistics.fmean(recalls),
+        "latency_p50_ms": latencies[len(latencies) // 2] * 1000,
+        "latency_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "indexing_time_s": indexing_time,
+        "vector_ram_estimate_mb": _ram_estimate_mb(profile, documents, dim),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(
+        description="Recall/latency benchmark for Qdrant collection profiles"
+    )
+    parser.add_argument(
+        "--profiles", nargs="+", default=list(COLLECTION_PROFILES), metavar="PROFILE"
+    )
+    parser.add_argument("--documents", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=settings.RETRIEVER_TOP_K)
+    parser.add_argument("--hnsw-m", type=int, default=None)
+    parser.add_argument("--ef-construct", type=int, default=None)
+    parser.add_argument("--search-ef", type=int, default=None)
+    parser.add_argument("--location", default=":memory:")
+    parser.add_argument("--path", default=None, help="Local on-disk Qdrant mode")
+    parser.add_argument("--url", default=None, help="Benchmark a Qdrant server")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.url:
+        logger.warning(
+            "Local Qdrant mode searches exhaustively and ignores HNSW and "
+            "quantization, use --url to measure their effect on a Qdrant server"
+        )
+
+    corpus = _synthetic_corpus(
+        args.documents, args.queries, settings.QDRANT_EMBEDDING_DIM, args.seed
+    )
+    results = []
+    for name in args.profiles:
+        profile = get_collection_profile(
+            name,
+            hnsw_m=args.hnsw_m,
+            hnsw_ef_construct=args.ef_construct,
+            search_ef=args.search_ef,
+        )
+        result = benchmark_profile(profile, corpus, args.top_k, args)
+        results.append(result)
+        logger.info(
+            f"{name:<8} recall@{args.top_k}={result['recall_at_k']:.3f} "
+            f"p50={result['latency_p50_ms']:.2f}ms "
+            f"p95={result['latency_p95_ms']:.2f}ms "
+            f"index={result['indexing_time_s']:.1f}s "
+            f"vector_ram~{result['vector_ram_estimate_mb']:.1f}MB"
+        )
+
+    qdrant_client_pool.close_all()
+
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import random
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from haystack.dataclasses import Document, SparseEmbedding
+from haystack_integrations.components.retrievers.qdrant import QdrantHybridRetriever
+from app.core.document_store.store import PooledQdrantDocumentStore, qdrant_client_pool
+from app.core.components.batch_retriever import QdrantBatchHybridRetriever
+from app.config.settings import settings
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+SPARSE_VOCABULARY = 30_000
+SPARSE_TERMS = 12
+
+
+def _random_sparse(rng: random.Random) -> SparseEmbedding:
+    indices = sorted(rng.sample(range(SPARSE_VOCABULARY), SPARSE_TERMS))
+    return SparseEmbedding(
+        indices=indices, values=[rng.random() for _ in range(SPARSE_TERMS)]
+    )
+
+
+def _random_dense(rng: random.Random, dim: int) -> List[float]:
+    return [rng.uniform(-1, 1) for _ in range(dim)]
+
+
+def _build_store(documents: int, dim: int, rng: random.Random):
+    """Fill an in-memory Qdrant stand-in with synthetic embedded documents"""
+    store = PooledQdrantDocumentStore(
+        location=":memory:",
+        index="retrieval_benchmark",
+        use_sparse_embeddings=True,
+        sparse_idf=True,
+        embedding_dim=dim,
+        progress_bar=False,
+    )
+    store.write_documents(
+        [
+            Document(
+                id=str(i),
+                content=f"medication {i}",
+                meta={"original_text": f"medication {i}", "drug_name": [f"drug {i}"]},
+                embedding=_random_dense(rng, dim),
+                sparse_embedding=_random_sparse(rng),
+            )
+            for i in range(documents)
+        ]
+    )
+    return store
+
+
+def _time(label: str, queries: int, func: Callable[[], None]) -> float:
+    start = perf_counter()
+    func()
+    elapsed = perf_counter() - start
+    logger.info(
+        f"{label:<32} total={elapsed * 1000:8.1f}ms "
+        f"per_query={elapsed * 1000 / queries:6.3f}ms"
+    )
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Microbenchmark hybrid retrieval against an in-memory Qdrant"
+    )
+    parser.add_argument("--documents", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--top-k", type=int, default=settings.RETRIEVER_TOP_K)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    dim = settings.QDRANT_EMBEDDING_DIM
+    store = _build_store(args.documents, dim, rng)
+    queries: List[Tuple[List[float], SparseEmbedding]] = [
+        (_random_dense(rng, dim), _random_sparse(rng)) for _ in range(args.queries)
+    ]
+
+    def run_single(return_embedding: bool) -> Callable[[], None]:
+        retriever = QdrantHybridRetriever(
+            document_store=store, top_k=args.top_k, return_embedding=return_embedding
+        )
+
+        def run() -> None:
+            for dense, sparse in queries:
+                retriever.run(query_embedding=dense, query_sparse_embedding=sparse)
+
+        return run
+
+    def run_batched() -> None:
+        retriever = QdrantBatchHybridRetriever(document_store=store, top_k=args.top_k)
+        for offset in range(0, len(queries), args.batch_size):
+            batch = queries[offset : offset + args.batch_size]
+            retriever.run(
+                query_embeddings=[dense for dense, _ in batch],
+                query_sparse_embeddings=[sparse for _, sparse in batch],
+            )
+
+    logger.info(
+        f"Retrieval benchmark: {args.documents} documents, {args.queries} queries, "
+        f"top_k={args.top_k}, dim={dim}"
+    )
+    baseline = _time("single, with vectors", args.queries, run_single(True))
+    _time("single, payload only", args.queries, run_single(False))
+    batched = _time(
+        f"batched ({args.batch_size}), payload only", args.queries, run_batched
+    )
+    logger.info(f"Batched speed-up over baseline: {baseline / batched:.2f}x")
+
+    qdrant_client_pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
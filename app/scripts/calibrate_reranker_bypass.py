@@ -0,0 +1,151 @@
+import json
+import asyncio
+import argparse
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from app.core.components.adaptive_ranker import AdaptiveRanker, RetrievalMarginPolicy
+from app.core.document_store.registry import document_store_registry
+from app.core.evaluation.candidates import retrieve_candidates, shares_drug_name
+from app.core.initialization.data_loader import DataLoader
+from app.core.pipeline.factory import PipelineFactory
+from app.config.settings import settings
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def sweep_thresholds(
+    margins: Sequence[float],
+    exact_matches: Sequence[bool],
+    rerank_hits: Sequence[bool],
+    retrieval_hits: Sequence[bool],
+    rerank_seconds: Sequence[float],
+    thresholds: Sequence[float],
+) -> List[Dict[str, Any]]:
+    """Skip rate, saved rerank time and accuracy change for each margin threshold.
+
+    Args:
+        margins: Relative fused-score margin of each query
+        exact_matches: Whether the top hit of each query is an exact match
+        rerank_hits: Whether each query is answered correctly after reranking
+        retrieval_hits: Whether each query is answered correctly in retrieval order
+        rerank_seconds: Cross-encoder latency of each query
+        thresholds: Margin thresholds to evaluate
+
+    Returns:
+        One result per threshold
+    """
+    margins = np.asarray(margins, dtype=float)
+    exact_matches = np.asarray(exact_matches, dtype=bool)
+    rerank_hits = np.asarray(rerank_hits, dtype=bool)
+    retrieval_hits = np.asarray(retrieval_hits, dtype=bool)
+    rerank_seconds = np.asarray(rerank_seconds, dtype=float)
+    baseline_accuracy = float(rerank_hits.mean()) if len(rerank_hits) else 0.0
+    total_seconds = float(rerank_seconds.sum()) or 1.0
+
+    results = []
+    for threshold in thresholds:
+        skipped = exact_matches | (margins >= threshold)
+        hits = np.where(skipped, retrieval_hits, rerank_hits)
+        accuracy = float(hits.mean()) if len(hits) else 0.0
+        results.append(
+            {
+                "margin": float(threshold),
+                "skip_rate": float(skipped.mean()) if len(skipped) else 0.0,
+                "saved_latency_ms": float(rerank_seconds[skipped].sum()) * 1000,
+                "saved_latency_share": float(rerank_seconds[skipped].sum())
+                / total_seconds,
+                "accuracy": accuracy,
+                "accuracy_change": accuracy - baseline_accuracy,
+            }
+        )
+    return results
+
+
+def recommend(
+    results: List[Dict[str, Any]], max_accuracy_drop: float
+) -> Optional[Dict[str, Any]]:
+    """Threshold with the highest skip rate within the allowed accuracy drop"""
+    eligible = [r for r in results if r["accuracy_change"] >= -max_accuracy_drop]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda r: (r["skip_rate"], -r["margin"]))
+
+
+async def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(
+        description="Calibrate the reranker bypass margin on the evaluation dataset"
+    )
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        default=[round(t, 2) for t in np.arange(0.05, 1.0, 0.05)],
+    )
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.0)
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    eval_data = DataLoader().load_eval_data()[: args.limit]
+    pipeline_factory = PipelineFactory()
+    try:
+        candidates = await retrieve_candidates(eval_data, pipeline_factory)
+        reranker = pipeline_factory._create_reranker()
+    finally:
+        document_store_registry.close()
+    if isinstance(reranker, AdaptiveRanker):
+        reranker = reranker.ranker
+
+    margins, exact_matches, rerank_hits, retrieval_hits, rerank_seconds = (
+        [] for _ in range(5)
+    )
+    top_k = settings.RERANKER_TOP_K
+    for item, documents in zip(eval_data, candidates):
+        start = perf_counter()
+        reranked = reranker.run(
+            query=item.original_text, documents=documents, top_k=top_k
+        )["documents"]
+        rerank_seconds.append(perf_counter() - start)
+        margins.append(RetrievalMarginPolicy.relative_margin(documents))
+        exact_matches.append(
+            settings.RERANKER_SKIP_EXACT_MATCH
+            and RetrievalMarginPolicy.is_exact_match(item.original_text, documents)
+        )
+        rerank_hits.append(shares_drug_name(item, reranked))
+        retrieval_hits.append(shares_drug_name(item, documents[:top_k]))
+
+    results = sweep_thresholds(
+        margins,
+        exact_matches,
+        rerank_hits,
+        retrieval_hits,
+        rerank_seconds,
+        args.thresholds,
+    )
+    for result in results:
+        logger.info(
+            f"margin={result['margin']:.2f} skip_rate={result['skip_rate']:.3f} "
+            f"saved={result['saved_latency_ms']:.1f}ms "
+            f"({result['saved_latency_share']:.1%}) "
+            f"accuracy={result['accuracy']:.3f} "
+            f"change={result['accuracy_change']:+.3f}"
+        )
+
+    best = recommend(results, args.max_accuracy_drop)
+    if best is None:
+        logger.warning("No threshold keeps accuracy within the allowed drop")
+    else:
+        logger.success(f"Recommended RERANKER_SKIP_MARGIN = {best['margin']:.2f}")
+
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as f:
+            json.dump({"thresholds": results, "recommended": best}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
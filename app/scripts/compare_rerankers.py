@@ -0,0 +1,123 @@
+import json
+import asyncio
+import argparse
+import statistics
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from haystack.dataclasses import Document
+from haystack.components.rankers import TransformersSimilarityRanker
+from app.core.components.onnx_ranker import OnnxCrossEncoderRanker
+from app.core.document_store.registry import document_store_registry
+from app.core.initialization.data_loader import DataLoader
+from app.core.evaluation.candidates import retrieve_candidates, shares_drug_name
+from app.core.pipeline.factory import PipelineFactory
+from app.schemas.medication import MedicationEntity
+from app.config.settings import settings
+from app.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def _create_rankers(args: argparse.Namespace) -> Dict[str, Any]:
+    onnx_kwargs = {
+        "model": settings.RERANKER_MODEL,
+        "top_k": args.top_k,
+        "batch_size": args.batch_size,
+        "max_length": args.max_length,
+        "threads": args.threads,
+        "cache_dir": settings.RERANKER_ONNX_DIR,
+    }
+    rankers = {
+        "transformers": TransformersSimilarityRanker(
+            model=settings.RERANKER_MODEL, top_k=args.top_k
+        ),
+        "onnx-fp32": OnnxCrossEncoderRanker(quantize=False, **onnx_kwargs),
+        "onnx-int8": OnnxCrossEncoderRanker(quantize=True, **onnx_kwargs),
+    }
+    for ranker in rankers.values():
+        ranker.warm_up()
+    return rankers
+
+
+def compare(
+    rankers: Dict[str, Any],
+    eval_data: List[MedicationEntity],
+    candidates: List[List[Document]],
+    repeat: int = 1,
+) -> List[Dict[str, Any]]:
+    """Measure latency, hit rate and top-1 agreement of each ranker"""
+    rankings: Dict[str, List[List[str]]] = {}
+    results = []
+    for name, ranker in rankers.items():
+        latencies, hits, ranking = [], 0, []
+        for item, documents in zip(eval_data, candidates):
+            for _ in range(repeat):
+                start = perf_counter()
+                ranked = ranker.run(query=item.original_text, documents=documents)
+                latencies.append(perf_counter() - start)
+            ranked = ranked["documents"]
+            hits += shares_drug_name(item, ranked)
+            ranking.append([doc.id for doc in ranked])
+        rankings[name] = ranking
+
+        latencies.sort()
+        results.append(
+            {
+                "ranker": name,
+                "queries": len(eval_data),
+                "hit_rate": hits / max(1, len(eval_data)),
+                "latency_mean_ms": statistics.fmean(latencies) * 1000,
+                "latency_p50_ms": latencies[len(latencies) // 2] * 1000,
+                "latency_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+            }
+        )
+
+    reference = next(iter(rankings.values()))
+    for result in results:
+        agreement = [
+            bool(ours) and bool(ref) and ours[0] == ref[0]
+            for ours, ref in zip(rankings[result["ranker"]], reference)
+        ]
+        result["top1_agreement"] = sum(agreement) / max(1, len(agreement))
+    return results
+
+
+async def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(
+        description="Compare PyTorch and ONNX rerankers on the evaluation dataset"
+    )
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--top-k", type=int, default=settings.RERANKER_TOP_K)
+    parser.add_argument("--batch-size", type=int, default=settings.RERANKER_BATCH_SIZE)
+    parser.add_argument("--max-length", type=int, default=settings.RERANKER_MAX_LENGTH)
+    parser.add_argument("--threads", type=int, default=settings.RERANKER_THREADS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    eval_data = DataLoader().load_eval_data()[: args.limit]
+    try:
+        candidates = await retrieve_candidates(eval_data, PipelineFactory())
+        results = compare(_create_rankers(args), eval_data, candidates, args.repeat)
+    finally:
+        document_store_registry.close()
+
+    for result in results:
+        logger.info(
+            f"{result['ranker']:<12} hit_rate={result['hit_rate']:.3f} "
+            f"top1_agreement={result['top1_agreement']:.3f} "
+            f"mean={result['latency_mean_ms']:.2f}ms "
+            f"p50={result['latency_p50_ms']:.2f}ms "
+            f"p95={result['latency_p95_ms']:.2f}ms"
+        )
+
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
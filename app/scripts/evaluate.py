@@ -1,24 +1,92 @@
 import asyncio
+import argparse
+from pathlib import Path
+from typing import List, Optional
 from app.core.initialization.data_loader import DataLoader
-from app.core.evaluation.evaluator import Evaluator
+from app.core.evaluation.evaluator import Evaluator, EvaluationOutput
+from app.core.evaluation.report import write_report
+from app.core.document_store.registry import document_store_registry
 from app.config.logging import get_logger
 
 
 logger = get_logger(__name__)
 
 
-async def main() -> None:
+def _score(value: Optional[float]) -> str:
+    """Score with three decimals, n/a when the evaluation failed to compute it"""
+    return "n/a" if value is None else f"{value:.3f}"
+
+
+def log_summary(result: EvaluationOutput) -> None:
+    """Log the overall, per-field, latency and token results of a run"""
+    logger.info(
+        f"Evaluation Result: exact_match={_score(result.accuracy)} "
+        f"precision={_score(result.precision)} recall={_score(result.recall)} "
+        f"f1={_score(result.f1_score)} failures={result.failures}/{result.items}"
+    )
+    for field, metrics in result.fields.items():
+        logger.info(
+            f"{field:<20} P={_score(metrics.precision)} R={_score(metrics.recall)} "
+            f"F1={_score(metrics.f1_score)}"
+        )
+    for stage, latency in result.latency.items():
+        logger.info(
+            f"{stage:<20} p50={latency.p50_ms:.1f}ms p95={latency.p95_ms:.1f}ms "
+            f"p99={latency.p99_ms:.1f}ms"
+        )
+    logger.info(f"Tokens in={result.tokens.tokens_in} out={result.tokens.tokens_out}")
+
+
+async def main(argv: Optional[List[str]] = None) -> EvaluationOutput:
+    parser = argparse.ArgumentParser(
+        description="Evaluate medication entity extraction on the evaluation dataset"
+    )
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Evaluate the first N items only"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Items evaluated concurrently"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip items already recorded in the results file",
+    )
+    parser.add_argument("--results", default="eval_cache/results.jsonl")
+    parser.add_argument("--llm-cache", default="eval_cache/llm_cache.jsonl")
+    parser.add_argument(
+        "--no-llm-cache", action="store_true", help="Always call the LLM"
+    )
+    parser.add_argument(
+        "--report",
+        default=None,
+        help="Write the full report, as HTML for .html paths and JSON otherwise",
+    )
+    args = parser.parse_args(argv)
+
     # Load evaluation data
     data_loader = DataLoader()
-    eval_data = data_loader.load_eval_data()
+    eval_data = data_loader.load_eval_data()[: args.limit]
 
     # Initialize evaluator
-    evaluator = Evaluator()
+    evaluator = Evaluator(
+        workers=args.workers,
+        llm_cache_path=None if args.no_llm_cache else Path(args.llm_cache),
+        results_path=Path(args.results),
+    )
 
     # Evaluate the model
-    result = await evaluator.run(eval_data[:10])
+    try:
+        result = await evaluator.run(eval_data, resume=args.resume)
+    finally:
+        document_store_registry.close()
+
+    log_summary(result)
 
-    logger.info(f"Evaluation Result: {result}")
+    if args.report:
+        write_report(result.model_dump(), Path(args.report))
+        logger.info(f"Evaluation report written to {args.report}")
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+import os
+import sys
+import signal
+import socket
+import time
+import argparse
+from typing import Dict, List, Optional
+
+import uvicorn
+
+from app.config.settings import settings
+from app.config.logging import configure_logging, get_logger
+from app.core.pipeline.cpu import WORKER_COUNT_ENV, WORKER_SLOT_ENV
+
+
+logger = get_logger(__name__)
+
+
+def _bind(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Listening socket created once and inherited by every worker"""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(sock: socket.socket) -> None:
+    """Serve the preloaded application on the inherited socket"""
+    from app.main import app
+
+    # The log writer threads of the parent do not exist after the fork
+    configure_logging()
+
+    config = uvicorn.Config(app, log_config=None, timeout_graceful_shutdown=30)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class PreforkServer:
+    """Loads the models once, then forks workers that share them copy-on-write.
+
+    ``uvicorn --workers`` spawns fresh interpreters, each loading its own copy
+    of every model. Here the parent imports the application with its models
+    preloaded and forks the workers, restarting any that die.
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on
+        workers: Number of worker processes
+    """
+
+    def __init__(self, host: str, port: int, workers: int):
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self._children: Dict[int, int] = {}
+        self._stopping = False
+
+    def _spawn(self, sock: socket.socket, slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            # Workers stop on the signals the parent relays, as uvicorn handles them
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, signal.SIG_DFL)
+            # Lets the worker take its own share of the cores
+            os.environ[WORKER_SLOT_ENV] = str(slot)
+            os.environ[WORKER_COUNT_ENV] = str(self.workers)
+            code = 0
+            try:
+                _run_worker(sock)
+            except BaseException:
+                logger.exception(f"Worker {slot} failed")
+                code = 1
+            finally:
+                os._exit(code)
+        self._children[pid] = slot
+        logger.info(f"Started worker {slot} (pid {pid})")
+
+    def _stop(self, signum: int, frame) -> None:
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        # Models load here, in the parent, before any worker exists. Workers still
+        # warm their ONNX Runtime sessions in the lifespan, before serving.
+        import app.main  # noqa: F401
+        from app.core.pipeline.models import preload_models
+
+        preload_models()
+        sock = _bind(self.host, self.port)
+        logger.info(
+            f"Serving on {self.host}:{self.port} with {self.workers} preforked workers"
+        )
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for slot in range(self.workers):
+            self._spawn(sock, slot)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            slot = self._children.pop(pid, None)
+            if slot is None:
+                continue
+            if not self._stopping:
+                logger.warning(
+                    f"Worker {slot} (pid {pid}) exited with status {status}, restarting"
+                )
+                # Avoid a fork loop when workers fail right away
+                time.sleep(1)
+                self._spawn(sock, slot)
+        sock.close()
+        logger.info("All workers stopped")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve the API from workers forked after loading the models"
+    )
+    parser.add_argument("--host", default=settings.FASTAPI_HOST)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.FASTAPI_WORKERS)
+    args = parser.parse_args(argv)
+
+    if sys.platform == "win32":
+        raise SystemExit("Preforking requires os.fork, use uvicorn --workers instead")
+    PreforkServer(args.host, args.port, args.workers).run()
+
+
+if __name__ == "__main__":
+    main()
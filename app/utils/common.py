@@ -1,18 +1,42 @@
-from typing import List
+import uuid
+from typing import Any, Dict, List
 from haystack.dataclasses import Document
 from app.schemas.medication import MedicationEntity
+from app.prompts.template import PROMPT_EXAMPLE_KEY, render_example
 from app.config.logging import get_logger
 
 
 logger = get_logger(__name__)
 
+MEDICATION_ID_NAMESPACE = uuid.UUID("5d1c7f3e-8a52-4b8e-9b0e-2f6a4c1d9e73")
+
+
+def medication_id(original_text: str) -> str:
+    """Stable id of an indexed medication, derived from its whitespace-normalized text
+
+    Re-indexing the same text overwrites its document instead of adding another,
+    and updating the text moves the document to the id of the new text.
+    """
+    return str(uuid.uuid5(MEDICATION_ID_NAMESPACE, " ".join(original_text.split())))
+
+
+def medication_meta(med: MedicationEntity) -> Dict[str, Any]:
+    """Meta of an indexed medication, with its few-shot example pre-rendered"""
+    meta = med.model_dump()
+    meta[PROMPT_EXAMPLE_KEY] = render_example(med.original_text, med.model_dump())
+    return meta
+
 
 def create_index_documents(medications: List[MedicationEntity]) -> List[Document]:
     """Creates Haystack Document-formatted medication data for indexing."""
     try:
         return [
-            Document(id=str(index), content=med.original_text, meta=med)
-            for index, med in enumerate(medications)
+            Document(
+                id=medication_id(med.original_text),
+                content=med.original_text,
+                meta=medication_meta(med),
+            )
+            for med in medications
         ]
     except Exception as e:
         logger.error(f"Error converting medications to Documents: {str(e)}")
@@ -0,0 +1,29 @@
+import json
+from typing import Any, Union
+
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode to compact UTF-8 JSON with pydantic's Rust encoder
+
+    Dataclasses, including slotted ones, and pydantic models are supported.
+    """
+    return to_json(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON, raising ``json.JSONDecodeError`` on invalid input"""
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded by ``dumps``, skipping FastAPI's own encoding pass
+
+    Returned as is by an endpoint, its content is not validated against the
+    endpoint's response model, so it must already have the documented shape.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
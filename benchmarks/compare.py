@@ -0,0 +1,104 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# Metrics where a larger value is an improvement, everything else is a cost
+HIGHER_IS_BETTER = (".rps",)
+
+
+def _load(path: Path) -> Dict[str, float]:
+    return json.loads(path.read_text(encoding="utf-8"))["metrics"]
+
+
+def compare(
+    baseline: Dict[str, float],
+    current: Dict[str, float],
+    tolerance: float,
+    thresholds: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """Relative change of every metric in both runs and whether it regressed.
+
+    Args:
+        baseline: Metrics of the reference run
+        current: Metrics of the run being checked
+        tolerance: Allowed relative worsening, e.g. 0.2 for 20%
+        thresholds: Per-metric tolerances overriding ``tolerance``
+
+    Returns:
+        One row per metric present in both runs
+    """
+    thresholds = thresholds or {}
+    rows = []
+    for name in sorted(baseline.keys() & current.keys()):
+        base, value = baseline[name], current[name]
+        change = (value - base) / base if base else 0.0
+        higher_is_better = name.endswith(HIGHER_IS_BETTER)
+        worsening = -change if higher_is_better else change
+        allowed = thresholds.get(name, tolerance)
+        rows.append(
+            {
+                "metric": name,
+                "baseline": base,
+                "current": value,
+                "change": change,
+                "allowed": allowed,
+                "regressed": worsening > allowed,
+            }
+        )
+    return rows
+
+
+def _parse_thresholds(values: List[str]) -> Dict[str, float]:
+    thresholds = {}
+    for value in values:
+        name, _, limit = value.partition("=")
+        if not limit:
+            raise argparse.ArgumentTypeError(f"Expected METRIC=TOLERANCE, got {value}")
+        thresholds[name] = float(limit)
+    return thresholds
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare benchmark results against a baseline"
+    )
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument(
+        "current", type=Path, nargs="?", default=Path("benchmarks/results/latest.json")
+    )
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--threshold",
+        action="append",
+        default=[],
+        metavar="METRIC=TOLERANCE",
+        help="Per-metric tolerance, e.g. stage.rerank.p95_ms=0.5",
+    )
+    args = parser.parse_args(argv)
+
+    rows = compare(
+        _load(args.baseline),
+        _load(args.current),
+        args.tolerance,
+        _parse_thresholds(args.threshold),
+    )
+    for row in rows:
+        status = "REGRESSED" if row["regressed"] else "ok"
+        print(
+            f"{row['metric']:<40} {row['baseline']:12.3f} -> {row['current']:12.3f} "
+            f"({row['change']:+7.1%}, allowed {row['allowed']:.0%}) {status}"
+        )
+
+    regressions = [row["metric"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed: {', '.join(regressions)}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import re
+import json
+import threading
+from time import sleep
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+# The rule-based fallback parser of the service stands in for the LLM
+from app.core.services.fallback import parse_medication as extract_entities
+
+
+QUERY_PATTERN = re.compile(
+    r"extract the medication entities from the following text:\s*(.*?)\s*"
+    r"Provide the output",
+    re.DOTALL,
+)
+
+
+class FakeOllamaServer:
+    """Minimal Ollama HTTP API answering ``/api/generate`` deterministically.
+
+    Args:
+        latency: Seconds to sleep before every generate response
+        host: Interface to bind
+        port: Port to bind, 0 picks a free one
+        parallel: Generations running at once, like ``OLLAMA_NUM_PARALLEL``;
+            further requests queue. Unlimited when None
+
+    Set ``error_status`` to inject faults: generate requests are then answered
+    with that HTTP status until it is reset to None.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        parallel: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.requests = 0
+        self.error_status: Optional[int] = None
+        self._slots = threading.BoundedSemaphore(parallel) if parallel else None
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: Dict[str, Any]) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send(200, {"models": []})
+                else:
+                    self._send(200, {"status": "Ollama is running"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if self.path != "/api/generate":
+                    self._send(404, {"error": f"unsupported path {self.path}"})
+                    return
+                if server.error_status is not None:
+                    server.requests += 1
+                    self._send(server.error_status, {"error": "injected fault"})
+                    return
+                self._send(200, server.generate(request))
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-ollama", daemon=True
+        )
+
+    @property
+    def host(self) -> str:
+        return f"http://{self._httpd.server_address[0]}"
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def generate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests += 1
+        if self.latency:
+            if self._slots is not None:
+                with self._slots:
+                    sleep(self.latency)
+            else:
+                sleep(self.latency)
+        prompt = request.get("prompt", "")
+        match = QUERY_PATTERN.search(prompt)
+        reply = json.dumps(extract_entities(match.group(1) if match else prompt))
+        return {
+            "model": request.get("model", "fake"),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "response": reply,
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int(self.latency * 1e9),
+            "prompt_eval_count": len(prompt.split()),
+            "eval_count": len(reply.split()),
+        }
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
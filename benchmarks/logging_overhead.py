@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# name -> configure_logging arguments, None meaning no sinks at all
+CONFIGURATIONS: Dict[str, Optional[Dict[str, Any]]] = {
+    "none": None,
+    "info": {"level": "INFO", "file_level": "INFO", "enqueue": False},
+    "info_enqueued": {"level": "INFO", "file_level": "INFO", "enqueue": True},
+    "debug": {"level": "INFO", "file_level": "DEBUG", "enqueue": False},
+    "debug_enqueued": {"level": "INFO", "file_level": "DEBUG", "enqueue": True},
+    "debug_enqueued_json": {
+        "level": "INFO",
+        "file_level": "DEBUG",
+        "enqueue": True,
+        "json": True,
+    },
+    "debug_sampled": {
+        "level": "INFO",
+        "file_level": "DEBUG",
+        "enqueue": True,
+        "debug_sample_rate": 0.1,
+    },
+}
+
+
+class _InstantPipelineService:
+    """Pipeline stand-in so only the service's own work, logging included, is timed"""
+
+    REPLY = {
+        "llm": {
+            "replies": [
+                '{"quantity": [], "drug_name": ["Aspirin"], "dosage": ["81 MG"], '
+                '"administration_type": ["Oral Tablet"], "brand": []}'
+            ]
+        }
+    }
+
+    async def execute_query_pipeline(self, text: str) -> Dict[str, Any]:
+        return self.REPLY
+
+
+async def _time_requests(requests: int, texts: List[str]) -> float:
+    from app.core.services.medication import MedicationService
+
+    service = MedicationService(_InstantPipelineService())
+    start = perf_counter()
+    for _ in range(requests):
+        await service.extract_entities(texts)
+    return (perf_counter() - start) / requests
+
+
+def _configure(name: str, log_dir: Path) -> None:
+    from loguru import logger
+    from app.config.logging import configure_logging
+
+    options = CONFIGURATIONS[name]
+    if options is None:
+        logger.remove()
+        return
+    # Console output goes to /dev/null, the file sink to a scratch directory
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        configure_logging(log_dir=log_dir, **options)
+    finally:
+        sys.stdout = stdout
+
+
+async def run(args: argparse.Namespace) -> Dict[str, float]:
+    load_dotenv(ROOT / ".env")
+    load_dotenv(ROOT / ".env.sample")
+    from loguru import logger
+
+    texts = ["Aspirin 81 MG Oral Tablet"] * args.texts
+    results = {}
+    with tempfile.TemporaryDirectory() as log_dir:
+        for name in CONFIGURATIONS:
+            _configure(name, Path(log_dir))
+            await _time_requests(max(1, args.requests // 10), texts)
+            results[name] = await _time_requests(args.requests, texts) * 1e6
+            await logger.complete()
+        logger.remove()
+
+    return {
+        f"logging.{name}.overhead_us": per_request - results["none"]
+        for name, per_request in results.items()
+        if name != "none"
+    } | {"logging.none.request_us": results["none"]}
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(
+        description="Per-request logging overhead of entity extraction"
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--texts", type=int, default=5, help="Texts per request")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args))
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"metrics": result}, indent=2), encoding="utf-8")
+    for name, value in sorted(result.items()):
+        print(f"{name:<45} {value:12.1f}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
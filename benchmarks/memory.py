@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.run import ROOT, _configure_environment
+
+
+def _children(pid: int) -> List[int]:
+    pids = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        children = (task / "children").read_text().split()
+        pids.extend(int(child) for child in children)
+    return pids
+
+
+def _process_tree(pid: int) -> List[int]:
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(_children(current))
+    return tree
+
+
+def _memory_mb(pid: int) -> Dict[str, float]:
+    """Resident and proportional set size of a process, in megabytes.
+
+    PSS divides shared pages between the processes mapping them, so summed over
+    the workers it is the memory the server actually occupies.
+    """
+    usage = {"rss": 0.0, "pss": 0.0}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        name, _, value = line.partition(":")
+        if name in ("Rss", "Pss"):
+            usage[name.lower()] = int(value.split()[0]) / 1024
+    return usage
+
+
+def _command(mode: str, workers: int, port: int) -> List[str]:
+    server = (
+        ["-m", "app.serve"] if mode == "prefork" else ["-m", "uvicorn", "app.main:app"]
+    )
+    return [sys.executable, *server] + [
+        "--workers",
+        str(workers),
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+    ]
+
+
+def measure(mode: str, workers: int, port: int, requests: int) -> Dict[str, float]:
+    """Start the server, send some traffic and sum the memory of its processes"""
+    server = subprocess.Popen(_command(mode, workers, port), cwd=ROOT)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            deadline = time.monotonic() + 600
+            while True:
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"{mode} server with {workers} workers failed")
+                try:
+                    if client.get("/health").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                time.sleep(1)
+
+            # Spread enough requests over the workers for each to load its models
+            for i in range(requests):
+                client.post(
+                    "/api/v1/extract", json={"texts": [f"Aspirin {i} MG Oral Tablet"]}
+                ).raise_for_status()
+
+        processes = _process_tree(server.pid)
+        usage = [_memory_mb(pid) for pid in processes]
+        return {
+            f"memory.{mode}.w{workers}.rss_mb": sum(u["rss"] for u in usage),
+            f"memory.{mode}.w{workers}.pss_mb": sum(u["pss"] for u in usage),
+        }
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(
+        description="Total server memory for uvicorn and preforked workers"
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["uvicorn", "prefork"],
+        default=["uvicorn", "prefork"],
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests-per-worker", type=int, default=8)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    if not Path("/proc/self/smaps_rollup").exists():
+        raise SystemExit("Measuring shared memory requires Linux /proc")
+
+    metrics: Dict[str, float] = {}
+    with FakeOllamaServer() as ollama:
+        _configure_environment(ollama)
+        # Qdrant runs in memory in each worker, so the benchmark is self-contained
+        os.environ["PRELOAD_MODELS"] = "true"
+        for mode in args.modes:
+            for workers in args.workers:
+                metrics.update(
+                    measure(
+                        mode, workers, args.port, workers * args.requests_per_worker
+                    )
+                )
+
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"metrics": metrics}, indent=2), encoding="utf-8")
+    for name, value in sorted(metrics.items()):
+        print(f"{name:<40} {value:12.1f}")
+    return metrics
+
+
+if __name__ == "__main__":
+    main()
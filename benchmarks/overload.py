@@ -0,0 +1,125 @@
+import json
+import random
+import asyncio
+import argparse
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.run import _configure_environment, _percentile
+
+
+async def _offered_load(
+    app, queries: List[str], rate: float, duration: float, bulk_fraction: float
+) -> Dict[str, List[float]]:
+    """Send requests at a fixed arrival rate, whatever the server keeps up with.
+
+    Returns latencies by outcome: ``ok``, ``shed`` (429 or 503) and ``error``.
+    """
+    import httpx
+    from app.config.settings import settings
+
+    rng = random.Random(0)
+    outcomes: Dict[str, List[float]] = {"ok": [], "shed": [], "error": []}
+
+    async def extract(texts: List[str]) -> None:
+        start = perf_counter()
+        try:
+            response = await client.post(
+                f"{settings.API_V1_STR}/extract", json={"texts": texts}
+            )
+            status = response.status_code
+        except httpx.HTTPError:
+            status = None
+        outcome = "ok" if status == 200 else "shed" if status in (429, 503) else "error"
+        outcomes[outcome].append(perf_counter() - start)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark", timeout=None
+    ) as client:
+        tasks = []
+        for i in range(int(rate * duration)):
+            size = 10 if rng.random() < bulk_fraction else 1
+            texts = [queries[(i + j) % len(queries)] for j in range(size)]
+            tasks.append(asyncio.create_task(extract(texts)))
+            await asyncio.sleep(1 / rate)
+        await asyncio.gather(*tasks)
+    return outcomes
+
+
+async def measure(args: argparse.Namespace, admission: bool) -> Dict[str, float]:
+    from app.main import create_app
+    from app.config.settings import settings
+    from app.core.initialization.data_loader import DataLoader
+
+    max_concurrency = settings.ADMISSION_MAX_CONCURRENCY
+    if not admission:
+        settings.ADMISSION_MAX_CONCURRENCY = None
+    try:
+        app = create_app()
+    finally:
+        settings.ADMISSION_MAX_CONCURRENCY = max_concurrency
+    queries = [item.original_text for item in DataLoader().load_eval_data()]
+
+    async with app.router.lifespan_context(app):
+        outcomes = await _offered_load(
+            app, queries, args.rate, args.duration, args.bulk_fraction
+        )
+
+    total = sum(len(latencies) for latencies in outcomes.values())
+    mode = "admission" if admission else "unbounded"
+    ok = outcomes["ok"] or [0.0]
+    return {
+        f"overload.{mode}.ok_ratio": len(outcomes["ok"]) / total,
+        f"overload.{mode}.shed_ratio": len(outcomes["shed"]) / total,
+        f"overload.{mode}.ok_p50_ms": _percentile(ok, 0.50) * 1000,
+        f"overload.{mode}.ok_p99_ms": _percentile(ok, 0.99) * 1000,
+        f"overload.{mode}.shed_p99_ms": _percentile(outcomes["shed"] or [0.0], 0.99)
+        * 1000,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(
+        description="Latency of /extract under more load than the LLM can serve"
+    )
+    parser.add_argument("--rate", type=float, default=40.0, help="Requests/second")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds")
+    parser.add_argument("--bulk-fraction", type=float, default=0.2)
+    parser.add_argument("--llm-latency-ms", type=float, default=100.0)
+    parser.add_argument(
+        "--llm-parallel",
+        type=int,
+        default=2,
+        help="Generations the fake Ollama server runs at once",
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["admission", "unbounded"],
+        default=["admission", "unbounded"],
+    )
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    metrics: Dict[str, float] = {}
+    with FakeOllamaServer(
+        latency=args.llm_latency_ms / 1000, parallel=args.llm_parallel
+    ) as ollama:
+        _configure_environment(ollama)
+        for mode in args.modes:
+            metrics.update(asyncio.run(measure(args, mode == "admission")))
+
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"metrics": metrics}, indent=2), encoding="utf-8")
+    for name, value in sorted(metrics.items()):
+        print(f"{name:<40} {value:12.3f}")
+    return metrics
+
+
+if __name__ == "__main__":
+    main()
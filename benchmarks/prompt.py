@@ -0,0 +1,78 @@
+import json
+import argparse
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _documents(count: int):
+    from app.schemas.medication import MedicationEntity
+    from app.utils.common import create_index_documents
+
+    return create_index_documents(
+        [
+            MedicationEntity(
+                original_text=f"medroxyprogesterone acetate {i} MG/ML Injection",
+                quantity=["1 ML"],
+                drug_name=["medroxyprogesterone acetate"],
+                dosage=[f"{i} MG/ML"],
+                administration_type=["Injection"],
+            )
+            for i in range(count)
+        ]
+    )
+
+
+def run(args: argparse.Namespace) -> Dict[str, float]:
+    from haystack.components.builders import PromptBuilder
+    from app.core.components.prompt_builder import MedicationPromptBuilder
+    from app.prompts.template import MEDICATION_NER
+
+    documents = _documents(args.documents)
+    query = "Ibuprofen 200 MG Oral Capsule"
+    jinja = PromptBuilder(template=MEDICATION_NER)
+    joined = MedicationPromptBuilder()
+    builders: Dict[str, Callable[[], Any]] = {
+        # Previously every pipeline, so every request, compiled the template
+        "jinja_per_pipeline": lambda: PromptBuilder(template=MEDICATION_NER).run(
+            query=query, documents=documents
+        ),
+        "jinja_compiled": lambda: jinja.run(query=query, documents=documents),
+        "joined": lambda: joined.run(query=query, documents=documents),
+    }
+
+    results = {}
+    for name, build in builders.items():
+        build()
+        start = perf_counter()
+        for _ in range(args.items):
+            build()
+        results[f"prompt.{name}.per_item_us"] = (
+            (perf_counter() - start) / args.items * 1e6
+        )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(
+        description="Per-item time to build the extraction prompt"
+    )
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument(
+        "--documents", type=int, default=5, help="Few-shot examples per prompt"
+    )
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"metrics": result}, indent=2), encoding="utf-8")
+    for name, value in sorted(result.items()):
+        print(f"{name:<45} {value:12.1f}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import os
+import sys
+import json
+import asyncio
+import argparse
+import platform
+import resource
+import statistics
+import subprocess
+from pathlib import Path
+from time import perf_counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from benchmarks.fake_ollama import FakeOllamaServer
+
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+def _configure_environment(ollama: FakeOllamaServer) -> None:
+    """Point the app at the fake LLM and in-memory Qdrant before it is imported"""
+    os.environ["QDRANT_LOCATION"] = ":memory:"
+    os.environ["OLLAMA_API_HOST"] = ollama.host
+    os.environ["OLLAMA_API_PORT"] = str(ollama.port)
+    os.environ["SNAPSHOT_ENABLED"] = "false"
+    # Fill the remaining required settings without overriding the environment
+    load_dotenv(ROOT / ".env")
+    load_dotenv(ROOT / ".env.sample")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+async def _measure_construction(metrics: Dict[str, float]) -> None:
+    from app.core.pipeline.factory import PipelineFactory
+
+    factory = PipelineFactory()
+    for label in ("cold", "warm"):
+        start = perf_counter()
+        await factory.create_query_pipeline()
+        metrics[f"pipeline.construction_{label}_s"] = perf_counter() - start
+
+
+async def _measure_stages(metrics: Dict[str, float], queries: List[str]) -> None:
+    from app.core.pipeline.factory import PipelineFactory
+    from app.core.pipeline.tracing import collect_stage_timings
+    from app.core.services.pipeline import PipelineService
+    from app.core.evaluation.report import compute_stage_latency
+
+    pipeline = await PipelineFactory().create_query_pipeline()
+    pipeline.warm_up()
+    timings = []
+    for query in queries:
+        with collect_stage_timings() as stage_timings:
+            pipeline.run(PipelineService._create_query_input(query))
+        timings.append(stage_timings)
+
+    for stage, latency in compute_stage_latency(timings).items():
+        metrics[f"stage.{stage}.p50_ms"] = latency.p50_ms
+        metrics[f"stage.{stage}.p95_ms"] = latency.p95_ms
+
+
+async def _measure_throughput(
+    metrics: Dict[str, float],
+    queries: List[str],
+    concurrency_levels: List[int],
+    requests: int,
+) -> None:
+    import httpx
+    from app.main import app
+    from app.config.settings import settings
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=None
+        ) as client:
+            for concurrency in concurrency_levels:
+                semaphore = asyncio.Semaphore(concurrency)
+                latencies: List[float] = []
+
+                async def extract(i: int) -> None:
+                    async with semaphore:
+                        start = perf_counter()
+                        response = await client.post(
+                            f"{settings.API_V1_STR}/extract",
+                            json={"texts": [queries[i % len(queries)]]},
+                        )
+                        response.raise_for_status()
+                        latencies.append(perf_counter() - start)
+
+                start = perf_counter()
+                await asyncio.gather(*(extract(i) for i in range(requests)))
+                elapsed = perf_counter() - start
+
+                prefix = f"http.c{concurrency}"
+                metrics[f"{prefix}.rps"] = requests / elapsed
+                metrics[f"{prefix}.mean_ms"] = statistics.fmean(latencies) * 1000
+                metrics[f"{prefix}.p50_ms"] = _percentile(latencies, 0.50) * 1000
+                metrics[f"{prefix}.p95_ms"] = _percentile(latencies, 0.95) * 1000
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    with FakeOllamaServer(latency=args.llm_latency_ms / 1000) as ollama:
+        _configure_environment(ollama)
+
+        from app.core.initialization.data_loader import DataLoader
+        from app.config.logging import get_logger
+
+        logger = get_logger(__name__)
+        queries = [item.original_text for item in DataLoader().load_eval_data()][
+            : args.queries
+        ]
+
+        metrics: Dict[str, float] = {}
+        logger.info("Measuring pipeline construction...")
+        await _measure_construction(metrics)
+        metrics["memory.rss_after_construction_mb"] = _peak_rss_mb()
+
+        logger.info("Measuring stage latency and HTTP throughput...")
+        await DataLoader().load_initial_data()
+        await _measure_stages(metrics, queries)
+        await _measure_throughput(metrics, queries, args.concurrency, args.requests)
+        metrics["memory.peak_rss_mb"] = _peak_rss_mb()
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "llm_latency_ms": args.llm_latency_ms,
+            "queries": len(queries),
+            "requests": args.requests,
+        },
+        "metrics": metrics,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(
+        description="Offline performance benchmark with a fake LLM and in-memory Qdrant"
+    )
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument(
+        "--llm-latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated generation time of the fake Ollama server",
+    )
+    parser.add_argument("--output", default="benchmarks/results/latest.json")
+    parser.add_argument(
+        "--save-baseline",
+        default=None,
+        metavar="NAME",
+        help="Also save the results as benchmarks/baselines/NAME.json",
+    )
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args))
+
+    paths = [Path(args.output)]
+    if args.save_baseline:
+        paths.append(BASELINE_DIR / f"{args.save_baseline}.json")
+    for path in paths:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    for name, value in sorted(result["metrics"].items()):
+        print(f"{name:<40} {value:12.3f}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
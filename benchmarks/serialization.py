@@ -0,0 +1,99 @@
+import json
+import argparse
+import tracemalloc
+from pathlib import Path
+from time import process_time
+from typing import Any, Callable, Dict, List, Optional
+
+
+REPLY = (
+    '{"quantity": ["1 ML"], "drug_name": ["medroxyprogesterone acetate"], '
+    '"dosage": ["150 MG/ML"], "administration_type": ["Injection"], "brand": []}'
+)
+TEXT = "1 ML medroxyprogesterone acetate 150 MG/ML Injection"
+
+
+def _validated(replies: List[str]) -> bytes:
+    """Previous hot path: every stage builds and validates pydantic models"""
+    from app.schemas.medication import MedicationEntity, MedicationResponse
+
+    results = []
+    for reply in replies:
+        extracted = json.loads(reply)
+        extracted["original_text"] = TEXT
+        results.append(MedicationEntity(**extracted))
+    response = MedicationResponse(results=results, processing_time=0.0)
+    # What FastAPI then did with the returned model: dump it, validate it
+    # against the response model and encode the JSON-compatible dump
+    validated = MedicationResponse.model_validate(response.model_dump())
+    return json.dumps(validated.model_dump(mode="json")).encode("utf-8")
+
+
+def _records(replies: List[str]) -> bytes:
+    """Current hot path: slotted records, encoded without validation"""
+    from app.core.services.records import ExtractedMedication, ExtractionResult
+    from app.utils.serialization import dumps, loads
+
+    results = [ExtractedMedication.from_dict(loads(reply), TEXT) for reply in replies]
+    return dumps(ExtractionResult(results=results, processing_time=0.0))
+
+
+PATHS: Dict[str, Callable[[List[str]], bytes]] = {
+    "validated": _validated,
+    "records": _records,
+}
+
+
+def _measure(path: Callable[[List[str]], bytes], items: int, repeats: int) -> Dict:
+    replies = [REPLY] * items
+    path(replies)
+
+    start = process_time()
+    for _ in range(repeats):
+        path(replies)
+    cpu = (process_time() - start) / (repeats * items)
+
+    tracemalloc.start()
+    path(replies)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "cpu_us": cpu * 1e6,
+        "peak_bytes": peak / items,
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, float]:
+    results = {}
+    for name, path in PATHS.items():
+        for metric, value in _measure(path, args.items, args.repeats).items():
+            results[f"serialization.{name}.per_item_{metric}"] = value
+    results["serialization.records.speedup"] = (
+        results["serialization.validated.per_item_cpu_us"]
+        / results["serialization.records.per_item_cpu_us"]
+    )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(
+        description="Per-item CPU time and peak allocated memory of building the "
+        "extraction response from LLM replies"
+    )
+    parser.add_argument("--items", type=int, default=100, help="Texts per response")
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"metrics": result}, indent=2), encoding="utf-8")
+    for name, value in sorted(result.items()):
+        print(f"{name:<50} {value:12.2f}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import subprocess
+import multiprocessing
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.run import _configure_environment
+
+
+HEAVY_MODULES = ("haystack", "torch", "transformers", "fastembed", "qdrant_client")
+
+IMPORT_PROBE = f"""
+import sys, json, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "import_s": elapsed,
+    "heavy_modules": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_import() -> Dict[str, Any]:
+    """Import time of the application in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+async def _start_app() -> float:
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        return time.time()
+
+
+def _worker(launched_at: float, results: multiprocessing.Queue) -> None:
+    """Import the app and run its startup, reporting when it was ready to serve"""
+    start = time.time()
+    import app.main  # noqa: F401
+
+    imported = time.time()
+    ready = asyncio.run(_start_app())
+    results.put(
+        {
+            "pid": os.getpid(),
+            "import_s": imported - start,
+            "startup_s": ready - imported,
+            "ready_s": ready - launched_at,
+        }
+    )
+
+
+def measure_workers(workers: int, preload: bool) -> List[Dict[str, float]]:
+    """Start workers as uvicorn does, or forked from a preloaded parent.
+
+    Args:
+        workers: Number of worker processes started at once
+        preload: Import the app and preload models here, then fork the workers
+    """
+    if preload:
+        # Importing the app with PRELOAD_MODELS set preloads the models
+        os.environ["PRELOAD_MODELS"] = "true"
+        import app.main  # noqa: F401
+
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context("spawn")
+
+    results = context.Queue()
+    launched_at = time.time()
+    processes = [
+        context.Process(target=_worker, args=(launched_at, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return reports
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(
+        description="Import time and per-worker time to ready of the API"
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--preload",
+        action="store_true",
+        help="Preload models in the parent and fork the workers from it",
+    )
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    with FakeOllamaServer() as ollama:
+        _configure_environment(ollama)
+        metrics: Dict[str, float] = {}
+        probe = measure_import()
+        metrics["startup.import_s"] = probe["import_s"]
+        print(f"Modules loaded on import: {probe['heavy_modules'] or 'none'}")
+
+        mode = "preload" if args.preload else "spawn"
+        reports = measure_workers(args.workers, args.preload)
+        for key in ("import_s", "startup_s", "ready_s"):
+            values = [report[key] for report in reports]
+            metrics[f"startup.{mode}.{key}_mean"] = sum(values) / len(values)
+            metrics[f"startup.{mode}.{key}_max"] = max(values)
+
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"metrics": metrics}, indent=2), encoding="utf-8")
+    for name, value in sorted(metrics.items()):
+        print(f"{name:<40} {value:12.3f}")
+    return metrics
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import os
+import sys
+import json
+import argparse
+import threading
+import subprocess
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from benchmarks.run import ROOT, _percentile
+
+
+def _thread_candidates(share: int) -> List[int]:
+    """Powers of two up to the cores of one worker, and that share itself"""
+    candidates = {share}
+    threads = 1
+    while threads < share:
+        candidates.add(threads)
+        threads *= 2
+    return sorted(candidates)
+
+
+def _worker_cores(cores: List[int], workers: int, slot: int, pin: bool) -> List[int]:
+    from app.core.pipeline.cpu import plan_cpu
+
+    return plan_cpu(cores, workers=workers, slot=slot, pin=pin).cores
+
+
+def _child(args: argparse.Namespace) -> None:
+    """One worker: load the models, wait for the start, then embed and rerank"""
+    if args.cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, [int(core) for core in args.cores.split(",")])
+    load_dotenv(ROOT / ".env")
+    load_dotenv(ROOT / ".env.sample")
+    from app.config.settings import settings
+    from app.core.inference.backend import ModelBackend
+    from app.core.initialization.data_loader import DataLoader
+
+    queries = [item.original_text for item in DataLoader().load_eval_data()]
+    backend = ModelBackend(threads=args.threads)
+    top_k = settings.RETRIEVER_TOP_K
+    backend.score([(queries[0], text) for text in queries[:top_k]])
+
+    print("ready", flush=True)
+    sys.stdin.readline()
+
+    latencies: List[float] = []
+    lock = threading.Lock()
+    stop_at = perf_counter() + args.duration
+
+    def caller(offset: int) -> None:
+        i = offset
+        while perf_counter() < stop_at:
+            query = queries[i % len(queries)]
+            candidates = [queries[(i + j + 1) % len(queries)] for j in range(top_k)]
+            start = perf_counter()
+            backend.dense([query])
+            backend.sparse([query])
+            backend.score([(query, text) for text in candidates])
+            with lock:
+                latencies.append(perf_counter() - start)
+            i += args.concurrency
+
+    callers = [
+        threading.Thread(target=caller, args=(offset,))
+        for offset in range(args.concurrency)
+    ]
+    for thread in callers:
+        thread.start()
+    for thread in callers:
+        thread.join()
+    print(json.dumps({"latencies": latencies}), flush=True)
+
+
+def measure(
+    threads: int, pin: bool, args: argparse.Namespace, cores: List[int]
+) -> Dict[str, Any]:
+    """Run every worker of one configuration at once"""
+    env = dict(
+        os.environ,
+        EMBEDDING_THREADS=str(threads),
+        RERANKER_THREADS=str(threads),
+        OMP_NUM_THREADS=str(threads),
+    )
+    children = []
+    for slot in range(args.workers):
+        command = [
+            sys.executable,
+            "-m",
+            "benchmarks.threads",
+            "--child",
+            f"--threads={threads}",
+            f"--concurrency={args.concurrency}",
+            f"--duration={args.duration}",
+        ]
+        if pin:
+            worker_cores = _worker_cores(cores, args.workers, slot, pin)
+            command.append(f"--cores={','.join(map(str, worker_cores))}")
+        children.append(
+            subprocess.Popen(
+                command,
+                cwd=ROOT,
+                env=env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+        )
+    # Start together once every worker has loaded its models
+    for child in children:
+        line = child.stdout.readline()
+        while line and line.strip() != "ready":
+            line = child.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Worker failed to load models ({threads} threads)")
+    for child in children:
+        child.stdin.write("go\n")
+        child.stdin.flush()
+
+    latencies: List[float] = []
+    for child in children:
+        output, _ = child.communicate()
+        latencies.extend(json.loads(output.strip().splitlines()[-1])["latencies"])
+    latencies = latencies or [0.0]
+    return {
+        "threads": threads,
+        "pinned": pin,
+        "rps": len(latencies) / args.duration,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+    }
+
+
+def recommend(
+    results: List[Dict[str, Any]], max_p95_ms: Optional[float] = None
+) -> Dict[str, Any]:
+    """Highest throughput within the p95 budget, the lowest p95 when none fits"""
+    within = [
+        result
+        for result in results
+        if max_p95_ms is None or result["p95_ms"] <= max_p95_ms
+    ]
+    if not within:
+        return min(results, key=lambda result: result["p95_ms"])
+    return max(within, key=lambda result: (result["rps"], -result["p95_ms"]))
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from app.core.pipeline.cpu import available_cores, plan_cpu
+
+    cores = available_cores()
+    share = max(1, len(cores) // args.workers)
+    # Pinning only changes anything when workers share the cores
+    pinnable = args.workers > 1 and hasattr(os, "sched_setaffinity")
+    pins = [False, True] if pinnable else [False]
+    results = [
+        measure(threads, pin, args, cores)
+        for threads in _thread_candidates(share)
+        for pin in pins
+    ]
+    best = recommend(results, args.max_p95_ms)
+    auto = plan_cpu(cores, workers=args.workers, model_calls=args.concurrency)
+    return {
+        "cores": len(cores),
+        "workers": args.workers,
+        "concurrency": args.concurrency,
+        "auto_threads": auto.embedder_threads,
+        "results": results,
+        "recommended": best,
+        "settings": {
+            "FASTAPI_WORKERS": args.workers,
+            "EMBEDDING_THREADS": best["threads"],
+            "RERANKER_THREADS": best["threads"],
+            "CPU_PIN_WORKERS": str(best["pinned"]).lower(),
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(
+        description="Sweep intra-op threads and CPU pinning of the embedders and "
+        "reranker, and recommend a configuration for this machine"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Concurrent calls per worker"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    parser.add_argument(
+        "--max-p95-ms", type=float, default=None, help="Latency budget of a call"
+    )
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--threads", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--cores", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args)
+        return None
+
+    result = run(args)
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"{'threads':>8} {'pinned':>7} {'rps':>10} {'p50_ms':>10} {'p95_ms':>10}")
+    for row in result["results"]:
+        print(
+            f"{row['threads']:>8} {str(row['pinned']):>7} {row['rps']:10.1f} "
+            f"{row['p50_ms']:10.1f} {row['p95_ms']:10.1f}"
+        )
+    print(
+        f"\nRecommended for {result['cores']} cores "
+        f"(the auto-tuner picks {result['auto_threads']} threads):"
+    )
+    for name, value in result["settings"].items():
+        print(f"{name} = {value}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
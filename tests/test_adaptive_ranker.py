@@ -0,0 +1,113 @@
+import pytest
+from unittest.mock import Mock
+from haystack import Pipeline
+from haystack.dataclasses import Document
+from app.core.components.adaptive_ranker import (
+    RERANKER_DECISIONS,
+    AdaptiveRanker,
+    RetrievalMarginPolicy,
+)
+from app.core.components.onnx_ranker import OnnxCrossEncoderRanker
+from app.scripts.calibrate_reranker_bypass import recommend, sweep_thresholds
+
+
+@pytest.fixture
+def inner_ranker():
+    ranker = Mock()
+    ranker.run.side_effect = lambda query, documents, top_k: {
+        "documents": list(reversed(documents))[:top_k]
+    }
+    return ranker
+
+
+def _documents(*scores):
+    return [
+        Document(id=str(i), content=f"medication {i}", score=score)
+        for i, score in enumerate(scores)
+    ]
+
+
+def test_decisive_margin_skips_reranking(inner_ranker):
+    # Arrange
+    ranker = AdaptiveRanker(ranker=inner_ranker, margin=0.25, top_k=2)
+    documents = _documents(1.0, 0.5, 0.4)
+    skipped = RERANKER_DECISIONS.value(decision="skipped")
+
+    # Act
+    result = ranker.run(query="paracetamol", documents=documents)
+
+    # Assert
+    inner_ranker.run.assert_not_called()
+    assert [doc.id for doc in result["documents"]] == ["0", "1"]
+    assert RERANKER_DECISIONS.value(decision="skipped") == skipped + 1
+
+
+def test_close_scores_are_reranked(inner_ranker):
+    # Arrange
+    ranker = AdaptiveRanker(ranker=inner_ranker, margin=0.25, top_k=2)
+    documents = _documents(1.0, 0.9, 0.4)
+
+    # Act
+    result = ranker.run(query="paracetamol", documents=documents)
+
+    # Assert
+    inner_ranker.run.assert_called_once_with(
+        query="paracetamol", documents=documents, top_k=2
+    )
+    assert [doc.id for doc in result["documents"]] == ["2", "1"]
+
+
+def test_exact_match_skips_reranking(inner_ranker):
+    # Arrange
+    ranker = AdaptiveRanker(ranker=inner_ranker, margin=0.9, top_k=2)
+    documents = _documents(1.0, 0.95)
+
+    # Act
+    ranker.run(query="  Medication 0 ", documents=documents)
+
+    # Assert
+    inner_ranker.run.assert_not_called()
+    assert (
+        RetrievalMarginPolicy(margin=0.9, exact_match=False).is_decisive(
+            "Medication 0", documents
+        )
+        is False
+    )
+
+
+def test_round_trips_through_pipeline_serialization():
+    # Arrange
+    pipeline = Pipeline()
+    pipeline.add_component(
+        "reranker",
+        AdaptiveRanker(ranker=OnnxCrossEncoderRanker(top_k=3), margin=0.3, top_k=3),
+    )
+
+    # Act
+    restored = Pipeline.from_dict(pipeline.to_dict()).get_component("reranker")
+
+    # Assert
+    assert isinstance(restored.ranker, OnnxCrossEncoderRanker)
+    assert restored.policy.margin == 0.3
+    assert restored.top_k == 3
+
+
+def test_sweep_reports_skip_rate_saving_and_accuracy_change():
+    # Act
+    results = sweep_thresholds(
+        margins=[0.6, 0.3, 0.1, 0.0],
+        exact_matches=[False, False, False, True],
+        rerank_hits=[True, True, True, True],
+        retrieval_hits=[True, False, False, True],
+        rerank_seconds=[0.01, 0.01, 0.01, 0.01],
+        thresholds=[0.5, 0.2],
+    )
+
+    # Assert
+    assert results[0]["skip_rate"] == 0.5
+    assert results[0]["accuracy_change"] == 0.0
+    assert results[0]["saved_latency_ms"] == pytest.approx(20.0)
+    assert results[1]["skip_rate"] == 0.75
+    assert results[1]["accuracy_change"] == -0.25
+    assert recommend(results, max_accuracy_drop=0.0)["margin"] == 0.5
+    assert recommend(results, max_accuracy_drop=0.3)["margin"] == 0.2
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from app.core.services.admission import (
+    BULK,
+    INTERACTIVE,
+    AdmissionController,
+    AdmissionRejected,
+    LaneLimits,
+)
+
+
+def make_controller(max_concurrency=1, max_depth=4, max_wait=1.0):
+    return AdmissionController(
+        max_concurrency=max_concurrency,
+        limits={
+            INTERACTIVE: LaneLimits(max_depth=max_depth, max_wait=max_wait),
+            BULK: LaneLimits(max_depth=max_depth, max_wait=max_wait),
+        },
+    )
+
+
+async def hold(controller, lane, order, release):
+    async with controller.admit(lane):
+        order.append(lane)
+        await release.wait()
+
+
+async def test_admits_up_to_max_concurrency_without_waiting():
+    # Arrange
+    controller = make_controller(max_concurrency=2)
+
+    # Act
+    async with controller.admit(INTERACTIVE):
+        async with controller.admit(BULK):
+            active = controller.active
+
+    # Assert
+    assert active == 2
+    assert controller.active == 0
+
+
+async def test_interactive_lane_is_served_before_bulk():
+    # Arrange
+    controller = make_controller()
+    order, release = [], asyncio.Event()
+    first = asyncio.create_task(hold(controller, BULK, order, release))
+    await asyncio.sleep(0)
+    bulk = asyncio.create_task(hold(controller, BULK, order, release))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(hold(controller, INTERACTIVE, order, release))
+    await asyncio.sleep(0)
+
+    # Act
+    release.set()
+    await asyncio.gather(first, bulk, interactive)
+
+    # Assert
+    assert order == [BULK, INTERACTIVE, BULK]
+
+
+async def test_rejects_with_429_when_the_lane_is_full():
+    # Arrange
+    controller = make_controller(max_depth=1)
+    order, release = [], asyncio.Event()
+    running = asyncio.create_task(hold(controller, INTERACTIVE, order, release))
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(hold(controller, INTERACTIVE, order, release))
+    await asyncio.sleep(0)
+
+    # Act
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with controller.admit(INTERACTIVE):
+            pass
+
+    # Assert
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after >= 1
+    release.set()
+    await asyncio.gather(running, queued)
+
+
+async def test_rejects_with_503_when_the_wait_runs_out():
+    # Arrange
+    controller = make_controller(max_wait=0.01)
+    order, release = [], asyncio.Event()
+    running = asyncio.create_task(hold(controller, BULK, order, release))
+    await asyncio.sleep(0)
+
+    # Act
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with controller.admit(BULK):
+            pass
+
+    # Assert
+    assert rejected.value.status_code == 503
+    assert controller.queued(BULK) == 0
+    release.set()
+    await running
+    assert controller.active == 0
+
+
+async def test_cancelled_waiter_does_not_leak_its_slot():
+    # Arrange
+    controller = make_controller()
+    order, release = [], asyncio.Event()
+    running = asyncio.create_task(hold(controller, INTERACTIVE, order, release))
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(hold(controller, INTERACTIVE, order, release))
+    await asyncio.sleep(0)
+
+    # Act
+    waiting.cancel()
+    release.set()
+    await asyncio.gather(running, waiting, return_exceptions=True)
+
+    # Assert
+    assert order == [INTERACTIVE]
+    assert controller.active == 0
+    assert controller.queued(INTERACTIVE) == 0
@@ -0,0 +1,97 @@
+import json
+import pytest
+from haystack_integrations.components.generators.ollama import OllamaGenerator
+from benchmarks.compare import compare, main as compare_main
+from benchmarks.fake_ollama import FakeOllamaServer, extract_entities
+from benchmarks.threads import _thread_candidates, recommend
+from app.prompts.template import MEDICATION_NER
+
+
+@pytest.fixture
+def fake_ollama():
+    with FakeOllamaServer() as server:
+        yield server
+
+
+def test_fake_ollama_answers_generate_deterministically(fake_ollama):
+    # Arrange
+    generator = OllamaGenerator(
+        model="llama3.2:latest", url=f"{fake_ollama.host}:{fake_ollama.port}/"
+    )
+    prompt = MEDICATION_NER.replace(
+        "{{ query }}", "Ibuprofen 200 MG Oral Tablet [Advil]"
+    )
+
+    # Act
+    first = generator.run(prompt=prompt)
+    second = generator.run(prompt=prompt)
+
+    # Assert
+    assert first["replies"] == second["replies"]
+    assert json.loads(first["replies"][0]) == {
+        "original_text": "Ibuprofen 200 MG Oral Tablet [Advil]",
+        "quantity": [],
+        "drug_name": ["Ibuprofen"],
+        "dosage": ["200 MG"],
+        "administration_type": ["Oral Tablet"],
+        "brand": ["Advil"],
+    }
+    assert first["meta"][0]["eval_count"] > 0
+    assert fake_ollama.requests == 2
+
+
+def test_extract_entities_without_dosage():
+    # Act
+    entities = extract_entities("Sodium Chloride")
+
+    # Assert
+    assert entities["drug_name"] == ["Sodium Chloride"]
+    assert entities["dosage"] == []
+
+
+def test_compare_flags_regressions_by_direction():
+    # Arrange
+    baseline = {"stage.rerank.p95_ms": 10.0, "http.c4.rps": 100.0, "memory.x": 1.0}
+    current = {"stage.rerank.p95_ms": 11.0, "http.c4.rps": 70.0, "memory.x": 1.5}
+
+    # Act
+    rows = {
+        row["metric"]: row for row in compare(baseline, current, 0.2, {"memory.x": 0.6})
+    }
+
+    # Assert
+    assert rows["stage.rerank.p95_ms"]["regressed"] is False
+    assert rows["http.c4.rps"]["regressed"] is True
+    assert rows["memory.x"]["regressed"] is False
+
+
+def test_compare_command_exit_code(tmp_path):
+    # Arrange
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps({"metrics": {"pipeline.construction_cold_s": 1.0}}))
+    current.write_text(json.dumps({"metrics": {"pipeline.construction_cold_s": 1.5}}))
+
+    # Act & Assert
+    assert compare_main([str(baseline), str(current)]) == 1
+    assert compare_main([str(baseline), str(current), "--tolerance", "0.6"]) == 0
+
+
+def test_thread_sweep_recommends_the_fastest_configuration_within_budget():
+    # Arrange
+    results = [
+        {"threads": 1, "pinned": False, "rps": 90.0, "p95_ms": 60.0},
+        {"threads": 2, "pinned": True, "rps": 80.0, "p95_ms": 30.0},
+        {"threads": 4, "pinned": False, "rps": 50.0, "p95_ms": 20.0},
+    ]
+
+    # Act
+    fastest = recommend(results)
+    within_budget = recommend(results, max_p95_ms=40.0)
+    over_budget = recommend(results, max_p95_ms=10.0)
+
+    # Assert
+    assert _thread_candidates(6) == [1, 2, 4, 6]
+    assert fastest["threads"] == 1
+    assert within_budget["threads"] == 2
+    assert over_budget["threads"] == 4
@@ -0,0 +1,156 @@
+import time
+from dataclasses import asdict
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from haystack import Document, Pipeline
+from haystack.components.builders import PromptBuilder
+from haystack_integrations.components.generators.ollama import OllamaGenerator
+
+from app.config.settings import settings
+from app.core.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BREAKER_STATE,
+    CircuitBreaker,
+    CircuitOpenError,
+    circuit_breakers,
+)
+from app.core.services.fallback import parse_medication
+from app.core.services.medication import MedicationService
+from app.core.services.pipeline import PipelineService
+from benchmarks.fake_ollama import FakeOllamaServer
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "CIRCUIT_RESET_TIMEOUT_S", 0.1)
+    circuit_breakers.clear()
+    yield
+    circuit_breakers.clear()
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes_once():
+    # Arrange
+    breaker = CircuitBreaker("ollama", failure_threshold=2, reset_timeout=0.05)
+
+    # Act
+    breaker.record_failure()
+    still_closed = breaker.state
+    breaker.record_failure()
+    opened = breaker.state
+    refused = breaker.allow()
+    time.sleep(0.06)
+    half_open = breaker.state
+    probe, second = breaker.allow(), breaker.allow()
+    breaker.record_success(0.01)
+
+    # Assert
+    assert still_closed == CLOSED
+    assert opened == OPEN
+    assert not refused
+    assert half_open == HALF_OPEN
+    assert probe and not second
+    assert breaker.state == CLOSED
+    assert BREAKER_STATE.value(dependency="ollama") == 0
+
+
+def test_failed_probe_and_slow_calls_open_the_breaker():
+    # Arrange
+    breaker = CircuitBreaker(
+        "qdrant", failure_threshold=1, reset_timeout=0.05, slow_call=0.5
+    )
+
+    # Act
+    breaker.record_success(1.0)
+    slow = breaker.state
+    time.sleep(0.06)
+    breaker.allow()
+    breaker.record_failure()
+
+    # Assert
+    assert slow == OPEN
+    assert breaker.state == OPEN
+    assert not breaker.available()
+
+
+async def test_failing_ollama_opens_the_circuit_until_a_probe_succeeds():
+    # Arrange
+    with FakeOllamaServer() as server:
+        pipeline = Pipeline()
+        pipeline.add_component("prompt_builder", PromptBuilder("{{ query }}"))
+        pipeline.add_component(
+            "llm", OllamaGenerator(model="fake", url=f"{server.host}:{server.port}")
+        )
+        pipeline.connect("prompt_builder", "llm")
+        service = PipelineService(Mock())
+        pipeline_input = {"prompt_builder": {"query": "Aspirin 81 MG Oral Tablet"}}
+        server.error_status = 500
+
+        # Act
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await service._run_pipeline(pipeline, pipeline_input)
+        calls_when_opened = server.requests
+        with pytest.raises(CircuitOpenError):
+            await service._run_pipeline(pipeline, pipeline_input)
+        calls_while_open = server.requests
+        time.sleep(0.11)
+        server.error_status = None
+        result = await service._run_pipeline(pipeline, pipeline_input)
+
+    # Assert
+    assert calls_when_opened == 2
+    assert calls_while_open == 2
+    assert circuit_breakers.get("ollama").state == CLOSED
+    assert '"Aspirin"' in result["llm"]["replies"][0]
+
+
+async def test_open_ollama_circuit_answers_from_the_nearest_indexed_example():
+    # Arrange
+    for _ in range(2):
+        circuit_breakers.get("ollama").record_failure()
+    pipeline_service = Mock()
+    pipeline_service.execute_query_pipeline = AsyncMock()
+    pipeline_service.execute_retrieval_pipeline = AsyncMock(
+        return_value=[
+            Document(
+                content="aspirin 81 MG  Oral Tablet",
+                meta={"drug_name": ["aspirin"], "dosage": ["81 MG"]},
+            )
+        ]
+    )
+    service = MedicationService(pipeline_service)
+
+    # Act
+    response = await service.extract_entities(
+        ["Aspirin 81 MG Oral Tablet", "Ibuprofen 200 MG Oral Capsule [Advil]"]
+    )
+
+    # Assert
+    pipeline_service.execute_query_pipeline.assert_not_called()
+    assert response.results[0].drug_name == ["aspirin"]
+    assert response.results[1].drug_name == ["Ibuprofen"]
+    assert response.results[1].brand == ["Advil"]
+    assert response.degraded == ["llm_fallback_retrieval", "llm_fallback_parser"]
+
+
+async def test_failed_extraction_falls_back_to_the_parser_when_qdrant_is_down():
+    # Arrange
+    for _ in range(2):
+        circuit_breakers.get("qdrant").record_failure()
+    pipeline_service = Mock()
+    pipeline_service.execute_query_pipeline = AsyncMock()
+    pipeline_service.execute_retrieval_pipeline = AsyncMock()
+    service = MedicationService(pipeline_service)
+    text = "Metformin 500 MG Oral Tablet"
+
+    # Act
+    response = await service.extract_entities([text])
+
+    # Assert
+    pipeline_service.execute_retrieval_pipeline.assert_not_called()
+    assert asdict(response.results[0]) == parse_medication(text)
+    assert response.degraded == ["llm_fallback_parser"]
@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import Mock, patch
+from qdrant_client.http import models as rest
+from haystack.dataclasses import SparseEmbedding
+from app.core.document_store.factory import DocumentStoreFactory
+from app.core.document_store.store import PooledQdrantDocumentStore
+from app.core.document_store.profiles import (
+    COLLECTION_PROFILES,
+    get_collection_profile,
+)
+from app.scripts import benchmark_collection_profiles
+
+
+def test_get_default_profile():
+    profile = get_collection_profile("default")
+
+    assert profile is COLLECTION_PROFILES["default"]
+    assert profile.quantization_config is None
+    assert profile.on_disk is False
+
+
+def test_get_unknown_profile_raises():
+    with pytest.raises(ValueError, match="Unknown collection profile"):
+        get_collection_profile("unknown")
+
+
+def test_hnsw_overrides_do_not_mutate_profile():
+    profile = get_collection_profile(
+        "scalar", hnsw_m=32, hnsw_ef_construct=256, search_ef=128
+    )
+
+    assert profile.hnsw_config.m == 32
+    assert profile.hnsw_config.ef_construct == 256
+    assert profile.search_params.hnsw_ef == 128
+    assert profile.search_params.quantization.rescore is True
+    assert COLLECTION_PROFILES["scalar"].hnsw_config is None
+    assert COLLECTION_PROFILES["scalar"].search_params.hnsw_ef is None
+
+
+def test_factory_applies_collection_profile():
+    with patch("app.core.document_store.factory.settings") as mock_settings:
+        mock_settings.QDRANT_COLLECTION_PROFILE = "on_disk"
+        mock_settings.QDRANT_HNSW_M = 16
+        mock_settings.QDRANT_HNSW_EF_CONSTRUCT = None
+        mock_settings.QDRANT_SEARCH_EF = 64
+        mock_settings.QDRANT_EMBEDDING_DIM = 384
+
+        doc_store = DocumentStoreFactory().create_document_store()
+
+    assert doc_store.on_disk is True
+    assert doc_store.on_disk_payload is True
+    assert doc_store.hnsw_config.m == 16
+    assert isinstance(doc_store.quantization_config, rest.ScalarQuantization)
+    assert doc_store.search_params.hnsw_ef == 64
+
+
+def test_hybrid_query_uses_search_params():
+    search_params = rest.SearchParams(hnsw_ef=64)
+    doc_store = PooledQdrantDocumentStore(
+        location=":memory:", use_sparse_embeddings=True, search_params=search_params
+    )
+    doc_store._client = Mock()
+    doc_store._client.query_points.return_value.points = []
+
+    doc_store._query_hybrid(
+        [0.1, 0.2], SparseEmbedding(indices=[1], values=[1.0]), top_k=3
+    )
+
+    prefetch = doc_store._client.query_points.call_args.kwargs["prefetch"]
+    assert [p.params for p in prefetch] == [search_params, search_params]
+
+
+def test_profile_benchmark_harness_runs_in_memory():
+    results = benchmark_collection_profiles.main(
+        ["--profiles", "default", "binary", "--documents", "60", "--queries", "5"]
+    )
+
+    assert [result["profile"] for result in results] == ["default", "binary"]
+    assert all(0.0 <= result["recall_at_k"] <= 1.0 for result in results)
+    assert results[1]["vector_ram_estimate_mb"] > results[0]["vector_ram_estimate_mb"]
@@ -0,0 +1,119 @@
+import os
+import sys
+
+import pytest
+
+from app.config.settings import settings
+from app.core.pipeline import cpu
+from app.core.pipeline.cpu import (
+    MODEL_THREADS,
+    WORKER_COUNT_ENV,
+    WORKER_SLOT_ENV,
+    configure_cpu,
+    plan_cpu,
+    worker_labels,
+)
+
+
+@pytest.fixture
+def tuning(monkeypatch):
+    monkeypatch.setattr(settings, "CPU_THREADS_AUTO", True)
+    monkeypatch.setattr(settings, "CPU_PIN_WORKERS", False)
+    monkeypatch.setattr(settings, "CPU_MODEL_CALLS", 2)
+    monkeypatch.setattr(settings, "INFERENCE_SOCKET", None)
+    monkeypatch.setattr(settings, "EMBEDDING_THREADS", None)
+    monkeypatch.setattr(settings, "RERANKER_THREADS", 3)
+    monkeypatch.setattr(cpu, "available_cores", lambda: list(range(16)))
+    monkeypatch.setenv(WORKER_COUNT_ENV, "2")
+    monkeypatch.setenv("OMP_NUM_THREADS", "1")
+    monkeypatch.delenv(WORKER_SLOT_ENV, raising=False)
+    torch = sys.modules.get("torch")
+    threads = torch.get_num_threads() if torch is not None else None
+    yield
+    if torch is not None:
+        torch.set_num_threads(threads)
+
+
+def test_cores_are_divided_between_workers_then_model_calls():
+    # Act
+    shared = plan_cpu(list(range(16)), workers=4, model_calls=2)
+    pinned = plan_cpu(list(range(16)), workers=4, model_calls=2, slot=2, pin=True)
+    crowded = plan_cpu([0, 1], workers=4, model_calls=2, slot=3, pin=True)
+
+    # Assert
+    assert shared.cores == list(range(16))
+    assert shared.embedder_threads == shared.reranker_threads == 2
+    assert not shared.pinned
+    assert pinned.cores == [8, 9, 10, 11]
+    assert pinned.pinned
+    assert crowded.cores == [0, 1]
+    assert crowded.embedder_threads == 1
+    assert not crowded.pinned
+
+
+def test_auto_tuning_fills_only_the_unset_thread_counts(tuning):
+    # Act
+    plan = configure_cpu()
+
+    # Assert
+    assert plan.embedder_threads == 4
+    assert plan.reranker_threads == 3
+    assert settings.EMBEDDING_THREADS == 4
+    assert MODEL_THREADS.value(model="embedder") == 4
+
+
+def test_pinning_needs_the_worker_slot(tuning, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "CPU_THREADS_AUTO", False)
+    monkeypatch.setattr(settings, "CPU_PIN_WORKERS", True)
+    pinned = []
+    monkeypatch.setattr(
+        cpu.os, "sched_setaffinity", lambda pid, cores: pinned.append(cores)
+    )
+
+    # Act
+    without_slot = configure_cpu()
+    monkeypatch.setenv(WORKER_SLOT_ENV, "1")
+    with_slot = configure_cpu()
+
+    # Assert
+    assert not without_slot.pinned
+    assert with_slot.cores == list(range(8, 16))
+    assert pinned == [list(range(8, 16))]
+    assert settings.EMBEDDING_THREADS is None
+
+
+def test_tuning_is_off_by_default_and_for_the_inference_server(tuning, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "INFERENCE_SOCKET", "/tmp/inference.sock")
+
+    # Act
+    with_server = configure_cpu()
+    monkeypatch.setattr(settings, "INFERENCE_SOCKET", None)
+    monkeypatch.setattr(settings, "CPU_THREADS_AUTO", False)
+    disabled = configure_cpu()
+
+    # Assert
+    assert with_server is None
+    assert disabled is None
+    assert settings.EMBEDDING_THREADS is None
+
+
+def test_workers_are_labelled_by_slot_or_pid(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "FASTAPI_WORKERS", 1)
+    monkeypatch.delenv(WORKER_COUNT_ENV, raising=False)
+    monkeypatch.delenv(WORKER_SLOT_ENV, raising=False)
+
+    # Act
+    single = worker_labels()
+    monkeypatch.setattr(settings, "FASTAPI_WORKERS", 4)
+    by_pid = worker_labels()
+    monkeypatch.setenv(WORKER_COUNT_ENV, "4")
+    monkeypatch.setenv(WORKER_SLOT_ENV, "3")
+    by_slot = worker_labels()
+
+    # Assert
+    assert single == {}
+    assert by_pid == {"worker": str(os.getpid())}
+    assert by_slot == {"worker": "3"}
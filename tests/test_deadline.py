@@ -0,0 +1,115 @@
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from haystack import Pipeline, component
+
+from app.api.dependencies import get_request_deadline
+from app.core.components.adaptive_ranker import RERANKER_DECISIONS, AdaptiveRanker
+from app.core.pipeline.deadline import Deadline, DeadlineExceeded, deadline_context
+from app.core.services.pipeline import PipelineService
+from app.core.services.medication import MedicationService
+
+
+@component
+class Sleeper:
+    """Passes its value on after sleeping, counting its runs"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.runs = 0
+
+    @component.output_types(value=int)
+    def run(self, value: int):
+        self.runs += 1
+        time.sleep(self.seconds)
+        return {"value": value}
+
+
+def test_deadline_check_raises_and_records_once_expired():
+    # Arrange
+    deadline = Deadline(0.0)
+
+    # Act
+    with pytest.raises(DeadlineExceeded, match="before generate"):
+        deadline.check("generate")
+
+    # Assert
+    assert deadline.remaining() == 0.0
+    assert deadline.degraded == ["deadline_exceeded"]
+
+
+async def test_pipeline_run_stops_at_the_next_component_after_the_deadline():
+    # Arrange
+    first, second = Sleeper(0.2), Sleeper(0.0)
+    pipeline = Pipeline()
+    pipeline.add_component("retriever", first)
+    pipeline.add_component("llm", second)
+    pipeline.connect("retriever.value", "llm.value")
+    service = PipelineService(Mock())
+    deadline = Deadline(0.05)
+
+    # Act
+    with deadline_context(deadline), pytest.raises(DeadlineExceeded):
+        await service._run_pipeline(pipeline, {"retriever": {"value": 1}})
+    time.sleep(0.25)
+
+    # Assert
+    assert first.runs == 1
+    assert second.runs == 0
+    assert deadline.degraded == ["deadline_exceeded"]
+
+
+def test_reranker_is_skipped_when_the_budget_is_short():
+    # Arrange
+    inner = Mock()
+    ranker = AdaptiveRanker(ranker=inner, top_k=1, min_budget=1.0)
+    documents = [Mock(), Mock()]
+    deadline = Deadline(0.5)
+    skipped = RERANKER_DECISIONS.value(decision="deadline")
+
+    # Act
+    with deadline_context(deadline):
+        result = ranker.run(query="aspirin", documents=documents)
+
+    # Assert
+    inner.run.assert_not_called()
+    assert result["documents"] == documents[:1]
+    assert deadline.degraded == ["rerank_skipped"]
+    assert RERANKER_DECISIONS.value(decision="deadline") == skipped + 1
+
+
+async def test_texts_left_when_the_deadline_expires_are_returned_empty():
+    # Arrange
+    pipeline_service = Mock()
+    pipeline_service.execute_query_pipeline = AsyncMock(
+        return_value={"llm": {"replies": ['{"drug_name": ["Aspirin"]}']}}
+    )
+    service = MedicationService(pipeline_service)
+    deadline = Deadline(0.0)
+
+    # Act
+    with deadline_context(deadline):
+        response = await service.extract_entities(["Aspirin 81 MG", "Ibuprofen"])
+
+    # Assert
+    pipeline_service.execute_query_pipeline.assert_not_called()
+    assert [r.drug_name for r in response.results] == [[], []]
+    assert response.degraded == ["deadline_exceeded"]
+
+
+def test_request_deadline_honours_the_header_up_to_the_maximum():
+    # Arrange
+    with patch("app.api.dependencies.settings") as settings:
+        settings.REQUEST_TIMEOUT_MS = 30000
+        settings.REQUEST_MAX_TIMEOUT_MS = 60000
+
+        # Act
+        default = get_request_deadline(None)
+        requested = get_request_deadline(5000)
+        capped = get_request_deadline(600000)
+
+    # Assert
+    assert default.timeout == 30.0
+    assert requested.timeout == 5.0
+    assert capped.timeout == 60.0
@@ -1,6 +1,24 @@
+import pytest
+from unittest.mock import Mock
+from haystack.dataclasses import Document, SparseEmbedding
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
+from haystack_integrations.document_stores.qdrant.converters import (
+    convert_haystack_documents_to_qdrant_points,
+)
+from qdrant_client.conversions.conversion import RestToGrpc
 from app.config.settings import settings
+from app.core.components.batch_retriever import QdrantBatchHybridRetriever
 from app.core.document_store.factory import DocumentStoreFactory
+from app.core.document_store.registry import DocumentStoreRegistry
+from app.utils.common import medication_id
+from app.core.document_store.store import (
+    QDRANT_CONNECT_SECONDS,
+    QDRANT_CONNECTIONS_OPENED,
+    QDRANT_OPEN_CONNECTIONS,
+    PooledQdrantDocumentStore,
+    documents_to_points,
+    qdrant_client_pool,
+)
 
 
 def test_init_document_store():
@@ -17,8 +35,199 @@ def test_init_document_store():
     assert (
         doc_store.recreate_index is False
     )  # Assuming recreate_index is a boolean attribute
-    assert doc_store.return_embedding is True
+    assert doc_store.grpc_port is settings.QDRANT_GRPC_PORT
+    assert doc_store.prefer_grpc is settings.QDRANT_PREFER_GRPC
+    assert doc_store.return_embedding is settings.QDRANT_RETURN_EMBEDDING
     assert doc_store.use_sparse_embeddings is True
     assert doc_store.wait_result_from_api is True
     assert doc_store.sparse_idf is True
     assert doc_store.embedding_dim is settings.QDRANT_EMBEDDING_DIM
+
+
+@pytest.fixture
+def memory_store():
+    store = PooledQdrantDocumentStore(
+        location=":memory:",
+        index="test_pooled_store",
+        use_sparse_embeddings=True,
+        sparse_idf=True,
+        embedding_dim=4,
+        progress_bar=False,
+    )
+    store.write_documents(
+        [
+            Document(
+                id=str(i),
+                content=f"medication {i}",
+                embedding=[float(i == j) for j in range(4)],
+                sparse_embedding=SparseEmbedding(indices=[i], values=[1.0]),
+            )
+            for i in range(4)
+        ]
+    )
+    yield store
+    qdrant_client_pool.close_all()
+
+
+def test_points_match_haystack_conversion():
+    # Arrange
+    documents = [
+        Document(
+            id="0",
+            content="Aspirin 81 MG Oral Tablet",
+            meta={"original_text": "Aspirin 81 MG Oral Tablet", "drug_name": ["a"]},
+            embedding=[0.1, 0.2, 0.3, 0.4],
+            sparse_embedding=SparseEmbedding(indices=[3, 7], values=[0.5, 1.0]),
+        ),
+        Document(id="1", content="Ibuprofen 200 MG", embedding=[0.0] * 4),
+    ]
+
+    for use_sparse_embeddings in (True, False):
+        # Act
+        points = documents_to_points(documents, use_sparse_embeddings)
+        expected = convert_haystack_documents_to_qdrant_points(
+            documents, use_sparse_embeddings=use_sparse_embeddings
+        )
+
+        # Assert
+        assert [point.model_dump_json() for point in points] == [
+            point.model_dump_json() for point in expected
+        ]
+        assert [RestToGrpc.convert_point_struct(point) for point in points] == [
+            RestToGrpc.convert_point_struct(point) for point in expected
+        ]
+
+
+def test_written_documents_read_back_unchanged(memory_store):
+    # Act
+    (document,) = memory_store.get_documents_by_id(["2"], return_embedding=True)
+
+    # Assert
+    assert document.content == "medication 2"
+    assert document.embedding == [0.0, 0.0, 1.0, 0.0]
+    assert document.sparse_embedding.indices == [2]
+    assert memory_store.count_documents() == 4
+
+
+def test_rekey_moves_documents_to_text_derived_ids(memory_store):
+    # Arrange
+    memory_store.write_documents(
+        [
+            Document(
+                id=medication_id("medication 1"),
+                content="medication 1",
+                embedding=[0.0, 1.0, 0.0, 0.0],
+                sparse_embedding=SparseEmbedding(indices=[1], values=[1.0]),
+            )
+        ]
+    )
+
+    # Act
+    moved = memory_store.rekey_documents(medication_id)
+    again = memory_store.rekey_documents(medication_id)
+
+    # Assert
+    assert moved == 4
+    assert again == 0
+    documents = memory_store.filter_documents()
+    assert sorted(doc.id for doc in documents) == sorted(
+        medication_id(f"medication {i}") for i in range(4)
+    )
+    (document,) = memory_store.get_documents_by_id(
+        [medication_id("medication 2")], return_embedding=True
+    )
+    assert document.embedding == [0.0, 0.0, 1.0, 0.0]
+    assert document.sparse_embedding.indices == [2]
+
+
+def test_pooled_stores_share_client(memory_store):
+    other_store = PooledQdrantDocumentStore(
+        location=":memory:",
+        index="test_pooled_store",
+        use_sparse_embeddings=True,
+        sparse_idf=True,
+        embedding_dim=4,
+    )
+
+    assert other_store.client is memory_store.client
+    assert other_store.count_documents() == 4
+
+
+def test_query_hybrid_batch_matches_single_queries(memory_store):
+    queries = [
+        ([1.0, 0.0, 0.0, 0.0], SparseEmbedding(indices=[0], values=[1.0])),
+        ([0.0, 0.0, 1.0, 0.0], SparseEmbedding(indices=[2], values=[1.0])),
+    ]
+
+    batched = memory_store.query_hybrid_batch(queries, top_k=2)
+    single = [
+        memory_store._query_hybrid(dense, sparse, top_k=2) for dense, sparse in queries
+    ]
+
+    assert [[doc.id for doc in docs] for docs in batched] == [
+        [doc.id for doc in docs] for docs in single
+    ]
+    assert batched[0][0].id == "0"
+    assert batched[1][0].id == "2"
+    assert all(doc.embedding is None for docs in batched for doc in docs)
+
+
+def test_query_hybrid_batch_returns_vectors_when_asked(memory_store):
+    queries = [([1.0, 0.0, 0.0, 0.0], SparseEmbedding(indices=[0], values=[1.0]))]
+
+    (documents,) = memory_store.query_hybrid_batch(
+        queries, top_k=1, return_embedding=True
+    )
+
+    assert documents[0].embedding == [1.0, 0.0, 0.0, 0.0]
+
+
+def test_batch_retriever_honours_an_explicit_return_embedding_false(memory_store):
+    retriever = QdrantBatchHybridRetriever(
+        document_store=memory_store, top_k=1, return_embedding=True
+    )
+    dense, sparse = [1.0, 0.0, 0.0, 0.0], SparseEmbedding(indices=[0], values=[1.0])
+
+    default = retriever.run([dense], [sparse])["documents"]
+    overridden = retriever.run([dense], [sparse], return_embedding=False)["documents"]
+
+    assert default[0][0].embedding == [1.0, 0.0, 0.0, 0.0]
+    assert overridden[0][0].embedding is None
+
+
+@pytest.fixture
+def memory_registry():
+    factory = Mock()
+    factory.create_document_store.side_effect = lambda: PooledQdrantDocumentStore(
+        location=":memory:",
+        index="test_registry_store",
+        use_sparse_embeddings=True,
+        embedding_dim=4,
+    )
+    registry = DocumentStoreRegistry(factory=factory)
+    yield registry
+    registry.close()
+
+
+def test_registry_reuses_one_store(memory_registry):
+    first = memory_registry.get_document_store()
+    second = memory_registry.get_document_store()
+
+    assert first is second
+    assert memory_registry._factory.create_document_store.call_count == 1
+
+
+def test_registry_close_releases_connections(memory_registry):
+    opened = QDRANT_CONNECTIONS_OPENED.value()
+    store = memory_registry.get_document_store()
+    store.count_documents()
+
+    assert QDRANT_CONNECTIONS_OPENED.value() == opened + 1
+    assert QDRANT_OPEN_CONNECTIONS.value() == len(qdrant_client_pool) == 1
+    assert QDRANT_CONNECT_SECONDS.count() >= 1
+
+    memory_registry.close()
+
+    assert memory_registry.is_open is False
+    assert len(qdrant_client_pool) == 0
+    assert QDRANT_OPEN_CONNECTIONS.value() == 0
@@ -1,8 +1,9 @@
 import pytest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, patch
 from fastapi.testclient import TestClient
 from app.main import app
-from app.api.dependencies import get_medication_service
+from app.api.dependencies import get_admission_controller, get_medication_service
+from app.core.services.admission import INTERACTIVE, AdmissionController, LaneLimits
 from app.schemas.medication import (
     MedicationResponse,
     MedicationIndexResponse,
@@ -116,3 +117,86 @@ async def test_index_medications_empty_request(client):
 
     # Assert
     assert response.status_code == 422  # FastAPI validation error
+
+
+def test_metrics_endpoint(client):
+    # Arrange - the document store registers its metrics when first imported
+    import app.core.document_store.store  # noqa: F401
+
+    # Act
+    response = client.get("/metrics")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "medication_ner_qdrant_open_connections" in response.text
+
+
+def test_extract_medications_sheds_load_with_retry_after(
+    client, mock_medication_service
+):
+    # Arrange
+    admission = AdmissionController(
+        max_concurrency=1, limits={INTERACTIVE: LaneLimits(0, 1.0)}
+    )
+    admission._active = 1
+    app.dependency_overrides[get_admission_controller] = lambda: admission
+
+    # Act
+    try:
+        response = client.post(
+            f"{settings.API_V1_STR}/extract", json={"texts": ["Aspirin 81 MG"]}
+        )
+    finally:
+        del app.dependency_overrides[get_admission_controller]
+
+    # Assert
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    mock_medication_service.extract_entities.assert_not_called()
+
+
+def test_update_unknown_medication_returns_404(client, mock_medication_service):
+    # Arrange
+    mock_medication_service.update_medication = AsyncMock(return_value=None)
+
+    # Act
+    response = client.patch(
+        f"{settings.API_V1_STR}/index/missing", json={"brand": ["Tylenol"]}
+    )
+
+    # Assert
+    assert response.status_code == 404
+    mock_medication_service.update_medication.assert_awaited_once()
+
+
+def test_failed_update_is_logged(client, mock_medication_service):
+    # Arrange
+    mock_medication_service.update_medication = AsyncMock(
+        side_effect=RuntimeError("Qdrant unavailable")
+    )
+
+    # Act
+    with patch("app.api.endpoints.medication.logger") as logger:
+        with pytest.raises(RuntimeError):
+            client.patch(f"{settings.API_V1_STR}/index/abc", json={"brand": []})
+
+    # Assert
+    logger.opt.return_value.error.assert_called_once()
+
+
+def test_delete_medication_by_id(client, mock_medication_service):
+    # Arrange
+    mock_medication_service.delete_medication = AsyncMock(
+        return_value=MedicationIndexResponse(
+            message="Deleted medication abc", processing_time=0.01, ids=["abc"]
+        )
+    )
+
+    # Act
+    response = client.delete(f"{settings.API_V1_STR}/index/abc")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["ids"] == ["abc"]
+    mock_medication_service.delete_medication.assert_awaited_once_with("abc")
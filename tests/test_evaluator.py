@@ -0,0 +1,282 @@
+import json
+import time
+import pytest
+from typing import Dict, List
+from unittest.mock import Mock, AsyncMock, patch
+from haystack import Pipeline, component
+from haystack.dataclasses import Document
+from app.core.components.cached_generator import CachedGenerator, LLMCache
+from app.core.evaluation.evaluator import EvaluationOutput, Evaluator
+from app.core.evaluation.report import compute_field_metrics, write_report
+from app.core.pipeline.tracing import COMPONENT_RUN, pipeline_tracer
+from app.core.pipeline.factory import PipelineFactory
+from app.schemas.medication import MedicationEntity
+from app.scripts.evaluate import log_summary
+
+
+def _entity(text: str, drug: str) -> MedicationEntity:
+    return MedicationEntity(
+        original_text=text,
+        drug_name=[drug],
+        dosage=[],
+        quantity=[],
+        administration_type=[],
+        brand=[],
+    )
+
+
+@pytest.fixture
+def test_data():
+    return [
+        _entity("Acetaminophen 325 MG Oral Tablet", "Acetaminophen"),
+        _entity("Amoxicillin 500 MG Oral Capsule", "Amoxicillin"),
+        _entity("Ibuprofen 200 MG Oral Tablet", "Ibuprofen"),
+    ]
+
+
+@pytest.fixture
+def mock_pipeline(test_data):
+    answers = {item.original_text: item.model_dump() for item in test_data}
+
+    def run(data, include_outputs_from=None):
+        query = data["prompt_builder"]["query"]
+        return {
+            "llm": {"replies": [json.dumps(answers[query])]},
+            "reranker": {
+                "documents": [Document(content=query, meta={"original_text": query})]
+            },
+        }
+
+    pipeline = Mock(spec=Pipeline)
+    pipeline.run.side_effect = run
+    return pipeline
+
+
+@pytest.fixture
+def pipeline_factory(mock_pipeline):
+    factory = Mock(spec=PipelineFactory)
+    factory.create_query_pipeline = AsyncMock(return_value=mock_pipeline)
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_run_uses_one_warm_pipeline_per_worker(
+    pipeline_factory, mock_pipeline, test_data, tmp_path
+):
+    # Arrange
+    evaluator = Evaluator(
+        workers=2,
+        llm_cache_path=tmp_path / "llm.jsonl",
+        pipeline_factory=pipeline_factory,
+    )
+
+    # Act
+    result = await evaluator.run(test_data)
+
+    # Assert
+    assert pipeline_factory.create_query_pipeline.await_count == 2
+    pipeline_factory.create_query_pipeline.assert_awaited_with(
+        llm_cache_path=str(tmp_path / "llm.jsonl")
+    )
+    assert mock_pipeline.warm_up.call_count == 2
+    assert mock_pipeline.run.call_count == 3
+    assert result.accuracy == 1.0
+
+
+@pytest.mark.asyncio
+async def test_failed_item_counts_as_wrong_answer(
+    pipeline_factory, mock_pipeline, test_data
+):
+    # Arrange
+    run = mock_pipeline.run.side_effect
+
+    def flaky_run(data, include_outputs_from=None):
+        if data["prompt_builder"]["query"] == test_data[1].original_text:
+            return {"llm": {"replies": ["not json"]}, "reranker": {"documents": []}}
+        return run(data, include_outputs_from)
+
+    mock_pipeline.run.side_effect = flaky_run
+    evaluator = Evaluator(workers=3, pipeline_factory=pipeline_factory)
+
+    # Act
+    result = await evaluator.run(test_data)
+
+    # Assert
+    assert result.accuracy == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_recorded_items(
+    pipeline_factory, mock_pipeline, test_data, tmp_path
+):
+    # Arrange
+    results_path = tmp_path / "results.jsonl"
+    await Evaluator(results_path=results_path, pipeline_factory=pipeline_factory).run(
+        test_data[:2]
+    )
+    mock_pipeline.run.reset_mock()
+
+    # Act
+    result = await Evaluator(
+        results_path=results_path, pipeline_factory=pipeline_factory
+    ).run(test_data, resume=True)
+
+    # Assert
+    assert mock_pipeline.run.call_count == 1
+    assert len(results_path.read_text().splitlines()) == 3
+    assert result.accuracy == 1.0
+
+
+@component
+class _StubEmbedder:
+    @component.output_types(embedding=str)
+    def run(self, text: str):
+        return {"embedding": text}
+
+
+@component
+class _StubReranker:
+    @component.output_types(documents=List[Document])
+    def run(self, query: str):
+        return {"documents": [Document(content=query, meta={"original_text": query})]}
+
+
+@component
+class _StubPromptBuilder:
+    @component.output_types(prompt=str)
+    def run(self, query: str, documents: List[Document]):
+        return {"prompt": query}
+
+
+@component
+class _StubGenerator:
+    def __init__(self, answers: Dict[str, Dict]):
+        self.answers = answers
+
+    @component.output_types(replies=List[str])
+    def run(self, prompt: str):
+        # Long enough for the runs of concurrent items to overlap
+        time.sleep(0.02)
+        return {"replies": [json.dumps(self.answers[prompt])]}
+
+
+def _stub_query_pipeline(answers: Dict[str, Dict]) -> Pipeline:
+    pipeline = Pipeline()
+    pipeline.add_component("sparse_embedder", _StubEmbedder())
+    pipeline.add_component("dense_embedder", _StubEmbedder())
+    pipeline.add_component("reranker", _StubReranker())
+    pipeline.add_component("prompt_builder", _StubPromptBuilder())
+    pipeline.add_component("llm", _StubGenerator(answers))
+    pipeline.connect("reranker.documents", "prompt_builder.documents")
+    pipeline.connect("prompt_builder.prompt", "llm.prompt")
+    return pipeline
+
+
+@pytest.mark.asyncio
+async def test_concurrent_items_run_on_real_pipelines(test_data):
+    # Arrange
+    answers = {item.original_text: item.model_dump() for item in test_data * 4}
+    pipelines = []
+
+    async def create_query_pipeline(llm_cache_path=None):
+        pipelines.append(_stub_query_pipeline(answers))
+        return pipelines[-1]
+
+    factory = Mock(spec=PipelineFactory)
+    factory.create_query_pipeline = create_query_pipeline
+    evaluator = Evaluator(workers=3, pipeline_factory=factory)
+
+    # Act
+    result = await evaluator.run(test_data * 4)
+
+    # Assert
+    assert len(pipelines) == 3
+    assert result.failures == 0
+    assert result.accuracy == 1.0
+
+
+def test_cached_generator_calls_llm_once_per_prompt(tmp_path):
+    # Arrange
+    generator = Mock()
+    generator.model = "llama3.2:latest"
+    generator.run.return_value = {"replies": ["{}"], "meta": [{"eval_count": 3}]}
+    cache_path = tmp_path / "llm.jsonl"
+    cached = CachedGenerator(generator=generator, cache_path=str(cache_path))
+
+    # Act
+    first = cached.run(prompt="Extract: Ibuprofen")
+    second = cached.run(prompt="Extract: Ibuprofen")
+    cached.run(prompt="Extract: Amoxicillin")
+
+    # Assert
+    assert first == second
+    assert generator.run.call_count == 2
+    assert cached.cache.hits == 1
+    reloaded = LLMCache(cache_path)
+    assert len(reloaded) == 2
+    assert reloaded.get("Extract: Ibuprofen", "llama3.2:latest") == first
+    assert reloaded.get("Extract: Ibuprofen", "mistral-nemo:latest") is None
+
+
+def test_field_metrics_score_each_entity_field():
+    # Arrange
+    truth = _entity("Ibuprofen 200 MG Oral Tablet", "Ibuprofen").model_dump()
+    truth["dosage"] = ["200 MG"]
+    answer = dict(truth, dosage=["200 mg", "400 MG"], drug_name=[])
+
+    # Act
+    metrics = compute_field_metrics([answer, None], [truth, truth])
+
+    # Assert
+    assert metrics["dosage"].true_positives == 1
+    assert metrics["dosage"].false_positives == 1
+    assert metrics["dosage"].false_negatives == 1
+    assert metrics["drug_name"].recall == 0.0
+    assert metrics["micro"].precision == pytest.approx(0.5)
+    assert metrics["micro"].recall == pytest.approx(0.25)
+
+
+@pytest.mark.asyncio
+async def test_report_includes_stage_latency_and_tokens(
+    pipeline_factory, mock_pipeline, test_data, tmp_path
+):
+    # Arrange
+    run = mock_pipeline.run.side_effect
+
+    def traced_run(data, include_outputs_from=None):
+        # Simulates the spans Haystack opens around each component run
+        for name in ("dense_embedder", "retriever", "reranker", "llm"):
+            with pipeline_tracer.trace(
+                COMPONENT_RUN, tags={"haystack.component.name": name}
+            ):
+                pass
+        response = run(data, include_outputs_from)
+        response["llm"]["meta"] = [{"prompt_eval_count": 120, "eval_count": 30}]
+        return response
+
+    mock_pipeline.run.side_effect = traced_run
+    evaluator = Evaluator(pipeline_factory=pipeline_factory)
+
+    # Act
+    result = await evaluator.run(test_data)
+    write_report(result.model_dump(), tmp_path / "report.html")
+
+    # Assert
+    assert set(result.latency) == {"embed", "retrieve", "rerank", "generate", "total"}
+    assert result.latency["rerank"].count == 3
+    assert result.tokens.tokens_in == 360
+    assert result.tokens.mean_tokens_out == 30
+    assert result.fields["drug_name"].f1_score == 1.0
+    assert "Stage latency" in (tmp_path / "report.html").read_text()
+
+
+def test_summary_of_a_failed_evaluation_is_logged_without_scores():
+    # Arrange
+    result = EvaluationOutput(accuracy=None, precision=None, recall=None, f1_score=None)
+
+    # Act
+    with patch("app.scripts.evaluate.logger") as logger:
+        log_summary(result)
+
+    # Assert
+    assert "exact_match=n/a" in logger.info.call_args_list[0].args[0]
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.config.settings import settings
+from app.core.pipeline import executors as executors_module
+from app.core.pipeline.deadline import Deadline, current_deadline, deadline_context
+from app.core.pipeline.executors import (
+    EXECUTOR_MAX_THREADS,
+    EXECUTOR_THREADS,
+    PIPELINE_INIT,
+    PIPELINE_RUN,
+    ExecutorRegistry,
+    executor_sizes,
+    intra_op_threads,
+)
+
+
+@pytest.fixture
+def eight_cores(monkeypatch):
+    monkeypatch.setattr(executors_module.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(settings, "INFERENCE_SOCKET", None)
+    monkeypatch.setattr(settings, "RERANKER_BACKEND", "onnx")
+    monkeypatch.setattr(settings, "PIPELINE_THREADS", None)
+    monkeypatch.setattr(settings, "PIPELINE_INIT_THREADS", None)
+
+
+@pytest.fixture
+def registry():
+    registry = ExecutorRegistry()
+    yield registry
+    registry.shutdown()
+
+
+def test_run_executor_leaves_cores_to_the_model_intra_op_threads(
+    eight_cores, monkeypatch
+):
+    # Arrange
+    monkeypatch.setattr(settings, "EMBEDDING_THREADS", 2)
+    monkeypatch.setattr(settings, "RERANKER_THREADS", 4)
+
+    # Act
+    threads = intra_op_threads()
+    sizes = executor_sizes()
+
+    # Assert
+    assert threads == {"embedder": 2, "reranker": 4}
+    assert sizes == {PIPELINE_INIT: 12, PIPELINE_RUN: 2}
+
+
+def test_models_using_every_core_get_one_run_thread(eight_cores, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "EMBEDDING_THREADS", None)
+    monkeypatch.setattr(settings, "RERANKER_THREADS", 2)
+
+    # Act
+    sizes = executor_sizes()
+
+    # Assert
+    assert sizes == {PIPELINE_INIT: 12, PIPELINE_RUN: 1}
+
+
+def test_torch_reranker_threads_follow_omp_num_threads(eight_cores, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "EMBEDDING_THREADS", 2)
+    monkeypatch.setattr(settings, "RERANKER_BACKEND", "torch")
+    monkeypatch.setitem(executors_module.sys.modules, "torch", None)
+    monkeypatch.setenv("OMP_NUM_THREADS", "4")
+
+    # Act
+    sizes = executor_sizes()
+
+    # Assert
+    assert intra_op_threads() == {"embedder": 2, "reranker": 4}
+    assert sizes[PIPELINE_RUN] == 2
+
+
+def test_models_behind_the_inference_server_use_no_local_cores(
+    eight_cores, monkeypatch
+):
+    # Arrange
+    monkeypatch.setattr(settings, "INFERENCE_SOCKET", "/tmp/inference.sock")
+
+    # Act
+    sizes = executor_sizes()
+
+    # Assert
+    assert intra_op_threads() == {}
+    assert sizes[PIPELINE_RUN] == 8
+
+
+def test_settings_set_the_init_executor_size(eight_cores, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "PIPELINE_INIT_THREADS", 2)
+
+    # Act
+    sizes = executor_sizes()
+
+    # Assert
+    assert sizes[PIPELINE_INIT] == 2
+
+
+async def test_run_keeps_the_request_deadline_on_the_worker_thread(registry):
+    # Arrange
+    deadline = Deadline(5.0)
+
+    def seen():
+        return current_deadline(), threading.current_thread().name
+
+    # Act
+    with deadline_context(deadline):
+        seen_deadline, thread_name = await registry.run(PIPELINE_RUN, seen)
+
+    # Assert
+    assert seen_deadline is deadline
+    assert thread_name.startswith(f"{PIPELINE_RUN}-")
+
+
+async def test_executors_are_shared_and_recreated_after_shutdown(registry):
+    # Arrange
+    registry.start()
+    executor = registry.get(PIPELINE_INIT)
+
+    # Act
+    shared = registry.get(PIPELINE_INIT) is executor
+    registry.shutdown()
+    stopped = PIPELINE_INIT in registry
+    result = await registry.run(PIPELINE_INIT, sum, [1, 2])
+
+    # Assert
+    assert shared
+    assert not stopped
+    assert result == 3
+    assert registry.get(PIPELINE_INIT) is not executor
+    assert EXECUTOR_MAX_THREADS.value(executor=PIPELINE_INIT) >= 1
+
+
+async def test_threads_are_counted_as_the_executor_starts_them(
+    eight_cores, registry, monkeypatch
+):
+    # Arrange
+    monkeypatch.setattr(settings, "PIPELINE_THREADS", 3)
+    registry.start()
+    release = threading.Event()
+
+    # Act
+    calls = [registry.run(PIPELINE_RUN, release.wait, 5) for _ in range(5)]
+    running = asyncio.gather(*calls)
+    await asyncio.sleep(0.05)
+    started = EXECUTOR_THREADS.value(executor=PIPELINE_RUN)
+    release.set()
+    await running
+
+    # Assert
+    assert registry.size(PIPELINE_RUN) == 3
+    assert started == 3
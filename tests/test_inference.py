@@ -0,0 +1,207 @@
+import time
+import socket
+import struct
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import pytest
+from haystack.dataclasses import Document
+
+from app.core.inference.backend import InferenceBackend
+from app.core.inference.client import InferenceClient, InferenceError
+from app.core.inference.protocol import recv_message
+from app.core.inference.server import InferenceServer
+from app.core.components.sidecar import (
+    SidecarRanker,
+    SidecarTextEmbedder,
+    SidecarDocumentEmbedder,
+    SidecarSparseTextEmbedder,
+    SidecarSparseDocumentEmbedder,
+)
+
+
+class FakeBackend(InferenceBackend):
+    """Deterministic models recording the size of every batch they run"""
+
+    def __init__(self):
+        self.batches: Dict[str, List[int]] = {"dense": [], "sparse": [], "score": []}
+
+    def dense(self, texts: List[str]) -> List[List[float]]:
+        self.batches["dense"].append(len(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def sparse(self, texts: List[str]) -> List[Dict[str, List]]:
+        self.batches["sparse"].append(len(texts))
+        return [{"indices": [len(text)], "values": [0.5]} for text in texts]
+
+    def score(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        self.batches["score"].append(len(pairs))
+        if any(text == "fail" for _, text in pairs):
+            raise RuntimeError("model failed")
+        # Texts sharing more words with the query score higher
+        return [
+            float(len(set(query.split()) & set(text.split()))) for query, text in pairs
+        ]
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend()
+
+
+@pytest.fixture
+def socket_path(tmp_path, backend):
+    """Run the inference server on its own event loop thread"""
+    path = str(tmp_path / "inference.sock")
+    server = InferenceServer(backend, path, max_batch=8, max_wait=0.05)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result(timeout=5)
+
+    yield path
+
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def test_sidecar_components_match_their_fastembed_outputs(socket_path):
+    # Arrange
+    documents = [Document(content="aspirin 81 mg"), Document(content="ibuprofen")]
+
+    # Act
+    embedding = SidecarTextEmbedder(socket_path).run(text="aspirin")["embedding"]
+    sparse = SidecarSparseTextEmbedder(socket_path).run(text="aspirin")
+    SidecarDocumentEmbedder(socket_path).run(documents=documents)
+    SidecarSparseDocumentEmbedder(socket_path).run(documents=documents)
+
+    # Assert
+    assert embedding == [7.0, 1.0]
+    assert sparse["sparse_embedding"].indices == [7]
+    assert sparse["sparse_embedding"].values == [0.5]
+    assert [doc.embedding for doc in documents] == [[13.0, 1.0], [9.0, 1.0]]
+    assert [doc.sparse_embedding.indices for doc in documents] == [[13], [9]]
+
+
+def test_sidecar_ranker_orders_documents_by_server_scores(socket_path):
+    # Arrange
+    ranker = SidecarRanker(socket_path, top_k=2)
+    ranker.warm_up()
+    documents = [
+        Document(content="ibuprofen 200 mg"),
+        Document(content="aspirin 81 mg oral tablet"),
+        Document(content="aspirin tablet"),
+    ]
+
+    # Act
+    ranked = ranker.run(query="aspirin 81 mg tablet", documents=documents)["documents"]
+
+    # Assert
+    assert [doc.content for doc in ranked] == [
+        "aspirin 81 mg oral tablet",
+        "aspirin tablet",
+    ]
+    assert 0.5 < ranked[1].score < ranked[0].score < 1.0
+
+
+def test_server_batches_requests_from_concurrent_clients(socket_path, backend):
+    # Arrange
+    embedder = SidecarTextEmbedder(socket_path)
+
+    # Act
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        embeddings = list(
+            pool.map(lambda i: embedder.run(text="x" * i)["embedding"], range(1, 9))
+        )
+
+    # Assert
+    assert [embedding[0] for embedding in embeddings] == list(map(float, range(1, 9)))
+    assert sum(backend.batches["dense"]) == 8
+    assert len(backend.batches["dense"]) < 8
+
+
+def test_server_reports_backend_errors_and_keeps_serving(socket_path):
+    # Arrange
+    client = InferenceClient(socket_path)
+
+    # Act
+    with pytest.raises(InferenceError, match="model failed"):
+        client.score([("aspirin", "fail")])
+    scores = client.score([("aspirin", "aspirin")])
+
+    # Assert
+    assert scores == [1.0]
+    client.close()
+
+
+def test_client_reconnects_after_losing_its_connection(socket_path):
+    # Arrange
+    client = InferenceClient(socket_path)
+    client.dense(["aspirin"])
+    # As if the server had restarted since the connection was opened
+    client._socket().shutdown(socket.SHUT_RDWR)
+
+    # Act
+    embeddings = client.dense(["ibuprofen"])
+
+    # Assert
+    assert embeddings == [[9.0, 1.0]]
+    client.close()
+
+
+def test_client_does_not_resend_a_timed_out_request(tmp_path):
+    # Arrange
+    path = str(tmp_path / "slow.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+    connections = []
+
+    def accept():
+        # Accepts requests without ever answering them
+        while True:
+            try:
+                connection, _ = listener.accept()
+            except OSError:
+                return
+            connections.append(connection)
+
+    threading.Thread(target=accept, daemon=True).start()
+    client = InferenceClient(path, timeout=0.2)
+
+    # Act
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        client.dense(["aspirin"])
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    assert elapsed < 0.4
+    assert len(connections) == 1
+    listener.close()
+    for connection in connections:
+        connection.close()
+
+
+def test_server_answers_a_malformed_message_and_closes_the_connection(socket_path):
+    # Arrange
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(5)
+    sock.connect(socket_path)
+    body = b"not json"
+
+    # Act
+    sock.sendall(struct.pack(">I", len(body)) + body)
+    response = recv_message(sock)
+    closed = sock.recv(1) == b""
+
+    # Assert
+    assert response["id"] is None
+    assert "Malformed message" in response["error"]
+    assert closed
+    sock.close()
+    assert InferenceClient(socket_path).dense(["aspirin"]) == [[7.0, 1.0]]
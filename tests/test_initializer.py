@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
 from app.core.document_store.initializer import DocumentStoreInitializer
+from app.core.document_store.registry import DocumentStoreRegistry
 
 
 @pytest.fixture
@@ -11,9 +12,8 @@ def mock_logger():
 
 
 @pytest.fixture
-def mock_factory():
-    with patch("app.core.document_store.initializer.DocumentStoreFactory") as mock:
-        yield mock
+def mock_registry():
+    return Mock(spec=DocumentStoreRegistry)
 
 
 @pytest.fixture
@@ -25,25 +25,25 @@ def mock_document_store():
 
 
 @pytest.fixture
-async def initializer():
-    init = DocumentStoreInitializer()
+async def initializer(mock_registry):
+    init = DocumentStoreInitializer(registry=mock_registry)
     yield init
     await init.cleanup()
 
 
 @pytest.mark.asyncio
 async def test_successful_connection(
-    initializer, mock_factory, mock_document_store, mock_logger
+    initializer, mock_registry, mock_document_store, mock_logger
 ):
     """Test successful connection to document store"""
     # Arrange
-    mock_factory.return_value.create_document_store.return_value = mock_document_store
+    mock_registry.get_document_store.return_value = mock_document_store
 
     # Act
     await initializer.test_connection()
 
     # Assert
-    mock_factory.return_value.create_document_store.assert_called_once()
+    mock_registry.get_document_store.assert_called_once()
     mock_document_store.count_documents.assert_called_once()
     mock_logger.info.assert_called_once_with(
         "Successfully tested Qdrant document store connection"
@@ -52,11 +52,11 @@ async def test_successful_connection(
 
 
 @pytest.mark.asyncio
-async def test_connection_failure(initializer, mock_factory, mock_logger):
+async def test_connection_failure(initializer, mock_registry, mock_logger):
     """Test handling of connection failure"""
     # Arrange
     error_msg = "Connection refused"
-    mock_factory.return_value.create_document_store.side_effect = Exception(error_msg)
+    mock_registry.get_document_store.side_effect = Exception(error_msg)
 
     # Act & Assert
     with pytest.raises(Exception) as exc_info:
@@ -69,7 +69,9 @@ async def test_connection_failure(initializer, mock_factory, mock_logger):
 
 
 @pytest.mark.asyncio
-async def test_cleanup_success(initializer, mock_document_store, mock_logger):
+async def test_cleanup_success(
+    initializer, mock_registry, mock_document_store, mock_logger
+):
     """Test successful cleanup of document store connection"""
     # Arrange
     initializer._test_store = mock_document_store
@@ -78,28 +80,31 @@ async def test_cleanup_success(initializer, mock_document_store, mock_logger):
     await initializer.cleanup()
 
     # Assert
-    mock_document_store.client.close.assert_called_once()
+    mock_registry.close.assert_called_once()
+    assert initializer._test_store is None
     assert not mock_logger.error.called
 
 
 @pytest.mark.asyncio
-async def test_cleanup_failure(initializer, mock_document_store, mock_logger):
+async def test_cleanup_failure(
+    initializer, mock_registry, mock_document_store, mock_logger
+):
     """Test handling of cleanup failure"""
     # Arrange
     error_msg = "Cleanup failed"
     initializer._test_store = mock_document_store
-    mock_document_store.client.close.side_effect = Exception(error_msg)
+    mock_registry.close.side_effect = Exception(error_msg)
 
     # Act
     await initializer.cleanup()
 
     # Assert
-    mock_document_store.client.close.assert_called_once()
+    mock_registry.close.assert_called_once()
     mock_logger.error.assert_called_once_with(f"Error during cleanup: {error_msg}")
 
 
 @pytest.mark.asyncio
-async def test_cleanup_no_store(initializer, mock_logger):
+async def test_cleanup_no_store(initializer, mock_registry, mock_logger):
     """Test cleanup when no store exists"""
     # Arrange
     initializer._test_store = None
@@ -108,4 +113,5 @@ async def test_cleanup_no_store(initializer, mock_logger):
     await initializer.cleanup()
 
     # Assert
+    mock_registry.close.assert_called_once()
     assert not mock_logger.error.called
@@ -0,0 +1,98 @@
+import io
+import json
+import zipfile
+import pytest
+from loguru import logger
+from app.config.logging import (
+    BackgroundSink,
+    RotatingFileSink,
+    StdoutSink,
+    configure_logging,
+    sample_debug,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    yield
+    configure_logging()
+
+
+def test_sample_debug_is_off_without_debug_sinks(tmp_path):
+    # Act
+    configure_logging(level="INFO", file_level="INFO", log_dir=tmp_path)
+
+    # Assert
+    assert not any(sample_debug() for _ in range(100))
+
+
+def test_sample_debug_keeps_a_fraction_of_events(tmp_path):
+    # Act
+    configure_logging(file_level="DEBUG", log_dir=tmp_path, debug_sample_rate=0.2)
+    kept = sum(sample_debug() for _ in range(5000))
+
+    # Assert
+    assert 500 < kept < 1500
+
+
+@pytest.mark.asyncio
+async def test_background_sink_writes_records_off_thread():
+    # Arrange
+    stream = io.StringIO()
+    logger.remove()
+    logger.add(BackgroundSink(stream), format="{message}", level="INFO")
+
+    # Act
+    logger.info("Processed {} texts", 3)
+    await logger.complete()
+
+    # Assert
+    assert stream.getvalue() == "Processed 3 texts\n"
+
+
+def test_json_file_sink(tmp_path):
+    # Arrange
+    configure_logging(file_level="DEBUG", log_dir=tmp_path, json=True, enqueue=True)
+
+    # Act
+    logger.debug("Request {}: done", "abc")
+    logger.remove()
+
+    # Assert
+    log_file = tmp_path / "app.log"
+    record = json.loads(log_file.read_text().splitlines()[-1])
+    assert record["record"]["message"] == "Request abc: done"
+    assert record["record"]["level"]["name"] == "DEBUG"
+
+
+def test_stdout_sink_follows_a_replaced_stdout(monkeypatch):
+    # Arrange
+    sink = StdoutSink()
+    first, second = io.StringIO(), io.StringIO()
+
+    # Act
+    monkeypatch.setattr("sys.stdout", first)
+    sink.write("one\n")
+    first.close()
+    monkeypatch.setattr("sys.stdout", second)
+    sink.write("two\n")
+
+    # Assert
+    assert second.getvalue() == "two\n"
+
+
+def test_rotated_log_files_are_zipped(tmp_path):
+    # Arrange
+    sink = RotatingFileSink(tmp_path / "logs")
+    sink.write("before 100% rotation\n")
+
+    # Act
+    sink._handler.doRollover()
+    sink.write("after\n")
+    sink.stop()
+
+    # Assert
+    (rotated,) = (tmp_path / "logs").glob("app.log.*.zip")
+    with zipfile.ZipFile(rotated) as archive:
+        assert archive.read("app.log") == b"before 100% rotation\n"
+    assert (tmp_path / "logs" / "app.log").read_text() == "after\n"
@@ -5,11 +5,14 @@ from haystack.dataclasses import Document
 from app.core.pipeline.factory import PipelineFactory
 from app.core.services.pipeline import PipelineService
 from app.core.services.medication import MedicationService
+from app.core.document_store.version import IndexVersion
 from app.schemas.medication import (
-    # MedicationEntity,
+    MedicationEntity,
     MedicationIndexResponse,
     MedicationResponse,
+    MedicationUpdateRequest,
 )
+from app.utils.common import medication_id
 
 
 @pytest.fixture
@@ -120,3 +123,112 @@ async def test_extract_entities_failure(medication_service):
     # Act & Assert
     with pytest.raises(Exception, match="Extraction failed"):
         await medication_service.extract_entities([])
+
+
+@pytest.fixture
+def indexed_medication(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "app.core.services.medication.index_version",
+        IndexVersion(tmp_path / "index_version"),
+    )
+    text = "Acetaminophen 325 MG Oral Tablet"
+    pipeline_service = Mock(spec=PipelineService)
+    pipeline_service.get_documents = AsyncMock(
+        return_value=[
+            Document(
+                id=medication_id(text),
+                content=text,
+                meta={"original_text": text, "drug_name": ["Acetaminophen"]},
+            )
+        ]
+    )
+    return MedicationService(pipeline_service), pipeline_service, medication_id(text)
+
+
+@pytest.mark.asyncio
+async def test_update_of_entity_fields_only_rewrites_the_payload(indexed_medication):
+    # Arrange
+    service, pipeline_service, document_id = indexed_medication
+
+    # Act
+    result = await service.update_medication(
+        document_id, MedicationUpdateRequest(dosage=["325 MG"])
+    )
+
+    # Assert
+    pipeline_service.execute_index_pipeline.assert_not_called()
+    document_id_arg, meta = pipeline_service.update_document_meta.call_args.args
+    assert document_id_arg == document_id
+    assert meta["drug_name"] == ["Acetaminophen"]
+    assert meta["dosage"] == ["325 MG"]
+    assert result.ids == [document_id]
+
+
+@pytest.mark.asyncio
+async def test_update_of_the_text_moves_it_to_the_id_of_the_new_text(
+    indexed_medication,
+):
+    # Arrange
+    service, pipeline_service, document_id = indexed_medication
+
+    # Act
+    result = await service.update_medication(
+        document_id, MedicationUpdateRequest(original_text="Acetaminophen 500 MG")
+    )
+
+    # Assert
+    pipeline_service.update_document_meta.assert_not_called()
+    (document,) = pipeline_service.execute_index_pipeline.call_args.args[0]
+    assert document.id == medication_id("Acetaminophen 500 MG")
+    assert document.content == "Acetaminophen 500 MG"
+    assert document.meta["drug_name"] == ["Acetaminophen"]
+    pipeline_service.delete_documents.assert_awaited_once_with([document_id])
+    assert result.ids == [document.id]
+
+
+@pytest.mark.asyncio
+async def test_indexing_an_updated_text_again_adds_no_duplicate(indexed_medication):
+    # Arrange
+    service, pipeline_service, document_id = indexed_medication
+    stored = {document_id: pipeline_service.get_documents.return_value[0]}
+
+    async def execute_index_pipeline(documents):
+        stored.update({document.id: document for document in documents})
+
+    async def delete_documents(ids):
+        for id in ids:
+            stored.pop(id, None)
+
+    pipeline_service.execute_index_pipeline.side_effect = execute_index_pipeline
+    pipeline_service.delete_documents.side_effect = delete_documents
+    text = "Acetaminophen 500 MG"
+
+    # Act
+    await service.update_medication(
+        document_id, MedicationUpdateRequest(original_text=text)
+    )
+    await service.index_medications(
+        [MedicationEntity(original_text=text, drug_name=["Acetaminophen"])]
+    )
+
+    # Assert
+    assert list(stored) == [medication_id(text)]
+
+
+@pytest.mark.asyncio
+async def test_delete_of_an_unknown_id_returns_none(indexed_medication):
+    # Arrange
+    service, pipeline_service, _ = indexed_medication
+    pipeline_service.get_documents.return_value = []
+
+    # Act
+    result = await service.delete_medication("missing")
+
+    # Assert
+    assert result is None
+    pipeline_service.delete_documents.assert_not_called()
+
+
+def test_medication_ids_are_stable_across_whitespace():
+    assert medication_id("Aspirin 81 MG") == medication_id(" Aspirin  81 MG ")
+    assert medication_id("Aspirin 81 MG") != medication_id("Aspirin 325 MG")
@@ -0,0 +1,88 @@
+import pytest
+from app.core.monitoring.metrics import MetricsRegistry, _Metric
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(prefix="test")
+
+
+def test_counter_renders_total_per_label(registry):
+    # Arrange
+    counter = registry.counter("requests", "Handled requests", ["route"])
+
+    # Act
+    counter.inc(route="/extract")
+    counter.inc(2, route="/extract")
+    counter.inc(route="/index")
+
+    # Assert
+    output = registry.render()
+    assert "# TYPE test_requests counter" in output
+    assert 'test_requests_total{route="/extract"} 3' in output
+    assert 'test_requests_total{route="/index"} 1' in output
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    # Arrange
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=[0.1, 1.0])
+
+    # Act
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    # Assert
+    output = registry.render()
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in output
+    assert 'test_latency_seconds_bucket{le="1"} 2' in output
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in output
+    assert "test_latency_seconds_count 3" in output
+    assert histogram.sum() == pytest.approx(5.55)
+
+
+def test_register_returns_existing_metric(registry):
+    # Act
+    first = registry.gauge("connections", "Open connections")
+    second = registry.gauge("connections", "Open connections")
+
+    # Assert
+    assert first is second
+    with pytest.raises(ValueError):
+        registry.counter("connections", "Open connections")
+
+
+def test_wrong_labels_are_rejected(registry):
+    # Arrange
+    gauge = registry.gauge("in_flight", "In-flight requests", ["lane"])
+
+    # Act & Assert
+    with pytest.raises(ValueError):
+        gauge.set(1)
+
+
+def test_metrics_must_define_their_samples():
+    # Arrange
+    class Incomplete(_Metric):
+        metric_type = "gauge"
+
+    # Act & Assert
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "Metric without samples")
+
+
+def test_constant_labels_are_added_to_every_sample(registry):
+    # Arrange
+    counter = registry.counter("requests", "Handled requests", ["route"])
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=[1.0])
+    counter.inc(route="/extract")
+    histogram.observe(0.5)
+
+    # Act
+    registry.set_constant_labels(worker=2)
+    output = registry.render()
+
+    # Assert
+    assert 'test_requests_total{worker="2",route="/extract"} 1' in output
+    assert 'test_latency_seconds_bucket{worker="2",le="1"} 1' in output
+    assert 'test_latency_seconds_count{worker="2"} 1' in output
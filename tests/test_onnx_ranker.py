@@ -0,0 +1,143 @@
+import pytest
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from haystack.dataclasses import Document
+from app.core.components.onnx_ranker import (
+    FP32_MODEL_FILE,
+    INT8_MODEL_FILE,
+    OnnxCrossEncoderRanker,
+    _export_fp32,
+    export_onnx_model,
+)
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+VOCABULARY = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + [
+    "acetaminophen",
+    "amoxicillin",
+    "ibuprofen",
+    "oral",
+    "tablet",
+    "capsule",
+    "mg",
+    "325",
+    "500",
+]
+
+
+@pytest.fixture(scope="module")
+def tiny_cross_encoder(tmp_path_factory):
+    """Randomly initialised BERT cross-encoder saved locally"""
+    model_dir = tmp_path_factory.mktemp("tiny-cross-encoder")
+    vocab_file = model_dir / "vocab.txt"
+    vocab_file.write_text("\n".join(VOCABULARY))
+    transformers.BertTokenizerFast(vocab_file=str(vocab_file)).save_pretrained(
+        model_dir
+    )
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=len(VOCABULARY),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        num_labels=1,
+    )
+    transformers.BertForSequenceClassification(config).save_pretrained(model_dir)
+    return str(model_dir)
+
+
+@pytest.fixture
+def documents():
+    return [
+        Document(id="1", content="Acetaminophen 325 MG Oral Tablet"),
+        Document(id="2", content="Amoxicillin 500 MG Oral Capsule"),
+        Document(id="3", content="Ibuprofen 500 MG Oral Tablet"),
+    ]
+
+
+def _torch_logits(model_dir, query, texts):
+    tokenizer = transformers.AutoTokenizer.from_pretrained(model_dir)
+    model = transformers.AutoModelForSequenceClassification.from_pretrained(model_dir)
+    features = tokenizer([query] * len(texts), texts, padding=True, return_tensors="pt")
+    with torch.no_grad():
+        return model(**features).logits[:, 0].numpy()
+
+
+def test_fp32_export_matches_pytorch(tiny_cross_encoder, documents, tmp_path):
+    # Arrange
+    ranker = OnnxCrossEncoderRanker(
+        model=tiny_cross_encoder, quantize=False, batch_size=2, cache_dir=tmp_path
+    )
+    texts = [doc.content for doc in documents]
+
+    # Act
+    ranker.warm_up()
+    scores = ranker.score("acetaminophen 325 mg", texts)
+
+    # Assert
+    assert (ranker.model_dir / FP32_MODEL_FILE).exists()
+    np.testing.assert_allclose(
+        scores,
+        _torch_logits(tiny_cross_encoder, "acetaminophen 325 mg", texts),
+        atol=1e-4,
+    )
+
+
+def test_int8_ranker_returns_sorted_top_k(tiny_cross_encoder, documents, tmp_path):
+    # Arrange
+    ranker = OnnxCrossEncoderRanker(
+        model=tiny_cross_encoder, top_k=2, max_length=8, cache_dir=tmp_path
+    )
+
+    # Act
+    ranker.warm_up()
+    result = ranker.run(query="ibuprofen tablet", documents=documents)
+
+    # Assert
+    assert (ranker.model_dir / INT8_MODEL_FILE).exists()
+    ranked = result["documents"]
+    assert len(ranked) == 2
+    assert ranked[0].score >= ranked[1].score
+    assert all(0.0 <= doc.score <= 1.0 for doc in ranked)
+    assert all(doc.score is None for doc in documents)
+
+
+def test_run_requires_warm_up(documents):
+    # Arrange
+    ranker = OnnxCrossEncoderRanker(model="unused")
+
+    # Act & Assert
+    with pytest.raises(RuntimeError):
+        ranker.run(query="ibuprofen", documents=documents)
+
+
+def test_concurrent_exports_run_once_and_leave_no_partial_files(
+    tiny_cross_encoder, tmp_path
+):
+    # Arrange
+    output_dir = tmp_path / "onnx"
+
+    # Act
+    with patch(
+        "app.core.components.onnx_ranker._export_fp32", side_effect=_export_fp32
+    ) as export:
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            paths = list(
+                pool.map(
+                    lambda _: export_onnx_model(tiny_cross_encoder, output_dir),
+                    range(3),
+                )
+            )
+
+    # Assert
+    assert export.call_count == 1
+    assert set(paths) == {output_dir / INT8_MODEL_FILE}
+    assert (output_dir / FP32_MODEL_FILE).exists()
+    assert (output_dir / "tokenizer.json").exists()
+    assert not [path for path in output_dir.iterdir() if "tmp" in path.name]
+    assert not [
+        path for path in output_dir.iterdir() if path.name.startswith(".export-")
+    ]
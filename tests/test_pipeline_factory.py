@@ -2,7 +2,6 @@ import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from haystack import Pipeline
 from haystack.components.writers import DocumentWriter
-from haystack.components.builders.prompt_builder import PromptBuilder
 from haystack.components.rankers import TransformersSimilarityRanker
 from haystack.document_stores.types import DuplicatePolicy
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
@@ -15,6 +14,17 @@ from haystack_integrations.components.embedders.fastembed import (
     FastembedSparseDocumentEmbedder,
 )
 from app.core.pipeline.factory import PipelineFactory
+from app.core.components.onnx_ranker import OnnxCrossEncoderRanker
+from app.core.components.adaptive_ranker import AdaptiveRanker
+from app.core.components.cached_generator import CachedGenerator
+from app.core.components.prompt_builder import MedicationPromptBuilder
+from app.core.components.sidecar import (
+    SidecarRanker,
+    SidecarTextEmbedder,
+    SidecarDocumentEmbedder,
+    SidecarSparseTextEmbedder,
+    SidecarSparseDocumentEmbedder,
+)
 
 
 @pytest.fixture
@@ -32,10 +42,9 @@ def mock_document_store():
 
 
 @pytest.fixture
-def mock_document_store_factory(mock_document_store):
-    with patch("app.core.pipeline.factory.DocumentStoreFactory") as mock:
-        instance = mock.return_value
-        instance.create_document_store.return_value = mock_document_store
+def mock_document_store_registry(mock_document_store):
+    with patch("app.core.pipeline.factory.document_store_registry") as mock:
+        mock.get_document_store.return_value = mock_document_store
         yield mock
 
 
@@ -44,9 +53,23 @@ def mock_settings():
     with patch("app.core.pipeline.factory.settings") as mock:
         mock.EMBEDDING_MODEL_DENSE = "BAAI/bge-small-en-v1.5"
         mock.EMBEDDING_MODEL_SPARSE = "Qdrant/bm42-all-minilm-l6-v2-attentions"
+        mock.EMBEDDING_THREADS = None
         mock.RETRIEVER_TOP_K = 4
+        mock.QDRANT_RETURN_EMBEDDING = False
         mock.RERANKER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
         mock.RERANKER_TOP_K = 2
+        mock.RERANKER_BACKEND = "transformers"
+        mock.RERANKER_BATCH_SIZE = 16
+        mock.RERANKER_MAX_LENGTH = 256
+        mock.RERANKER_THREADS = 2
+        mock.RERANKER_ONNX_QUANTIZE = True
+        mock.RERANKER_ONNX_DIR = "models/onnx"
+        mock.RERANKER_SKIP_MARGIN = None
+        mock.RERANKER_SKIP_EXACT_MATCH = True
+        mock.RERANKER_MIN_BUDGET_MS = None
+        mock.REQUEST_MAX_TIMEOUT_MS = 120000.0
+        mock.INFERENCE_SOCKET = None
+        mock.INFERENCE_TIMEOUT = 30.0
         mock.OLLAMA_MODEL = "llama3.2:latest"
         mock.OLLAMA_API_URL = "http://localhost:11434"
         mock.OLLAMA_TEMPERATURE = 0.0
@@ -75,7 +98,7 @@ def get_pipeline_connections(pipeline: Pipeline):
 
 @pytest.mark.asyncio
 async def test_create_indexing_pipeline_success(
-    factory, mock_document_store_factory, mock_logger
+    factory, mock_document_store_registry, mock_logger
 ):
     """Test successful creation of indexing pipeline"""
     # Act
@@ -100,7 +123,7 @@ async def test_create_indexing_pipeline_success(
 
 @pytest.mark.asyncio
 async def test_create_query_pipeline_success(
-    factory, mock_document_store_factory, mock_logger
+    factory, mock_document_store_registry, mock_logger
 ):
     """Test successful creation of query pipeline"""
     # Act
@@ -130,12 +153,12 @@ async def test_create_query_pipeline_success(
 
 @pytest.mark.asyncio
 async def test_indexing_pipeline_creation_failure(
-    factory, mock_document_store_factory, mock_logger
+    factory, mock_document_store_registry, mock_logger
 ):
     """Test handling of indexing pipeline creation failure"""
     # Arrange
-    mock_document_store_factory.return_value.create_document_store.side_effect = (
-        Exception("Connection failed")
+    mock_document_store_registry.get_document_store.side_effect = Exception(
+        "Connection failed"
     )
 
     # Act & Assert
@@ -147,12 +170,12 @@ async def test_indexing_pipeline_creation_failure(
 
 @pytest.mark.asyncio
 async def test_query_pipeline_creation_failure(
-    factory, mock_document_store_factory, mock_logger
+    factory, mock_document_store_registry, mock_logger
 ):
     """Test handling of query pipeline creation failure"""
     # Arrange
-    mock_document_store_factory.return_value.create_document_store.side_effect = (
-        Exception("Connection failed")
+    mock_document_store_registry.get_document_store.side_effect = Exception(
+        "Connection failed"
     )
 
     # Act & Assert
@@ -186,6 +209,26 @@ def test_create_text_embedders(factory):
     assert sparse_embedder.model_name == "Qdrant/bm42-all-minilm-l6-v2-attentions"
 
 
+def test_create_sidecar_components(factory, mock_settings):
+    """Test that an inference socket swaps in the inference server components"""
+    # Arrange
+    mock_settings.INFERENCE_SOCKET = "/tmp/inference.sock"
+
+    # Act
+    text_embedders = factory._create_text_embedders()
+    document_embedders = factory._create_document_embedders()
+    reranker = factory._create_reranker()
+
+    # Assert
+    assert isinstance(text_embedders[0], SidecarTextEmbedder)
+    assert isinstance(text_embedders[1], SidecarSparseTextEmbedder)
+    assert isinstance(document_embedders[0], SidecarDocumentEmbedder)
+    assert isinstance(document_embedders[1], SidecarSparseDocumentEmbedder)
+    assert isinstance(reranker, SidecarRanker)
+    assert reranker.socket_path == "/tmp/inference.sock"
+    assert reranker.top_k == 2
+
+
 def test_create_retriever(factory, mock_document_store):
     """Test creation of retriever"""
     # Act
@@ -195,6 +238,7 @@ def test_create_retriever(factory, mock_document_store):
     assert isinstance(retriever, QdrantHybridRetriever)
     assert retriever._document_store is mock_document_store
     assert retriever._top_k == 4
+    assert retriever._return_embedding is False
 
 
 def test_create_reranker(factory):
@@ -207,6 +251,51 @@ def test_create_reranker(factory):
     assert reranker.top_k == 2
 
 
+def test_create_onnx_reranker(factory, mock_settings):
+    """Test creation of the ONNX reranker when selected by settings"""
+    # Arrange
+    mock_settings.RERANKER_BACKEND = "onnx"
+
+    # Act
+    with patch.object(OnnxCrossEncoderRanker, "warm_up") as mock_warm_up:
+        reranker = factory._create_reranker()
+
+    # Assert
+    assert isinstance(reranker, OnnxCrossEncoderRanker)
+    assert reranker.top_k == 2
+    assert reranker.threads == 2
+    assert reranker.max_length == 256
+    assert reranker.quantize is True
+    mock_warm_up.assert_called_once()
+
+
+def test_create_adaptive_reranker(factory, mock_settings):
+    """Test that a skip margin wraps the reranker in the adaptive bypass"""
+    # Arrange
+    mock_settings.RERANKER_BACKEND = "onnx"
+    mock_settings.RERANKER_SKIP_MARGIN = 0.3
+
+    # Act
+    with patch.object(OnnxCrossEncoderRanker, "warm_up"):
+        reranker = factory._create_reranker()
+
+    # Assert
+    assert isinstance(reranker, AdaptiveRanker)
+    assert isinstance(reranker.ranker, OnnxCrossEncoderRanker)
+    assert reranker.policy.margin == 0.3
+    assert reranker.top_k == 2
+
+
+def test_create_reranker_unknown_backend(factory, mock_settings):
+    """Test that an unknown reranker backend is rejected"""
+    # Arrange
+    mock_settings.RERANKER_BACKEND = "tensorrt"
+
+    # Act & Assert
+    with pytest.raises(ValueError):
+        factory._create_reranker()
+
+
 def test_create_generator(factory):
     """Test creation of generator"""
     # Act
@@ -218,13 +307,23 @@ def test_create_generator(factory):
     assert generator.url == "http://localhost:11434"
 
 
+def test_create_cached_generator(factory, tmp_path):
+    """Test creation of a generator backed by the LLM output cache"""
+    # Act
+    generator = factory._create_generator(str(tmp_path / "llm.jsonl"))
+
+    # Assert
+    assert isinstance(generator, CachedGenerator)
+    assert isinstance(generator.generator, OllamaGenerator)
+
+
 def test_create_prompt_builder(factory):
     """Test creation of prompt builder"""
     # Act
     builder = factory._create_prompt_builder()
 
     # Assert
-    assert isinstance(builder, PromptBuilder)
+    assert isinstance(builder, MedicationPromptBuilder)
 
 
 def test_create_document_writer(factory, mock_document_store):
@@ -0,0 +1,149 @@
+import time
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.config.settings import settings
+from app.core.monitoring.profiler import (
+    SamplingProfiler,
+    SlowRequestProfiler,
+    collapse,
+)
+from app.main import create_app
+
+
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture
+def admin_client():
+    with patch.object(settings, "ADMIN_TOKEN", "secret"):
+        yield TestClient(create_app())
+
+
+def test_collapse_counts_identical_stacks():
+    # Act
+    output = collapse(["a;b", "a;c", "a;b"])
+
+    # Assert
+    assert output.splitlines() == ["a;b 2", "a;c 1"]
+
+
+def test_sampling_profiler_sees_running_function():
+    # Arrange
+    profiler = SamplingProfiler(interval=0.001).start()
+
+    # Act
+    busy_wait(0.1)
+    profiler.stop()
+
+    # Assert
+    assert "busy_wait" in profiler.collapsed()
+
+
+def test_slow_request_profiler_keeps_only_slow_requests():
+    # Arrange
+    profiler = SlowRequestProfiler(threshold=0.05, interval=0.001)
+    profiler.start()
+
+    # Act
+    start = time.perf_counter()
+    busy_wait(0.01)
+    fast = profiler.record("GET /fast", start, time.perf_counter())
+    start = time.perf_counter()
+    busy_wait(0.1)
+    slow = profiler.record("GET /slow", start, time.perf_counter())
+    profiler.stop()
+
+    # Assert
+    assert fast is None
+    assert slow["request"] == "GET /slow"
+    assert "busy_wait" in slow["collapsed"]
+    assert list(profiler.profiles) == [slow]
+
+
+async def test_slow_request_profile_includes_work_on_executor_threads():
+    # Arrange
+    profiler = SlowRequestProfiler(threshold=0.05, interval=0.001)
+    profiler.start()
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pipeline-run-")
+
+    # Act
+    start = time.perf_counter()
+    await asyncio.get_running_loop().run_in_executor(executor, busy_wait, 0.1)
+    profile = profiler.record("POST /extract", start, time.perf_counter())
+    profiler.stop()
+    executor.shutdown()
+
+    # Assert
+    assert "busy_wait" in profile["collapsed"]
+    assert "concurrent.futures.thread:_worker" in profile["collapsed"]
+
+
+def test_sampler_skips_executor_threads_waiting_for_work():
+    # Arrange
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.submit(lambda: None).result()
+    profiler = SamplingProfiler(interval=0.001).start()
+
+    # Act
+    busy_wait(0.05)
+    profiler.stop()
+    executor.shutdown()
+
+    # Assert
+    assert "busy_wait" in profiler.collapsed()
+    assert "concurrent.futures.thread" not in profiler.collapsed()
+
+
+def test_admin_endpoints_disabled_without_token():
+    # Arrange
+    client = TestClient(create_app())
+
+    # Act
+    response = client.get("/admin/profile", params={"seconds": 0.1})
+
+    # Assert
+    assert response.status_code == 404
+
+
+def test_profile_endpoint_requires_token(admin_client):
+    # Act
+    response = admin_client.get(
+        "/admin/profile",
+        params={"seconds": 0.1},
+        headers={"Authorization": "Bearer wrong"},
+    )
+
+    # Assert
+    assert response.status_code == 401
+
+
+def test_profile_endpoint_returns_collapsed_stacks(admin_client):
+    # Act
+    response = admin_client.get(
+        "/admin/profile",
+        params={"seconds": 0.2, "interval_ms": 1},
+        headers={"Authorization": "Bearer secret"},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.text
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.splitlines())
+
+
+def test_profile_endpoint_caps_duration(admin_client):
+    # Act
+    response = admin_client.get(
+        "/admin/profile",
+        params={"seconds": settings.PROFILE_MAX_SECONDS + 1},
+        headers={"Authorization": "Bearer secret"},
+    )
+
+    # Assert
+    assert response.status_code == 422
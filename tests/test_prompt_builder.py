@@ -0,0 +1,71 @@
+from haystack.components.builders import PromptBuilder
+from haystack.dataclasses import Document
+
+from app.core.components.prompt_builder import (
+    PROMPT_BUILD_SECONDS,
+    MedicationPromptBuilder,
+)
+from app.prompts.template import MEDICATION_NER, PROMPT_EXAMPLE_KEY
+from app.schemas.medication import MedicationEntity
+from app.utils.common import create_index_documents
+
+
+def _medications():
+    return [
+        MedicationEntity(
+            original_text="Acetaminophen 325 MG Oral Tablet",
+            drug_name=["Acetaminophen"],
+            dosage=["325 MG"],
+            administration_type=["Oral Tablet"],
+        ),
+        MedicationEntity(
+            original_text="budesonide 0.125 MG/ML Inhalation Suspension [Pulmicort]",
+            drug_name=["budesonide"],
+            brand=["Pulmicort"],
+        ),
+    ]
+
+
+def test_prompt_matches_the_jinja_template():
+    # Arrange
+    medications = _medications()
+    legacy = [
+        Document(content=med.original_text, meta=med.model_dump())
+        for med in medications
+    ]
+    query = "Ibuprofen 200 MG Oral Capsule"
+    builds = PROMPT_BUILD_SECONDS.count()
+
+    # Act
+    prompt = MedicationPromptBuilder().run(
+        query=query, documents=create_index_documents(medications)
+    )["prompt"]
+
+    # Assert
+    expected = PromptBuilder(MEDICATION_NER).run(query=query, documents=legacy)
+    assert prompt == expected["prompt"]
+    assert PROMPT_BUILD_SECONDS.count() == builds + 1
+
+
+def test_documents_without_a_pre_rendered_example_are_rendered_on_the_fly():
+    # Arrange
+    medication = _medications()[0]
+    indexed = create_index_documents([medication])[0]
+    legacy = Document(content=medication.original_text, meta=medication.model_dump())
+
+    # Act
+    from_meta = MedicationPromptBuilder().run(query="q", documents=[indexed])
+    rendered = MedicationPromptBuilder().run(query="q", documents=[legacy])
+
+    # Assert
+    assert PROMPT_EXAMPLE_KEY in indexed.meta
+    assert from_meta["prompt"] == rendered["prompt"]
+
+
+def test_prompt_without_documents_has_no_examples():
+    # Act
+    prompt = MedicationPromptBuilder().run(query="Aspirin 81 MG")["prompt"]
+
+    # Assert
+    assert "Query:" not in prompt
+    assert prompt == PromptBuilder(MEDICATION_NER).run(query="Aspirin 81 MG")["prompt"]
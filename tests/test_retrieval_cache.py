@@ -0,0 +1,104 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from haystack import Pipeline
+from haystack.dataclasses import Document
+
+from app.core.document_store.version import IndexVersion
+from app.core.pipeline.factory import PipelineFactory
+from app.core.services.pipeline import PipelineService
+from app.core.services.retrieval_cache import (
+    RETRIEVAL_CACHE_SAVED_SECONDS,
+    RetrievalCache,
+)
+
+
+@pytest.fixture
+def version(tmp_path, monkeypatch):
+    version = IndexVersion(tmp_path / "index_version")
+    monkeypatch.setattr("app.core.services.pipeline.index_version", version)
+    return version
+
+
+def _reranked():
+    return [
+        Document(id="a", content="Aspirin 81 MG", embedding=[0.1], score=0.9),
+        Document(id="b", content="Aspirin 325 MG", embedding=[0.2], score=0.4),
+    ]
+
+
+def test_index_version_bumps_are_monotonic(tmp_path):
+    # Arrange
+    version = IndexVersion(tmp_path / "index_version")
+
+    # Act
+    before = version.current()
+    bumps = [version.bump(), version.bump()]
+
+    # Assert
+    assert before == 0
+    assert bumps == [1, 2]
+    assert IndexVersion(tmp_path / "index_version").current() == 2
+
+
+def test_cache_returns_scored_documents_until_the_index_version_changes():
+    # Arrange
+    cache = RetrievalCache(max_entries=10)
+    saved = RETRIEVAL_CACHE_SAVED_SECONDS.value()
+    cache.put("aspirin", 1, _reranked(), seconds=0.25)
+
+    # Act
+    hit = cache.get("aspirin", 1)
+    stale = cache.get("aspirin", 2)
+
+    # Assert
+    assert [(d.id, d.score) for d in hit] == [("a", 0.9), ("b", 0.4)]
+    assert hit[0].embedding is None
+    assert stale is None
+    assert len(cache) == 0
+    assert RETRIEVAL_CACHE_SAVED_SECONDS.value() == pytest.approx(saved + 0.25)
+
+
+def test_cache_evicts_the_least_recently_used_text():
+    # Arrange
+    cache = RetrievalCache(max_entries=2)
+    for text in ("a", "b"):
+        cache.put(text, 0, _reranked(), seconds=0.1)
+    cache.get("a", 0)
+
+    # Act
+    cache.put("c", 0, _reranked(), seconds=0.1)
+
+    # Assert
+    assert cache.get("b", 0) is None
+    assert cache.get("a", 0) is not None
+    assert cache.get("c", 0) is not None
+
+
+async def test_cache_hit_skips_retrieval_and_reranking(version):
+    # Arrange
+    factory = Mock(spec=PipelineFactory)
+    factory.create_query_pipeline = AsyncMock(return_value=Mock(spec=Pipeline))
+    factory.create_generation_pipeline = AsyncMock(return_value=Mock(spec=Pipeline))
+    service = PipelineService(factory, retrieval_cache=RetrievalCache(10))
+    service._run_pipeline = AsyncMock(
+        side_effect=lambda pipeline, data, **kwargs: {
+            "llm": {"replies": ["{}"]},
+            "reranker": {"documents": _reranked()},
+        }
+    )
+
+    # Act
+    await service.execute_query_pipeline("Aspirin 81 MG")
+    await service.execute_query_pipeline("Aspirin 81 MG")
+    version.bump()
+    await service.execute_query_pipeline("Aspirin 81 MG")
+
+    # Assert
+    assert factory.create_query_pipeline.await_count == 2
+    factory.create_generation_pipeline.assert_awaited_once()
+    generation_input = service._run_pipeline.call_args_list[1].args[1]
+    assert [d.id for d in generation_input["prompt_builder"]["documents"]] == [
+        "a",
+        "b",
+    ]
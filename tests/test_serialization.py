@@ -0,0 +1,50 @@
+from app.core.services.records import ExtractedMedication, ExtractionResult
+from app.schemas.medication import MedicationEntity, MedicationResponse
+from app.utils.serialization import dumps, loads
+
+
+def test_extracted_medication_coerces_loosely_typed_llm_output():
+    # Arrange
+    reply = {"drug_name": "Aspirin", "dosage": [81, "MG"], "brand": None}
+
+    # Act
+    entities = ExtractedMedication.from_dict(reply, "Aspirin 81 MG")
+
+    # Assert
+    assert entities.original_text == "Aspirin 81 MG"
+    assert entities.drug_name == ["Aspirin"]
+    assert entities.dosage == ["81", "MG"]
+    assert entities.brand == []
+    assert entities.quantity == []
+
+
+def test_extraction_result_encodes_to_the_response_schema():
+    # Arrange
+    result = ExtractionResult(
+        results=[ExtractedMedication("Aspirin 81 MG", drug_name=["Aspirin"])],
+        processing_time=0.5,
+        degraded=["rerank_skipped"],
+    )
+
+    # Act
+    response = MedicationResponse.model_validate_json(dumps(result))
+
+    # Assert
+    assert response.results[0].drug_name == ["Aspirin"]
+    assert response.degraded == ["rerank_skipped"]
+
+
+def test_encoding_keeps_non_ascii_text_and_models():
+    # Arrange
+    payload = {
+        "result": ExtractedMedication("Ibuprofène 200 MG"),
+        "entity": MedicationEntity(original_text="Aspirin"),
+    }
+
+    # Act
+    encoded = dumps(payload)
+
+    # Assert
+    assert "Ibuprofène".encode("utf-8") in encoded
+    assert loads(encoded)["entity"]["original_text"] == "Aspirin"
+    assert loads(encoded)["result"]["original_text"] == "Ibuprofène 200 MG"
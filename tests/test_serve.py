@@ -0,0 +1,40 @@
+import os
+import signal
+import socket
+import time
+from unittest.mock import patch
+from app.serve import PreforkServer, _bind
+
+
+def test_bind_creates_inheritable_listening_socket():
+    # Act
+    sock = _bind("127.0.0.1", 0)
+
+    # Assert
+    assert sock.get_inheritable()
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_ACCEPTCONN)
+    sock.close()
+
+
+def test_prefork_server_forks_workers_after_preloading(tmp_path):
+    # Arrange
+    def worker(sock):
+        # Each worker records itself, the last one asks the parent to stop
+        (tmp_path / str(os.getpid())).write_text(str(sock.getsockname()[1]))
+        if len(list(tmp_path.iterdir())) == 3:
+            os.kill(os.getppid(), signal.SIGTERM)
+        time.sleep(30)
+
+    server = PreforkServer("127.0.0.1", 0, workers=3)
+
+    # Act
+    with (
+        patch("app.serve._run_worker", side_effect=worker),
+        patch("app.core.pipeline.models.preload_models") as preload,
+    ):
+        server.run()
+
+    # Assert
+    assert preload.called
+    assert len(list(tmp_path.iterdir())) == 3
+    assert not server._children
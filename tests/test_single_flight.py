@@ -0,0 +1,201 @@
+import asyncio
+from unittest.mock import Mock
+
+from app.core.pipeline.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+    deadline_context,
+)
+from app.core.services.medication import (
+    EXTRACTION_TEXTS_DEDUPLICATED,
+    MedicationService,
+)
+from app.core.services.single_flight import SingleFlight, normalize_text
+
+
+def _slow_pipeline_service(delay: float = 0.05) -> Mock:
+    async def execute_query_pipeline(text):
+        await asyncio.sleep(delay)
+        return {"llm": {"replies": [f'{{"drug_name": ["{text.split()[0]}"]}}']}}
+
+    pipeline_service = Mock()
+    pipeline_service.execute_query_pipeline = Mock(side_effect=execute_query_pipeline)
+    return pipeline_service
+
+
+async def test_concurrent_calls_with_the_same_key_share_one_execution():
+    # Arrange
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "result"
+
+    # Act
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)))
+    again = await flight.do("key", work)
+
+    # Assert
+    assert results == [("result", False), ("result", True), ("result", True)]
+    assert again == ("result", False)
+    assert len(calls) == 2
+    assert flight.in_flight == 0
+
+
+async def test_shared_execution_survives_the_leader_being_cancelled():
+    # Arrange
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    leader = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+
+    # Act
+    leader.cancel()
+    result = await follower
+
+    # Assert
+    assert result == ("result", True)
+
+
+async def test_repeated_texts_in_a_request_are_extracted_once():
+    # Arrange
+    pipeline_service = _slow_pipeline_service(0.0)
+    service = MedicationService(pipeline_service)
+    deduplicated = EXTRACTION_TEXTS_DEDUPLICATED.value(scope="request")
+
+    # Act
+    response = await service.extract_entities(
+        ["Aspirin 81 MG", "Ibuprofen 200 MG", " Aspirin  81 MG", "Aspirin 81 MG"]
+    )
+
+    # Assert
+    assert pipeline_service.execute_query_pipeline.call_count == 2
+    assert [r.drug_name for r in response.results] == [
+        ["Aspirin"],
+        ["Ibuprofen"],
+        ["Aspirin"],
+        ["Aspirin"],
+    ]
+    assert response.results[2].original_text == " Aspirin  81 MG"
+    assert EXTRACTION_TEXTS_DEDUPLICATED.value(scope="request") == deduplicated + 2
+
+
+async def test_concurrent_requests_share_in_flight_extractions():
+    # Arrange
+    pipeline_service = _slow_pipeline_service()
+    deduplicated = EXTRACTION_TEXTS_DEDUPLICATED.value(scope="in_flight")
+
+    # Act
+    responses = await asyncio.gather(
+        *(
+            MedicationService(pipeline_service).extract_entities(["Metformin 500 MG"])
+            for _ in range(3)
+        )
+    )
+
+    # Assert
+    assert pipeline_service.execute_query_pipeline.call_count == 1
+    assert all(r.results[0].drug_name == ["Metformin"] for r in responses)
+    assert EXTRACTION_TEXTS_DEDUPLICATED.value(scope="in_flight") == deduplicated + 2
+
+
+def _deadline_bound_pipeline_service(delay: float) -> Mock:
+    """Pipeline taking ``delay`` seconds that stops at the caller's deadline"""
+
+    async def execute_query_pipeline(text):
+        deadline = current_deadline()
+        if deadline is not None and deadline.remaining() < delay:
+            await asyncio.sleep(deadline.remaining())
+            deadline.degrade("deadline_exceeded")
+            raise DeadlineExceeded("Deadline exceeded during pipeline run")
+        await asyncio.sleep(delay)
+        return {"llm": {"replies": [f'{{"drug_name": ["{text.split()[0]}"]}}']}}
+
+    pipeline_service = Mock()
+    pipeline_service.execute_query_pipeline = Mock(side_effect=execute_query_pipeline)
+    return pipeline_service
+
+
+async def _extract(pipeline_service: Mock, timeout: float, start_after: float = 0):
+    await asyncio.sleep(start_after)
+    with deadline_context(Deadline(timeout)):
+        return await MedicationService(pipeline_service).extract_entities(
+            ["Metformin 500 MG"]
+        )
+
+
+async def test_a_request_is_not_answered_with_another_requests_timeout():
+    # Arrange
+    pipeline_service = _deadline_bound_pipeline_service(0.05)
+
+    # Act
+    short, long = await asyncio.gather(
+        _extract(pipeline_service, timeout=0.02),
+        _extract(pipeline_service, timeout=5.0, start_after=0.005),
+    )
+
+    # Assert
+    assert short.results[0].drug_name == []
+    assert short.degraded == ["deadline_exceeded"]
+    assert long.results[0].drug_name == ["Metformin"]
+    assert long.degraded == []
+    assert pipeline_service.execute_query_pipeline.call_count == 2
+
+
+async def test_joining_request_waits_no_longer_than_its_own_deadline():
+    # Arrange
+    pipeline_service = _deadline_bound_pipeline_service(0.2)
+    start = asyncio.get_running_loop().time()
+
+    async def timed(*args, **kwargs):
+        response = await _extract(*args, **kwargs)
+        return response, asyncio.get_running_loop().time() - start
+
+    # Act
+    (long, _), (short, short_elapsed) = await asyncio.gather(
+        timed(pipeline_service, timeout=5.0),
+        timed(pipeline_service, timeout=0.03, start_after=0.005),
+    )
+
+    # Assert
+    assert short_elapsed < 0.15
+    assert short.results[0].drug_name == []
+    assert short.degraded == ["deadline_exceeded"]
+    assert long.results[0].drug_name == ["Metformin"]
+    assert pipeline_service.execute_query_pipeline.call_count == 1
+
+
+async def test_joining_call_times_out_without_cancelling_the_shared_work():
+    # Arrange
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    leader = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+
+    # Act
+    try:
+        await flight.do("key", work, timeout=0.01)
+        timed_out = False
+    except asyncio.TimeoutError:
+        timed_out = True
+
+    # Assert
+    assert timed_out
+    assert await leader == ("result", False)
+
+
+def test_normalize_text_ignores_surrounding_and_repeated_spaces():
+    assert normalize_text("  Aspirin\t81  MG ") == "Aspirin 81 MG"
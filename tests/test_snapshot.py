@@ -0,0 +1,157 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from haystack.dataclasses import Document, SparseEmbedding
+from app.schemas.medication import MedicationEntity
+from app.core.document_store.snapshot import (
+    SnapshotStore,
+    IndexSnapshot,
+    compute_source_digest,
+    CURRENT_POINTER,
+    SNAPSHOT_FORMAT_VERSION,
+)
+from app.core.initialization.data_loader import DataLoader
+
+
+@pytest.fixture
+def embedded_documents():
+    return [
+        Document(
+            id="0",
+            content="Acetaminophen 325 MG Oral Tablet",
+            meta=MedicationEntity(
+                original_text="Acetaminophen 325 MG Oral Tablet",
+                drug_name=["Acetaminophen"],
+                dosage=["325 MG"],
+                administration_type=["Oral Tablet"],
+            ),
+            embedding=[0.1, 0.2, 0.3],
+            sparse_embedding=SparseEmbedding(indices=[1, 7], values=[0.5, 1.5]),
+        ),
+        Document(
+            id="1",
+            content="budesonide 0.125 MG/ML Inhalation Suspension [Pulmicort]",
+            meta={"original_text": "budesonide", "brand": ["Pulmicort"]},
+            embedding=[0.4, 0.5, 0.6],
+            sparse_embedding=SparseEmbedding(indices=[3], values=[2.0]),
+        ),
+    ]
+
+
+def test_write_and_load_snapshot(tmp_path, embedded_documents):
+    store = SnapshotStore(tmp_path)
+    digest = compute_source_digest(b"[]", "dense", "sparse", 3)
+
+    store.write(embedded_documents, digest)
+    snapshot = store.load(digest)
+
+    assert isinstance(snapshot, IndexSnapshot)
+    assert len(snapshot) == 2
+    assert snapshot.manifest.sparse_nnz == 3
+    assert snapshot.dense.shape == (2, 3)
+    assert not snapshot.dense.flags.writeable
+
+    documents = snapshot.to_documents()
+    assert [doc.id for doc in documents] == ["0", "1"]
+    assert documents[0].meta["drug_name"] == ["Acetaminophen"]
+    assert documents[1].meta["brand"] == ["Pulmicort"]
+    assert documents[0].embedding == pytest.approx([0.1, 0.2, 0.3])
+    assert documents[0].sparse_embedding.indices == [1, 7]
+    assert documents[1].sparse_embedding.values == pytest.approx([2.0])
+
+
+def test_load_returns_none_for_stale_or_missing_snapshot(tmp_path, embedded_documents):
+    store = SnapshotStore(tmp_path)
+    assert store.load("missing") is None
+
+    store.write(embedded_documents, compute_source_digest(b"old"))
+
+    assert store.load(compute_source_digest(b"new")) is None
+
+
+def test_write_publishes_new_version_atomically(tmp_path, embedded_documents):
+    store = SnapshotStore(tmp_path)
+    old_digest = compute_source_digest(b"old")
+    new_digest = compute_source_digest(b"new")
+
+    store.write(embedded_documents, old_digest)
+    store.write(embedded_documents[:1], new_digest)
+
+    assert len(store.load(new_digest)) == 1
+    assert (tmp_path / CURRENT_POINTER).read_text() == (
+        f"v{SNAPSHOT_FORMAT_VERSION}-{new_digest[:16]}"
+    )
+    assert not any(path.name.startswith(".tmp-") for path in tmp_path.iterdir())
+
+
+def test_write_rejects_documents_without_embeddings(tmp_path):
+    store = SnapshotStore(tmp_path)
+
+    with pytest.raises(ValueError):
+        store.write([Document(id="0", content="text")], compute_source_digest(b""))
+
+    assert not (tmp_path / CURRENT_POINTER).exists()
+
+
+def test_iter_batches_rebuilds_every_document_once(tmp_path, embedded_documents):
+    # Arrange
+    store = SnapshotStore(tmp_path)
+    digest = compute_source_digest(b"[]")
+    snapshot = store.write(embedded_documents * 3, digest)
+
+    # Act
+    batches = list(snapshot.iter_batches(batch_size=4))
+
+    # Assert
+    assert [len(batch) for batch in batches] == [4, 2]
+    assert [doc.id for batch in batches for doc in batch] == [
+        doc.id for doc in snapshot.to_documents()
+    ]
+
+
+async def test_loader_waits_for_the_build_lock_off_the_event_loop(
+    tmp_path, embedded_documents
+):
+    # Arrange
+    loader = DataLoader()
+    loader.snapshot_store = SnapshotStore(tmp_path)
+    loader.snapshot_store.write(embedded_documents, loader._source_digest())
+    writer_pipeline = Mock()
+    factory = Mock()
+    factory.get_document_store = AsyncMock(
+        return_value=Mock(**{"rekey_documents.return_value": 0})
+    )
+    factory.create_writer_pipeline = AsyncMock(return_value=writer_pipeline)
+    held, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        # Another worker still building the snapshot
+        with loader.snapshot_store.build_lock():
+            held.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    held.wait(5)
+
+    # Act
+    with (
+        patch(
+            "app.core.initialization.data_loader.PipelineFactory", return_value=factory
+        ),
+        patch("app.core.initialization.data_loader.settings.SNAPSHOT_ENABLED", True),
+    ):
+        load = asyncio.create_task(loader.load_initial_data())
+        await asyncio.sleep(0.1)
+        waiting = not load.done() and not writer_pipeline.run.called
+        release.set()
+        await asyncio.wait_for(load, 5)
+    holder.join()
+
+    # Assert
+    assert waiting
+    writer_pipeline.run.assert_called_once()
+    written = writer_pipeline.run.call_args.args[0]["writer"]["documents"]
+    assert [doc.id for doc in written] == ["0", "1"]
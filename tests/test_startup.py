@@ -0,0 +1,67 @@
+import sys
+import subprocess
+from unittest.mock import patch
+from app.config.logging import configure_logging
+from app.core.pipeline import models
+from app.core.pipeline.models import ModelRegistry
+
+
+class FakeRanker:
+    def __init__(self, model: str):
+        self.model = model
+        self.weights = None
+        self.loads = 0
+
+    def to_dict(self):
+        return {"type": "FakeRanker", "init_parameters": {"model": self.model}}
+
+    def warm_up(self):
+        if self.weights is None:
+            self.loads += 1
+            self.weights = object()
+
+
+def test_model_registry_shares_loaded_weights():
+    # Arrange
+    registry = ModelRegistry()
+    first, second, other = FakeRanker("a"), FakeRanker("a"), FakeRanker("b")
+
+    # Act
+    with patch.dict(models.LOADED_ATTRIBUTES, {"FakeRanker": ("weights",)}):
+        for ranker in (first, second, other):
+            registry.warm_up(ranker)
+
+    # Assert
+    assert second.weights is first.weights
+    assert second.loads == 0
+    assert other.weights is not first.weights
+    assert len(registry) == 2
+
+
+def test_importing_app_does_not_load_model_runtimes():
+    # Arrange
+    probe = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('haystack', 'torch', 'fastembed') if m in sys.modules))"
+    )
+
+    # Act
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+
+    # Assert
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_log_directory_created_on_first_record(tmp_path):
+    # Arrange
+    log_dir = tmp_path / "logs"
+
+    # Act
+    configure_logging(file_level="DEBUG", log_dir=log_dir, enqueue=False)
+    created_on_configure = log_dir.exists()
+    configure_logging()
+
+    # Assert
+    assert not created_on_configure
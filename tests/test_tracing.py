@@ -0,0 +1,99 @@
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from app.core.pipeline import tracing
+from app.core.pipeline.tracing import (
+    COMPONENT_RUN,
+    COMPONENT_SECONDS,
+    PIPELINE_RUN,
+    PIPELINES_IN_FLIGHT,
+    REQUEST_ID_TAG,
+    MetricsHook,
+    OpenTelemetryHook,
+    PipelineTracer,
+    request_context,
+)
+from app.core.services.pipeline import PipelineService
+from app.core.services.medication import (
+    EXTRACTION_QUEUE_DEPTH,
+    LLM_PARSE_FAILURES,
+    MedicationService,
+)
+
+
+@pytest.fixture
+def tracer():
+    tracer = PipelineTracer()
+    tracer.add_hook(MetricsHook())
+    return tracer
+
+
+def test_metrics_hook_records_component_durations(tracer):
+    # Arrange
+    before = COMPONENT_SECONDS.count(component="reranker", stage="rerank")
+
+    # Act
+    with tracer.trace(PIPELINE_RUN):
+        in_flight = PIPELINES_IN_FLIGHT.value()
+        with tracer.trace(COMPONENT_RUN, tags={"haystack.component.name": "reranker"}):
+            pass
+
+    # Assert
+    assert COMPONENT_SECONDS.count(component="reranker", stage="rerank") == before + 1
+    assert in_flight >= 1
+    assert PIPELINES_IN_FLIGHT.value() == in_flight - 1
+
+
+def test_spans_carry_request_id(tracer):
+    # Act
+    with request_context("request-1"):
+        with tracer.trace(PIPELINE_RUN) as span:
+            pass
+    with tracer.trace(PIPELINE_RUN) as untagged:
+        pass
+
+    # Assert
+    assert span.tags[REQUEST_ID_TAG] == "request-1"
+    assert REQUEST_ID_TAG not in untagged.tags
+
+
+def test_opentelemetry_hook_nests_component_spans(tracer):
+    # Arrange
+    otel = Mock()
+    with patch.object(tracing, "otel_trace", otel):
+        tracer.add_hook(OpenTelemetryHook())
+
+        # Act
+        with tracer.trace(PIPELINE_RUN) as pipeline_span:
+            with tracer.trace(COMPONENT_RUN, tags={"haystack.component.name": "llm"}):
+                pass
+
+    # Assert
+    otel_tracer = otel.get_tracer.return_value
+    assert otel_tracer.start_span.call_count == 2
+    otel.set_span_in_context.assert_called_once_with(pipeline_span.otel_span)
+    assert pipeline_span.otel_span.end.called
+
+
+def test_opentelemetry_hook_requires_package():
+    with patch.object(tracing, "otel_trace", None):
+        with pytest.raises(ImportError):
+            OpenTelemetryHook()
+
+
+@pytest.mark.asyncio
+async def test_extraction_counts_parse_failures_and_drains_queue():
+    # Arrange
+    pipeline_service = Mock(spec=PipelineService)
+    pipeline_service.execute_query_pipeline = AsyncMock(
+        return_value={"llm": {"replies": ["not json"]}}
+    )
+    service = MedicationService(pipeline_service)
+    failures = LLM_PARSE_FAILURES.value()
+
+    # Act
+    result = await service.extract_entities(["Aspirin 81 MG", "Ibuprofen 200 MG"])
+
+    # Assert
+    assert len(result.results) == 2
+    assert LLM_PARSE_FAILURES.value() == failures + 2
+    assert EXTRACTION_QUEUE_DEPTH.value() == 0